@@ -0,0 +1,71 @@
+# asset_memory.py
+# Opens each screen in turn the way the game does, prints what the asset cache
+# holds per asset and per scene group, and how much leaving a mini-game frees.
+# Run from the repo root: python benchmarks/asset_memory.py
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+from code.asset_manager import mask_bytes, memory_report, unload_assets
+
+MB = 1024 * 1024
+
+
+def rss():
+    """Resident set size in bytes (Linux), or None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def print_report(title):
+    report = memory_report()
+    resident = rss()
+    print(f"== {title}: cache {report['bytes'] / MB:.1f} MB ({report['preloaded'] / MB:.1f} MB preloaded, not yet used), "
+          f"masks {report['masks'] / 1024:.1f} KB"
+          + (f", RSS {resident / MB:.1f} MB" if resident else ""))
+    for row in report["assets"]:
+        print(f"   {row['bytes'] / MB:6.2f} MB  {row['format']:<11} alpha {'used' if row['alpha'] else 'no  '}  "
+              f"{row['size'][0]}x{row['size'][1]:<5} {os.path.basename(row['path']):<28} {', '.join(row['groups'])}"
+              + ("  (preloaded)" if row["preloaded"] else ""))
+    print("   per group: " + ", ".join(f"{name} {size / MB:.1f} MB" for name, size in report["groups"].items() if size))
+
+
+def run_benchmarks():
+    game = main.Game()
+    game.selected_sprite = game.sprite(0)
+    for name in ("title", "title_poster"):
+        game.image(name)
+    print_report("title screen")
+
+    unload_assets("title")
+    overworld = main.OverworldScene(game)
+    foreground = game.layer("foreground")
+    print_report("overworld")
+    print(f"   foreground tiles {foreground.bytes / MB:.1f} MB, walk mask {mask_bytes(game.path_mask) / 1024:.0f} KB")
+
+    for name, mini_game in main.MINI_GAMES.items():
+        if name == "room":
+            scene = mini_game.RoomScene(game.selected_sprite, (main.WIDTH, main.HEIGHT))
+        elif name == "laser_labyrinth":
+            scene = mini_game.LaserLabyrinthScene(game.selected_sprite)
+        else:
+            scene = mini_game.PlatformerScene(game.selected_sprite)
+        print_report(f"inside {name}")
+        del scene
+        freed = unload_assets(name)
+        print(f"   leaving {name} unloads {freed / MB:.1f} MB")
+    print_report("back in the overworld")
+    del overworld
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,98 @@
+# collision_masks.py
+# Times the player's collision checks rect-only, with cached pixel masks behind a
+# rect broadphase, and with a mask rebuilt every check, and counts how many rect
+# hits the masks turn out to be near misses. Run from the repo root:
+# python benchmarks/collision_masks.py
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+from benchmarks.lasers import generate_lasers
+from code.asset_manager import load_image
+from code.collision import sprites_collide
+from code.laser_labyrinth import HEIGHT, WIDTH
+from code.lasers import LaserField
+from code.profiler import percentile
+from code.room import ASSETS
+from code.scene import STEP
+
+TICKS = 2000
+SIZES = [4, 100, 500]
+
+
+def time_checks(check, positions):
+    timings, hits = [], 0
+    for rect, prev in positions:
+        start = time.perf_counter()
+        hits += bool(check(rect, prev))
+        timings.append((time.perf_counter() - start) * 1000)
+    return percentile(timings, 50), percentile(timings, 99), hits
+
+
+def walk(sprite, seed=0):
+    """TICKS player rects wandering the screen, each with the one from the tick before."""
+    rng = random.Random(seed)
+    rect = sprite.get_rect(topleft=(WIDTH // 2, HEIGHT // 2))
+    positions = []
+    for _ in range(TICKS):
+        prev = rect.copy()
+        rect.move_ip(rng.choice((-3, 0, 3)), rng.choice((-3, 0, 3)))
+        rect.clamp_ip(pygame.Rect(0, 0, WIDTH, HEIGHT))
+        positions.append((rect.copy(), prev))
+    return positions
+
+
+def lasers(sprite):
+    positions = walk(sprite)
+    for count in SIZES:
+        for name, use_mask in (("rect only", False), ("cached mask", True)):
+            field = LaserField(generate_lasers(count), (WIDTH, HEIGHT))
+
+            def check(rect, prev):
+                field.update(STEP)
+                return field.hits(rect, prev, sprite if use_mask else None)
+
+            p50, p99, hits = time_checks(check, positions)
+            print(f"{count:>4} lasers  {name:<12} p50 {p50:6.3f} ms  p99 {p99:6.3f} ms  {hits:>4} hits")
+
+
+def sprites(sprite):
+    """The room's checks: the player against the fairy and the princess."""
+    fairy = load_image(*ASSETS["fairy"])
+    fairy_rect = fairy.get_rect(topleft=(WIDTH // 2 - 60, HEIGHT // 2 - 60))
+    princess = load_image(*ASSETS["princess"])
+    princess_rect = princess.get_rect(topleft=(WIDTH // 2 - 20, HEIGHT // 2 - 200))
+    others = [(fairy, fairy_rect), (princess, princess_rect)]
+
+    def rect_only(rect, prev):
+        return any(rect.colliderect(other_rect) for _, other_rect in others)
+
+    def cached(rect, prev):
+        return any(sprites_collide(sprite, rect, other, other_rect) for other, other_rect in others)
+
+    def rebuilt(rect, prev):
+        mask = pygame.mask.from_surface(sprite)
+        return any(rect.colliderect(other_rect) and
+                   mask.overlap(pygame.mask.from_surface(other), (other_rect.x - rect.x, other_rect.y - rect.y))
+                   for other, other_rect in others)
+
+    positions = walk(sprite, seed=1)
+    for name, check in (("rect only", rect_only), ("cached mask", cached), ("mask per check", rebuilt)):
+        p50, p99, hits = time_checks(check, positions)
+        print(f"room sprites {name:<15} p50 {p50:6.3f} ms  p99 {p99:6.3f} ms  {hits:>4} hits")
+
+
+if __name__ == "__main__":
+    game = main.Game()
+    game.screen
+    player = game.sprite(0)
+    lasers(player)
+    sprites(player)
+    pygame.quit()
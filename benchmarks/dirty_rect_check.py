@@ -0,0 +1,78 @@
+# dirty_rect_check.py
+# Runs each dirty-rect scene with scripted input at full and half render scale
+# and, after every frame, redraws the whole screen from scratch to check the
+# dirty-rect path left exactly the same pixels behind.
+# Exits non-zero on any mismatch. Run from the repo root: python benchmarks/dirty_rect_check.py
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+import code.game_state
+import code.laser_labyrinth
+import code.platformer
+from benchmarks.dirty_rects import walk_and_stop
+from code.display import display
+from code.input_source import ReplayInput
+from code.scene import SceneManager
+
+SCALES = [1, 0.5]
+FRAMES = 1500
+
+
+def check(name, make_scene):
+    """Frames checked and how many of them differ from a full redraw."""
+    game = main.Game()
+    game.selected_sprite = game.sprite(0)
+    manager = SceneManager(game.screen, main.FPS, ReplayInput(walk_and_stop(FRAMES)),
+                           fixed_dt=1 / main.FPS, dirty_rects=True)
+    manager.running = True
+    reference = pygame.Surface(game.screen.get_size()).convert()
+
+    frames = mismatched = 0
+    for _ in range(FRAMES):
+        # Dying or winning pops the scene; start a fresh one so every frame is this scene
+        if manager.top is None or manager.top.name != name:
+            manager.stack.clear()
+            manager.push(make_scene(game))
+            manager.drawn_rects = {}
+        manager.step(manager.fixed_dt)
+        if manager.top is None or manager.top.name != name:
+            continue
+        manager.draw(reference)
+        frames += 1
+        if pygame.image.tobytes(reference, "RGB") != pygame.image.tobytes(game.screen, "RGB"):
+            mismatched += 1
+    return frames, mismatched
+
+
+def run_benchmarks():
+    def overworld(game):
+        game.sprite_pos = [1100, 1020]
+        return main.OverworldScene(game)
+
+    code.game_state.player_keys["platform_key"] = True
+    scenes = [
+        ("game", overworld),
+        ("platformer", lambda game: code.platformer.PlatformerScene(game.selected_sprite)),
+        ("laser_labyrinth", lambda game: code.laser_labyrinth.LaserLabyrinthScene(game.selected_sprite)),
+    ]
+    failed = False
+    for scale in SCALES:
+        pygame.display.quit()  # a fresh window for each scale
+        display.configure(scale)
+        for name, make_scene in scenes:
+            frames, mismatched = check(name, make_scene)
+            failed |= mismatched > 0
+            print(f"scale {scale:<4} {name:<16} {frames:5d} frames  {mismatched} mismatched"
+                  + ("  FAIL" if mismatched else ""))
+    pygame.quit()
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(1 if run_benchmarks() else 0)
@@ -0,0 +1,78 @@
+# dirty_rects.py
+# Runs each scene with scripted input twice, once flipping the whole screen every
+# frame and once redrawing only what moved, and compares draw+flip cost.
+# Run from the repo root: python benchmarks/dirty_rects.py
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+import code.game_state
+import code.laser_labyrinth
+import code.platformer
+from code.input_source import ReplayInput
+from code.profiler import percentile
+from code.scene import SceneManager
+
+FRAMES = 2000
+
+
+def walk_and_stop(frames):
+    """Walk right for 60 frames, then stand still for 60, tapping jump now and then."""
+    script = []
+    for i in range(frames):
+        keys = [pygame.K_RIGHT if (i // 120) % 2 == 0 else pygame.K_LEFT] if i % 120 < 60 else []
+        events = []
+        if i % 50 == 0:
+            events.append({"type": pygame.KEYDOWN, "key": pygame.K_SPACE, "mod": 0, "unicode": " ", "scancode": 44})
+        script.append({"dt": 1 / main.FPS, "events": events, "keys": keys, "mouse": [0, 0]})
+    return script
+
+
+def measure(name, make_scene, dirty_rects):
+    game = main.Game()
+    game.selected_sprite = game.sprite(0)
+    manager = SceneManager(game.screen, main.FPS, ReplayInput(walk_and_stop(FRAMES)),
+                           fixed_dt=1 / main.FPS, dirty_rects=dirty_rects)
+    manager.running = True
+
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        # Dying or winning pops the scene; start a fresh one so every frame is this scene
+        if manager.top is None or manager.top.name != name:
+            manager.stack.clear()
+            manager.push(make_scene(game))
+        manager.step(manager.fixed_dt)
+    elapsed = time.perf_counter() - start
+
+    phases = manager.profiler.samples[name]
+    render = [draw + flip for draw, flip in zip(phases["draw"], phases["flip"])]
+    mode = "dirty rects" if dirty_rects else "full flip"
+    print(f"{name:<16} {mode:<12} {FRAMES / elapsed:8.0f} frames/s  "
+          f"draw+flip p50 {percentile(render, 50):6.3f} ms  p95 {percentile(render, 95):6.3f} ms")
+
+
+def run_benchmarks():
+    def overworld(game):
+        # Walking scrolls the map (full redraws); standing still redraws nothing
+        game.sprite_pos = [1100, 1020]
+        return main.OverworldScene(game)
+
+    code.game_state.player_keys["platform_key"] = True
+    scenes = [
+        ("game", overworld),
+        ("platformer", lambda game: code.platformer.PlatformerScene(game.selected_sprite)),
+        ("laser_labyrinth", lambda game: code.laser_labyrinth.LaserLabyrinthScene(game.selected_sprite)),
+    ]
+    for name, make_scene in scenes:
+        measure(name, make_scene, dirty_rects=False)
+        measure(name, make_scene, dirty_rects=True)
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,59 @@
+# idle_cpu.py
+# Leaves each static screen up with no input and reports the CPU it burns and how
+# many frames it draws. Run from the repo root: python benchmarks/idle_cpu.py
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+from code.room import RiddleScene
+from code.scene import IDLE_TIMEOUT, SceneManager
+
+SECONDS = 3
+
+
+def measure(name, make_scene, idle=True):
+    game = main.Game()
+    manager = SceneManager(game.screen)
+    manager.running = True
+    scene = make_scene(game)
+    scene.idle = idle  # idle=False shows the old fixed-rate loop for comparison
+    manager.push(scene)
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    frames = manager.profiler.frame
+    while time.perf_counter() - wall_start < SECONDS:
+        # Same branch SceneManager.run takes
+        if scene.idle:
+            manager.step(manager.clock.tick() / 1000, wait=IDLE_TIMEOUT)
+        else:
+            manager.step(manager.clock.tick(manager.fps) / 1000)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    draws = len(manager.profiler.samples[name]["draw"])
+
+    mode = "event-driven" if idle else "fixed rate"
+    print(f"{name:<10} {mode:<13} {cpu / wall * 100:6.1f}% CPU  "
+          f"{(manager.profiler.frame - frames) / wall:6.1f} wakeups/s  {draws} draws")
+
+
+def run_benchmarks():
+    scenes = [
+        ("title", main.TitleScene),
+        ("selection", main.SelectionScene),
+        ("riddle", lambda game: RiddleScene("What walks at night but never wakes?", "sleepwalker")),
+        ("win", main.WinScene),
+    ]
+    for name, make_scene in scenes:
+        measure(name, make_scene, idle=False)
+        measure(name, make_scene, idle=True)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,86 @@
+# laser_tunneling.py
+# Fires fast lasers across a standing player at several tick rates and counts how
+# many the discrete hit test catches against the swept one, then times both on
+# crowded fields. Exits with status 1 if the swept test ever misses.
+# Run from the repo root: python benchmarks/laser_tunneling.py
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from benchmarks.lasers import generate_lasers
+from code.laser_labyrinth import HEIGHT, WIDTH
+from code.lasers import LaserField
+from code.profiler import percentile
+from code.scene import STEP
+
+TICK_RATES = [30, 60, 120]
+SPEEDS = [600, 2400, 9600]  # px/s, up to ten times the fastest laser in the game
+OFFSETS = 40  # starting offsets per case, so a laser lands on every phase of a tick
+SIZES = [4, 100, 500, 2000]
+TICKS = 2000
+HITBOX = pygame.Rect(590, 380, 20, 35)
+
+
+def first_hit(lasers, seconds, tick, swept):
+    """True if the player is hit at any tick within seconds."""
+    field = LaserField(lasers, (WIDTH * 4, HEIGHT))
+    prev = HITBOX.copy()
+    for _ in range(int(seconds * tick) + 1):
+        field.update(1 / tick)
+        if field.hits(HITBOX, prev if swept else None):
+            return True
+    return False
+
+
+def crossing(kind, speed, offset):
+    """A thin wall sliding or a beam turning over HITBOX once, and how long it takes."""
+    if kind == "wall":
+        return [{"pattern": "bounce", "rect": (offset, 300, 10, 200), "velocity": (speed, 0)}], HITBOX.right / speed
+    turn_speed = speed / 10
+    beam = {"pattern": "beam", "pivot": (600, 600), "length": 300, "width": 6, "angle": -180 + offset, "turn_speed": turn_speed}
+    return [beam], 180 / turn_speed
+
+
+def tunneling():
+    missed = 0
+    for tick in TICK_RATES:
+        for speed in SPEEDS:
+            for kind in ("wall", "beam"):
+                caught = {False: 0, True: 0}
+                for i in range(OFFSETS):
+                    lasers, seconds = crossing(kind, speed, i)
+                    for swept in (False, True):
+                        caught[swept] += first_hit(lasers, seconds, tick, swept)
+                missed += OFFSETS - caught[True]
+                rate, unit = (speed, "px/s") if kind == "wall" else (speed / 10, "deg/s")
+                print(f"{tick:>4} Hz  {kind:<5} {rate:>6.0f} {unit:<6} discrete {caught[False]:>3}/{OFFSETS}  "
+                      f"swept {caught[True]:>3}/{OFFSETS}")
+    return missed
+
+
+def cost():
+    for count in SIZES:
+        field = LaserField(generate_lasers(count), (WIDTH, HEIGHT))
+        prev = HITBOX.copy()
+        hitbox = HITBOX.move(2, 0)
+        timings = {False: [], True: []}
+        for _ in range(TICKS):
+            field.update(STEP)
+            for swept in (False, True):
+                start = time.perf_counter()
+                field.hits(hitbox, prev if swept else None)
+                timings[swept].append((time.perf_counter() - start) * 1000)
+        print(f"{count:>5} lasers  discrete p50 {percentile(timings[False], 50):6.3f} ms  "
+              f"swept p50 {percentile(timings[True], 50):6.3f} ms  p99 {percentile(timings[True], 99):6.3f} ms")
+
+
+if __name__ == "__main__":
+    missed = tunneling()
+    cost()
+    pygame.quit()
+    sys.exit(1 if missed else 0)
@@ -0,0 +1,114 @@
+# lasers.py
+# Times a frame of the laser labyrinth's hazards (two ticks of movement and hit
+# tests, then one draw) for growing numbers of lasers, with the vectorized
+# LaserField and with one Python object per laser.
+# Run from the repo root: python benchmarks/lasers.py
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+from code.laser_labyrinth import HEIGHT, WIDTH
+from code.lasers import LASER_COLOR, LaserField
+from code.profiler import percentile
+from code.scene import STEP, TICK_RATE
+
+FRAMES = 300
+SIZES = [4, 100, 500, 2000]
+FRAME_BUDGET = 1000 / 60
+
+
+def generate_lasers(count, seed=0):
+    """Half bouncing, a fifth each swinging and patrolling, a tenth rotating beams."""
+    rng = random.Random(seed)
+    lasers = []
+    for i in range(count):
+        x, y = rng.randrange(0, WIDTH - 200), rng.randrange(0, HEIGHT - 200)
+        w, h = (rng.randrange(40, 200), 20) if i % 2 else (20, rng.randrange(40, 200))
+        kind = i % 10
+        if kind < 5:
+            velocity = (rng.choice((-1, 1)) * rng.randrange(60, 300), 0) if i % 2 else (0, rng.choice((-1, 1)) * rng.randrange(60, 300))
+            lasers.append({"pattern": "bounce", "rect": (x, y, w, h), "velocity": velocity})
+        elif kind < 7:
+            lasers.append({"pattern": "sine", "rect": (x, y, w, h), "amplitude": (rng.randrange(0, 150), rng.randrange(0, 150)),
+                           "period": rng.uniform(1, 4), "phase": rng.random()})
+        elif kind < 9:
+            path = [(rng.randrange(0, WIDTH - 200), rng.randrange(0, HEIGHT - 200)) for _ in range(rng.randrange(1, 5))]
+            lasers.append({"pattern": "patrol", "rect": (x, y, w, h), "path": path, "speed": rng.randrange(60, 300)})
+        else:
+            lasers.append({"pattern": "beam", "pivot": (x + 100, y + 100), "length": rng.randrange(80, 250), "width": 8,
+                           "angle": rng.randrange(360), "turn_speed": rng.choice((-1, 1)) * rng.randrange(30, 120)})
+    return lasers
+
+
+class Laser:
+    """One laser per object, updated and drawn one at a time, as the labyrinth used to."""
+
+    def __init__(self, x, y, w, h, velocity):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.pos = pygame.Vector2(x, y)
+        self.prev_pos = pygame.Vector2(x, y)
+        self.velocity = pygame.Vector2(velocity)
+
+    def update(self, dt):
+        self.prev_pos.update(self.pos)
+        self.pos += self.velocity * dt
+        if self.pos.x < 0 or self.pos.x + self.rect.width > WIDTH:
+            self.velocity.x *= -1
+        if self.pos.y < 0 or self.pos.y + self.rect.height > HEIGHT:
+            self.velocity.y *= -1
+        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+
+
+def time_frames(tick, draw):
+    screen = main.Game().screen
+    hitbox = pygame.Rect(100, HEIGHT - 150, 40, 55)
+    frames = []
+    for _ in range(FRAMES):
+        start = time.perf_counter()
+        for _ in range(TICK_RATE // 60):
+            tick(hitbox)
+        draw(screen)
+        frames.append((time.perf_counter() - start) * 1000)
+    return percentile(frames, 50), percentile(frames, 99)
+
+
+def run_benchmarks():
+    for count in SIZES:
+        lasers = generate_lasers(count)
+        field = LaserField(lasers, (WIDTH, HEIGHT))
+
+        def field_tick(hitbox):
+            field.update(STEP)
+            field.hits(hitbox)
+
+        # The object version only knows how to bounce, so every laser bounces there
+        objects = [Laser(*laser.get("rect", (0, 0, 20, 100)), laser.get("velocity", (0, 120))) for laser in lasers]
+
+        def object_tick(hitbox):
+            for laser in objects:
+                laser.update(STEP)
+            any(hitbox.colliderect(laser.rect) for laser in objects)
+
+        def object_draw(surface):
+            for laser in objects:
+                rect = laser.rect.copy()
+                rect.topleft = laser.pos
+                pygame.draw.rect(surface, LASER_COLOR, rect, border_radius=15)
+
+        for name, tick, draw in (("LaserField", field_tick, lambda surface: field.draw(surface, 0.5)),
+                                 ("one object each", object_tick, object_draw)):
+            p50, p99 = time_frames(tick, draw)
+            verdict = "fits" if p99 < FRAME_BUDGET else "over"
+            print(f"{count:>5} lasers  {name:<16} p50 {p50:7.3f} ms  p99 {p99:7.3f} ms  ({verdict} 60 FPS)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_benchmarks()
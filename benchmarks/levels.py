@@ -0,0 +1,53 @@
+# levels.py
+# Loads every shipped level and generated platformer levels of growing size from
+# their JSON files, and reports file size, cold load time, the memory the built
+# level holds, and the cost of a cached load. Run from the repo root:
+# python benchmarks/levels.py
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.platformer_levels import generate_level
+from code.levels import LEVEL_DIR, LevelLoader
+
+SIZES = [1_000, 10_000, 50_000]
+WARM_LOADS = 1000
+
+
+def report(level_dir, name):
+    # Timed and measured in separate loads: tracing allocations slows loading down
+    measured = LevelLoader(level_dir, measure_memory=True)
+    measured.load(name)
+    size = measured.load_log[name][1]
+    loader = LevelLoader(level_dir)
+    level = loader.load(name)
+    seconds = loader.load_log[name][0]
+    start = time.perf_counter()
+    for _ in range(WARM_LOADS):
+        loader.load(name)
+    cached = (time.perf_counter() - start) / WARM_LOADS
+    print(f"{name:<18} {os.path.getsize(loader.path(name)) / 1024:8.1f} KB file  "
+          f"load {seconds * 1000:8.2f} ms  {size / 1024:8.1f} KB built  "
+          f"cached {cached * 1e6:5.1f} us  ({level.solids.count} solids, {len(level.zones)} zones)")
+
+
+def run_benchmarks():
+    for file in sorted(os.listdir(LEVEL_DIR)):
+        report(LEVEL_DIR, os.path.splitext(file)[0])
+
+    with tempfile.TemporaryDirectory() as level_dir:
+        for count in SIZES:
+            name = f"platformer_{count}"
+            with open(os.path.join(level_dir, name + ".json"), "w") as f:
+                json.dump(generate_level(count), f, separators=(",", ":"))
+            report(level_dir, name)
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,93 @@
+# menus.py
+# Times a frame of the title and character selection screens drawn the old way
+# (every box allocated and rendered each frame), with the pre-rendered widgets,
+# and with the widgets repainting only the rects a hover change touched.
+# Run from the repo root: python benchmarks/menus.py
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+from code.profiler import percentile
+from code.scene import SceneManager
+from code.text import render_text
+
+FRAMES = 500
+
+
+def old_box(screen, rect, mouse_pos):
+    """One box as the menus used to draw it: a fresh SRCALPHA surface per box per frame."""
+    hover_scale = 1.1 if rect.collidepoint(mouse_pos) else 1.0
+    scaled_width, scaled_height = int(rect.width * hover_scale), int(rect.height * hover_scale)
+    box_surface = pygame.Surface((scaled_width, scaled_height), pygame.SRCALPHA)
+    fill_color = (220, 220, 220, 220) if rect.collidepoint(mouse_pos) else (200, 200, 200, 180)
+    pygame.draw.rect(box_surface, fill_color, box_surface.get_rect(), border_radius=15)
+    pygame.draw.rect(box_surface, main.WHITE, box_surface.get_rect(), width=3, border_radius=15)
+    screen.blit(box_surface, (rect.centerx - scaled_width // 2, rect.centery - scaled_height // 2))
+
+
+def old_title(game, screen, mouse_pos):
+    screen.blit(game.image("title"), (0, 0))
+    screen.blit(game.image("title_poster"), (main.WIDTH // 2 - 370, main.HEIGHT // 2 - 200))
+    rect = pygame.Rect(main.WIDTH // 2 - 70, main.HEIGHT // 2 + 150, 140, 50)
+    old_box(screen, rect, mouse_pos)
+    text = render_text("Play", game.font(38), main.BLACK)
+    screen.blit(text, text.get_rect(center=rect.center))
+
+
+def old_selection(game, screen, mouse_pos, cards):
+    screen.fill((50, 50, 150))
+    for card in cards:
+        old_box(screen, card.rect, mouse_pos)
+        screen.blit(card.content, card.content.get_rect(center=card.rect.center))
+
+
+def time_frames(draw):
+    frames = []
+    for i in range(FRAMES):
+        start = time.perf_counter()
+        draw(i)
+        frames.append((time.perf_counter() - start) * 1000)
+    return percentile(frames, 50), percentile(frames, 99)
+
+
+def measure(game, scene, old_draw):
+    manager = SceneManager(game.screen, dirty_rects=True)
+    manager.running = True
+    manager.push(scene)
+    manager.step(0)  # first full frame
+    widget = scene.widgets.widgets[0]
+    inside, outside = widget.rect.center, (0, 0)
+    screen = game.screen
+
+    def hover_changed(i):
+        # The pointer moves on or off the first widget every frame, the worst case
+        scene.changed |= scene.widgets.hover(inside if i % 2 else outside)
+        manager.step(0)
+
+    results = [
+        ("immediate", lambda i: old_draw(screen, inside if i % 2 else outside)),
+        ("widgets, full", lambda i: (scene.widgets.hover(inside if i % 2 else outside), scene.draw(screen))),
+        ("widgets, dirty", hover_changed),
+    ]
+    for name, draw in results:
+        p50, p99 = time_frames(draw)
+        print(f"{scene.name:<10} {name:<15} p50 {p50:6.3f} ms  p99 {p99:6.3f} ms")
+
+
+def run_benchmarks():
+    game = main.Game()
+    title = main.TitleScene(game)
+    measure(game, title, lambda screen, pos: old_title(game, screen, pos))
+    selection = main.SelectionScene(game)
+    measure(game, selection, lambda screen, pos: old_selection(game, screen, pos, selection.widgets.widgets))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_benchmarks()
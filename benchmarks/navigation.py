@@ -0,0 +1,87 @@
+# navigation.py
+# Builds the overworld navigation grid from the path layer and loads it back
+# from the disk cache, then times click-to-move queries between random open
+# spots (first time, best of COLD_RUNS, and repeated) and routes into each door.
+# Run from the repo root: python benchmarks/navigation.py
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+from code.levels import load_level
+from code.navigation import NavGrid
+from code.profiler import percentile
+
+QUERIES = 500
+COLD_RUNS = 3  # per query, keeping the fastest
+REPEATS = 1000
+
+
+def load(cache_dir, walkable):
+    start = time.perf_counter()
+    grid = NavGrid.load(main.PATH_IMAGE[0], main.MAP_SIZE, (main.SPRITE_WIDTH, main.SPRITE_HEIGHT), walkable,
+                        cache_dir=cache_dir)
+    return grid, time.perf_counter() - start
+
+
+def run_benchmarks():
+    game = main.Game()
+    mask = game.path_mask
+    walkable = lambda rect: main.is_walkable(mask, rect)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        grid, built = load(cache_dir, walkable)
+        _, cached = load(cache_dir, walkable)
+    print(f"grid {grid.columns}x{grid.rows} points every {grid.cell} px, {len(grid.nodes)} open, "
+          f"{len(set(grid.regions))} region(s)")
+    print(f"build {built * 1000:.1f} ms, from the disk cache {cached * 1000:.1f} ms")
+
+    random.seed(1)
+    pairs = [random.sample(range(len(grid.nodes)), 2) for _ in range(QUERIES)]
+    first, lengths = [], []
+    for a, b in pairs:
+        # Best of a few cold runs, like timeit, so a preempted run doesn't pass for a slow query
+        best = math.inf
+        for _ in range(COLD_RUNS):
+            grid.routes.clear()
+            start = time.perf_counter()
+            route = grid.route(grid.point(a), grid.point(b))
+            best = min(best, time.perf_counter() - start)
+        first.append(best)
+        lengths.append(len(route) if route else 0)
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        grid.route(grid.point(a), grid.point(b))
+    repeated = (time.perf_counter() - start) / REPEATS
+    print(f"route, first time: p50 {percentile(first, 50) * 1000:.3f} ms  p95 {percentile(first, 95) * 1000:.3f} ms  "
+          f"p99 {percentile(first, 99) * 1000:.3f} ms  max {max(first) * 1000:.3f} ms  ({max(lengths)} waypoints at most)")
+    print(f"route, repeated:   {repeated * 1000:.4f} ms")
+
+    level = load_level("overworld")
+    here = level.points["respawn"]
+    for zone in level.zones.values():
+        start = time.perf_counter()
+        grid.prepare_area(zone.rect)
+        flow = time.perf_counter() - start
+        start = time.perf_counter()
+        route = grid.route_to(here, zone.rect)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            grid.route_to(here, zone.rect)
+        repeated = (time.perf_counter() - start) / REPEATS
+        print(f"to the {zone.name:<16} door: prepare {flow * 1000:.2f} ms (at load), first route {first * 1000:.3f} ms, "
+              f"then {repeated * 1000:.4f} ms, {len(route) if route else 0} waypoints")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,48 @@
+# overworld_layers.py
+# Times drawing the overworld map layers whole versus as culled tiles, at a few
+# camera positions. Run from the repo root: python benchmarks/overworld_layers.py
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+from code.asset_manager import load_image
+from code.tilemap import TileLayer
+
+REPEATS = 300
+OFFSETS = [(0, 0), (-600, -400), (-1200, -800)]
+
+
+def time_ms(draw):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        draw()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def run_benchmarks():
+    game = main.Game()
+    screen = game.screen
+    path, size = main.IMAGES["background"][:2]
+    background_alpha = load_image(path, size, alpha=True, cache=False)
+    background = game.image("background")
+    foreground = game.image("foreground")
+
+    start = time.perf_counter()
+    tiles = TileLayer(foreground)
+    print(f"foreground tiles built in {(time.perf_counter() - start) * 1000:.1f} ms: {tiles.counts}")
+
+    for offset in OFFSETS:
+        before = time_ms(lambda: (screen.blit(background_alpha, offset), screen.blit(foreground, offset)))
+        after = time_ms(lambda: (screen.blit(background, offset), tiles.draw(screen, offset)))
+        print(f"camera {str(offset):<14} whole layers {before:6.3f} ms   opaque background + tiles {after:6.3f} ms")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_benchmarks()
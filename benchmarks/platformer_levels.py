@@ -0,0 +1,105 @@
+# platformer_levels.py
+# Runs the platformer on generated levels of growing size and reports the time per
+# frame spent updating (and drawing) with the spatial grid, and updating with
+# every platform tested. Run from the repo root: python benchmarks/platformer_levels.py
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+from code.input_source import ReplayInput
+from code.levels import Level
+from code.platformer import HEIGHT, PlatformerScene
+from code.profiler import percentile
+from code.scene import STEP, TICK_RATE, SceneManager
+
+FRAMES = 2000
+SIZES = [100, 1_000, 10_000, 50_000]
+BRUTE_FORCE_LIMIT = 10_000  # testing every platform gets too slow to wait for past this
+
+
+def generate_level(count, seed=0):
+    """
+    Level file data: an unbroken floor for a quarter of the platforms and the
+    rest scattered above it.
+    """
+    rng = random.Random(seed)
+    floor = max(1, count // 4)
+    width = floor * 150
+    platforms = [(i * 150, HEIGHT - 50) for i in range(floor)]
+    platforms += [(rng.randrange(0, width), rng.randrange(100, HEIGHT - 200)) for _ in range(count - floor)]
+    goal_x, goal_y = platforms[floor - 1]
+    return {"start": (100, HEIGHT - 150), "platform_size": (150, 50), "platforms": platforms,
+            "zones": {"goal": {"rect": (goal_x + 25, goal_y - 100, 100, 100)}}}
+
+
+def run_right(frames):
+    script = []
+    for i in range(frames):
+        events = []
+        if i % 40 == 0:
+            events.append({"type": pygame.KEYDOWN, "key": pygame.K_SPACE, "mod": 0, "unicode": " ", "scancode": 44})
+        script.append({"dt": 1 / main.FPS, "events": events, "keys": [pygame.K_RIGHT], "mouse": [0, 0]})
+    return script
+
+
+class EveryPlatform:
+    """Stands in for the SpatialGrid by testing every platform, like the old loop."""
+
+    def __init__(self, grid):
+        self.items = list({platform for cell in grid.cells.values() for platform in cell})
+
+    def query(self, rect):
+        return [platform for platform in self.items if platform.rect.colliderect(rect)]
+
+
+def measure(level, count, broadphase):
+    game = main.Game()
+    manager = SceneManager(game.screen, main.FPS, ReplayInput(run_right(FRAMES)), fixed_dt=1 / main.FPS)
+    manager.running = True
+    scene = PlatformerScene(game.sprite(0), level)
+    if not broadphase:
+        scene.platforms = EveryPlatform(scene.platforms)
+    manager.push(scene)
+
+    updates, draws = [], []
+    for _ in range(FRAMES):
+        if manager.top is not scene:
+            break  # fell off or reached the door
+        manager.input.begin_frame(manager.fixed_dt)
+        for event in manager.input.events():
+            scene.handle_event(event)
+        start = time.perf_counter()
+        for _ in range(TICK_RATE // main.FPS):
+            scene.update(STEP)
+        updates.append((time.perf_counter() - start) * 1000)
+        if broadphase:
+            start = time.perf_counter()
+            scene.draw(game.screen)
+            draws.append((time.perf_counter() - start) * 1000)
+
+    mode = "grid" if broadphase else "every platform"
+    line = (f"{count:>7} platforms  {mode:<15} update p50 {percentile(updates, 50):7.4f} ms  "
+            f"p99 {percentile(updates, 99):7.4f} ms")
+    if draws:
+        line += f"   draw p50 {percentile(draws, 50):6.3f} ms"
+    print(line + f"   ({len(updates)} frames, x={scene.player.pos.x:.0f})")
+
+
+def run_benchmarks():
+    for count in SIZES:
+        level = Level("generated", generate_level(count))
+        measure(level, count, broadphase=True)
+        if count <= BRUTE_FORCE_LIMIT:
+            measure(level, count, broadphase=False)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,69 @@
+# render_scale.py
+# Runs each scene with scripted input at full resolution, at half the render
+# resolution through pygame.SCALED, and at half upscaled into a full-size window,
+# and compares draw+flip cost. Layers load at each render scale's own size.
+# Run from the repo root: python benchmarks/render_scale.py
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import warnings
+
+import pygame
+import main
+import code.laser_labyrinth
+import code.platformer
+from code.display import WIDTH, HEIGHT, display
+from code.input_source import ReplayInput
+from code.profiler import percentile
+from code.scene import SceneManager
+from dirty_rects import walk_and_stop
+
+FRAMES = 1000
+CONFIGS = [
+    ("1x", 1, None),
+    ("0.5x scaled", 0.5, None),
+    ("0.5x upscaled", 0.5, (WIDTH, HEIGHT)),
+]
+SCENES = [
+    ("game", lambda game: (setattr(game, "sprite_pos", [300, 1300]), main.OverworldScene(game))[1]),
+    ("platformer", lambda game: code.platformer.PlatformerScene(game.selected_sprite)),
+    ("laser_labyrinth", lambda game: code.laser_labyrinth.LaserLabyrinthScene(game.selected_sprite)),
+]
+
+
+def measure(name, make_scene):
+    game = main.Game()
+    game.selected_sprite = game.sprite(0)
+    manager = SceneManager(game.screen, main.FPS, ReplayInput(walk_and_stop(FRAMES)), fixed_dt=1 / main.FPS)
+    manager.running = True
+    for _ in range(FRAMES):
+        if manager.top is None or manager.top.name != name:
+            manager.stack.clear()
+            manager.push(make_scene(game))
+        manager.step(manager.fixed_dt)
+    phases = manager.profiler.samples[name]
+    return [draw + flip for draw, flip in zip(phases["draw"], phases["flip"])]
+
+
+def run_benchmarks():
+    # The dummy driver has no GPU renderer for SCALED and says so
+    warnings.simplefilter("ignore")
+    for label, scale, window_size in CONFIGS:
+        pygame.display.quit()  # a fresh window for each mode
+        display.configure(scale, window_size)
+        start = time.perf_counter()
+        main.Game().image("background")
+        load_ms = (time.perf_counter() - start) * 1000
+        print(f"{label}: render {display.size[0]}x{display.size[1]}, map background loaded in {load_ms:.1f} ms")
+        for name, make_scene in SCENES:
+            render = measure(name, make_scene)
+            print(f"  {name:<16} draw+flip p50 {percentile(render, 50):6.3f} ms  p95 {percentile(render, 95):6.3f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,80 @@
+# simulation.py
+# Steps each scene headlessly with scripted input, uncapped, and reports how much
+# faster than real time it runs. Run from the repo root: python benchmarks/simulation.py
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+import code.game_state
+import code.laser_labyrinth
+import code.platformer
+from code.input_source import ReplayInput
+from code.scene import STEP, TICK_RATE, SceneManager
+
+FRAMES = 5000
+
+
+def scripted_frames(frames):
+    """Walk right and left in 40-frame strides, tapping jump every 25 frames."""
+    script = []
+    for i in range(frames):
+        keys = [pygame.K_RIGHT] if (i // 40) % 2 == 0 else [pygame.K_LEFT]
+        events = []
+        if i % 25 == 0:
+            events.append({"type": pygame.KEYDOWN, "key": pygame.K_SPACE, "mod": 0, "unicode": " ", "scancode": 44})
+        script.append({"dt": 1 / main.FPS, "events": events, "keys": keys, "mouse": [0, 0]})
+    return script
+
+
+def simulate(name, make_scene, draw=True):
+    game = main.Game()
+    game.selected_sprite = game.sprite(0)
+    manager = SceneManager(game.screen, main.FPS, ReplayInput(scripted_frames(FRAMES)), fixed_dt=1 / main.FPS)
+    manager.running = True
+
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        # Dying or winning pops the scene; start a fresh one so every frame is this scene
+        if manager.top is None:
+            manager.push(make_scene(game))
+        if draw:
+            manager.step(manager.fixed_dt)
+        else:
+            manager.input.begin_frame(manager.fixed_dt)
+            for event in manager.input.events():
+                manager.top.handle_event(event)
+            for _ in range(TICK_RATE // main.FPS):
+                if manager.top is None:
+                    break
+                manager.top.update(STEP)
+    elapsed = time.perf_counter() - start
+
+    simulated = FRAMES / main.FPS
+    mode = "update+draw" if draw else "update only"
+    print(f"{name:<16} {mode:<12} {FRAMES / elapsed:9.0f} frames/s  {simulated / elapsed:7.1f}x real time")
+
+
+def run_benchmarks():
+    def overworld(game):
+        game.sprite_pos = [1100, 1020]
+        return main.OverworldScene(game)
+
+    code.game_state.player_keys["platform_key"] = True
+    scenes = [
+        ("overworld", overworld),
+        ("platformer", lambda game: code.platformer.PlatformerScene(game.selected_sprite)),
+        ("laser_labyrinth", lambda game: code.laser_labyrinth.LaserLabyrinthScene(game.selected_sprite)),
+    ]
+    for name, make_scene in scenes:
+        simulate(name, make_scene, draw=False)
+        simulate(name, make_scene, draw=True)
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,51 @@
+# startup.py
+# Compares a cold launch (empty asset cache) with a warm one (baked surfaces on disk),
+# measured from just before the interpreter is started until the first title screen
+# frame has been flipped. The child exits with os._exit() straight after, so
+# interpreter shutdown and joining the overworld preload threads aren't counted.
+# Run from the repo root: python benchmarks/startup.py
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+
+# perf_counter() is the system-wide monotonic clock on Linux and macOS, so the
+# child's stamp can be compared with the one taken here
+STARTUP_SNIPPET = (
+    "import os, time, main, pygame; game = main.Game(); main.TitleScene(game).draw(game.screen); pygame.display.flip(); "
+    "print(time.perf_counter() - float(os.environ['STARTUP_START']), flush=True); os._exit(0)"
+)
+
+
+def launch(cache_dir):
+    env = dict(os.environ, SLEEPWALKERS_CACHE_DIR=cache_dir, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    env["STARTUP_START"] = repr(time.perf_counter())
+    result = subprocess.run([sys.executable, "-c", STARTUP_SNIPPET], cwd=ROOT, env=env, check=True,
+                            stdout=subprocess.PIPE, text=True)
+    return float(result.stdout.split()[-1])
+
+
+def main():
+    cache_dir = tempfile.mkdtemp(prefix="sleepwalkers-cache-")
+    try:
+        cold, warm = [], []
+        for _ in range(RUNS):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold.append(launch(cache_dir))
+            warm.append(launch(cache_dir))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    cold_best, warm_best = min(cold), min(warm)
+    print(f"cold launch: {cold_best * 1000:7.1f} ms (best of {RUNS})")
+    print(f"warm launch: {warm_best * 1000:7.1f} ms (best of {RUNS})")
+    print(f"speedup:     {cold_best / warm_best:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
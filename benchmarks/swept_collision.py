@@ -0,0 +1,81 @@
+# swept_collision.py
+# Fires platformer bodies at thin platforms at speeds far past anything in the game,
+# at several tick rates, and checks that none of them pass through.
+# Exits non-zero on any tunnel. Run from the repo root: python benchmarks/swept_collision.py
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import code.platformer as platformer
+from code.input_source import PressedKeys
+from code.levels import Solid
+from code.platformer import Player
+from code.spatial import SpatialGrid
+
+TICK_RATES = [30, 60, 120]
+SPEEDS = [1_000, 5_000, 20_000, 100_000]  # pixels per second
+THICKNESS = 4
+SECONDS = 1  # simulated per case; enough for the slowest body to arrive
+
+
+def wall(x, y, w, h):
+    return Solid(pygame.Rect(x, y, w, h))
+
+
+def fall(speed, dt):
+    """Drop onto a thin floor. Should come to rest on top of it."""
+    floor = wall(0, 600, 400, THICKNESS)
+    body = Player(100, 0)
+    body.vel_y = speed
+    platforms = SpatialGrid([floor])
+    for _ in range(round(SECONDS / dt)):
+        body.update(platforms, PressedKeys(), dt)
+    return body.rect.bottom == floor.rect.top
+
+
+def jump(speed, dt):
+    """Launch up into a thin ceiling. Should stop under it."""
+    ceiling = wall(0, 100, 400, THICKNESS)
+    body = Player(100, 600)
+    body.vel_y = -speed
+    body.update(SpatialGrid([ceiling]), PressedKeys(), dt)
+    return body.rect.top >= ceiling.rect.bottom
+
+
+def run(speed, dt):
+    """Run right into a thin wall. Should stop against it, not climb onto it."""
+    platformer.PLAYER_SPEED = speed
+    floor = wall(0, 650, 100_000, 50)
+    side = wall(600, 0, THICKNESS, 650)
+    body = Player(100, 600)
+    platforms, keys = SpatialGrid([floor, side]), PressedKeys([pygame.K_RIGHT])
+    for _ in range(round(SECONDS / dt)):
+        body.update(platforms, keys, dt)
+    return body.rect.right == side.rect.left and body.rect.bottom == floor.rect.top
+
+
+def run_benchmarks():
+    defaults = platformer.MAX_FALL_SPEED, platformer.PLAYER_SPEED
+    platformer.MAX_FALL_SPEED = float("inf")  # let the bodies go as fast as they're fired
+    failures = 0
+    for tick_rate in TICK_RATES:
+        for speed in SPEEDS:
+            start = time.perf_counter()
+            results = {case.__name__: case(speed, 1 / tick_rate) for case in (fall, jump, run)}
+            elapsed = (time.perf_counter() - start) * 1000
+            failures += list(results.values()).count(False)
+            status = "  ".join(f"{name} {'ok' if passed else 'TUNNELED'}" for name, passed in results.items())
+            print(f"{tick_rate:>4} Hz {speed:>8} px/s  {status}  ({elapsed:.2f} ms)")
+    platformer.MAX_FALL_SPEED, platformer.PLAYER_SPEED = defaults
+
+    print("no tunneling" if not failures else f"{failures} bodies tunneled")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if run_benchmarks() else 0)
@@ -0,0 +1,56 @@
+# text.py
+# Times drawing a page of dialogue by rendering every line each frame versus
+# blitting cached lines. Run from the repo root: python benchmarks/text.py
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+from code.text import draw_text, get_font, text_cache, wrap_text
+
+FRAMES = 1000
+DIALOGUE = ("YOU (being Kashyap) is incredibly up for the task, and decide to rise up to the challenge, "
+            "and save the princess from the forbidden dark! However, you MUST BE CAREFUL as any deaths "
+            "will forever kill you in this fantasy world, with no mercy for respawns!")
+
+
+def uncached_frame(surface, font):
+    # What the dialogue and riddle screens used to do every frame
+    lines = []
+    current_line = ""
+    for word in DIALOGUE.split(" "):
+        test_line = current_line + " " + word if current_line else word
+        if font.size(test_line)[0] <= main.WIDTH - 100:
+            current_line = test_line
+        else:
+            lines.append(current_line)
+            current_line = word
+    lines.append(current_line)
+    for i, line in enumerate(lines):
+        surface.blit(font.render(line, True, (255, 255, 255)), (50, 600 + i * 33))
+
+
+def cached_frame(surface, font):
+    draw_text(surface, wrap_text(DIALOGUE, font, main.WIDTH - 100), font, (255, 255, 255), (50, 600), 33)
+
+
+def run_benchmarks():
+    screen = main.Game().screen
+    font = get_font(28)
+    for name, frame in (("render every frame", uncached_frame), ("cached lines", cached_frame)):
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            frame(screen, font)
+        elapsed = (time.perf_counter() - start) / FRAMES * 1000
+        print(f"{name:<20} {elapsed:7.3f} ms per frame")
+    print(text_cache.stats())
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,80 @@
+# transitions.py
+# Times every frame of each screen transition at 60 FPS, the zooms against the
+# old smoothscale of the whole surface per frame, and reports whether each fits
+# the frame budget. Run from the repo root: python benchmarks/transitions.py
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+from code.profiler import percentile
+from code.transitions import CrossFade, FadeOut, IrisOut, ZoomTransition, zoom_mips
+
+DURATION = 0.5
+FRAMES = int(DURATION * main.FPS)
+RUNS = 5
+FRAME_BUDGET = 1000 / main.FPS
+
+
+def old_zoom(start_surface, zoom_in):
+    """A frame of the zoom as it used to be drawn: the whole surface smooth-scaled."""
+    def draw(surface, t):
+        width, height = surface.get_size()
+        scale = 1 + t if zoom_in else 2 - t
+        scaled_surface = pygame.transform.smoothscale(start_surface, (int(width * scale), int(height * scale)))
+        surface.fill((0, 0, 0))
+        surface.blit(scaled_surface, ((width - scaled_surface.get_width()) // 2, (height - scaled_surface.get_height()) // 2))
+    return draw
+
+
+def new(transition):
+    def draw(surface, t):
+        transition.elapsed = t * transition.duration
+        transition.draw(surface)
+    return draw
+
+
+def time_frames(draw, screen):
+    frames = []
+    for _ in range(RUNS):
+        for i in range(FRAMES + 1):
+            start = time.perf_counter()
+            draw(screen, i / FRAMES)
+            frames.append((time.perf_counter() - start) * 1000)
+    return percentile(frames, 50), percentile(frames, 99), max(frames)
+
+
+def run_benchmarks():
+    game = main.Game()
+    screen = game.screen
+    overworld = game.image("background")
+    selection = pygame.Surface(screen.get_size())
+    main.SelectionScene(game).draw(selection)
+
+    start = time.perf_counter()
+    zoom_mips(overworld, screen.get_size())
+    print(f"overworld mip chain built once in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    cases = [
+        ("zoom in, selection (old)", old_zoom(selection, True)),
+        ("zoom in, selection", new(ZoomTransition(selection, DURATION, zoom_in=True))),
+        ("zoom out, overworld (old)", old_zoom(overworld, False)),
+        ("zoom out, overworld", new(ZoomTransition(overworld, DURATION, zoom_in=False))),
+        ("fade", new(FadeOut(DURATION))),
+        ("crossfade", new(CrossFade(selection, DURATION))),
+        ("iris", new(IrisOut(DURATION))),
+    ]
+    for name, draw in cases:
+        p50, p99, worst = time_frames(draw, screen)
+        verdict = "fits" if worst < FRAME_BUDGET else "over"
+        print(f"{name:<26} p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  max {worst:6.2f} ms  ({verdict} {main.FPS} FPS)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_benchmarks()
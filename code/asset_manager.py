@@ -0,0 +1,393 @@
+# asset_manager.py
+import hashlib
+import os
+import struct
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+from code.display import render_size
+
+MEMORY_BUDGET = 256 * 1024 * 1024  # bytes of decoded pixels kept resident
+
+# Baked surfaces live here between launches; delete the folder to rebuild them
+CACHE_DIR = os.path.join(os.environ.get("SLEEPWALKERS_CACHE_DIR", ".cache"), "assets")
+CACHE_VERSION = 2  # 2: opaque images are baked as RGB
+HEADER = struct.Struct("<4sHII")  # magic, version, width, height
+
+PRELOAD_WORKERS = 2
+
+MASK_THRESHOLD = 127  # alpha a pixel needs to count as solid for collisions
+
+
+def surface_bytes(surface):
+    """Approximate memory used by a surface's pixels."""
+    return surface.get_pitch() * surface.get_height()
+
+
+def mask_bytes(mask):
+    """Approximate memory used by a mask's bits."""
+    width, height = mask.get_size()
+    return -(-width // 8) * height
+
+
+def pixel_format(surface):
+    return f"{surface.get_bitsize()}-bit {'RGBA' if surface.get_flags() & pygame.SRCALPHA else 'RGB'}"
+
+
+def is_opaque(surface):
+    """True if every pixel of a per-pixel-alpha surface is fully solid."""
+    width, height = surface.get_size()
+    return pygame.mask.from_surface(surface, 254).count() == width * height
+
+
+def asset_key(path, size=None, alpha=True, smooth=False):
+    return (path, tuple(size) if size else None, alpha, smooth)
+
+
+class AssetManager:
+    """
+    Loads images once and hands out the same surface on every later request.
+    Surfaces are keyed on (path, size, alpha, smooth) and evicted least recently
+    used first once the memory budget is exceeded.
+    Returned surfaces are shared, so never draw onto them.
+    Pass cache=False for one-off surfaces that are converted into something else.
+    preload() starts the same work on a background thread; the next load_image()
+    for that key picks up the result instead of loading it again.
+    Images asked for with alpha that turn out to have no transparent pixels are
+    kept without it, so they blit as plain copies.
+    Scenes register their ASSETS tables as named groups; report() breaks memory
+    down per asset and per group, and unload() drops a group's surfaces when its
+    scene exits.
+    """
+
+    def __init__(self, budget=MEMORY_BUDGET, cache_dir=CACHE_DIR):
+        self.budget = budget
+        self.cache_dir = cache_dir
+        self.surfaces = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        # Background loading
+        self.executor = None
+        self.pending = {}  # key -> Future of (image, seconds, baked)
+        self.load_log = {}  # key -> (seconds spent loading, "sync" / "prefetch hit" / "prefetch wait")
+        self.prefetch_hits = 0  # preloaded in time
+        self.prefetch_waits = 0  # preload still running when the scene needed it
+
+        # Collision masks, dropped along with their surface
+        self.masks = weakref.WeakKeyDictionary()  # surface -> {radius: Mask}
+
+        self.groups = {}  # name -> (ASSETS table, names in it loaded as layers)
+
+    def load_image(self, path, size=None, alpha=True, smooth=False, cache=True):
+        key = asset_key(path, size, alpha, smooth)
+        image = self.surfaces.get(key)
+        if image is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return image
+
+        future = self.pending.pop(key, None)
+        if future is not None:
+            if future.done():
+                self.prefetch_hits += 1
+                source = "prefetch hit"
+            else:
+                self.prefetch_waits += 1
+                source = "prefetch wait"
+            image, seconds, baked = future.result()
+        else:
+            self.misses += 1
+            source = "sync"
+            image, seconds, baked = self._load(path, size, alpha, smooth)
+
+        if image is None:
+            print(f"File not found: {path}")
+            return None
+        # Counted here, on the main thread, rather than by the worker that loaded it
+        self.disk_hits += baked
+        self.load_log[key] = (seconds, source)
+        if not cache:
+            return image
+
+        self.surfaces[key] = image
+        self.used_bytes += surface_bytes(image)
+        self._evict()
+        return image
+
+    def preload(self, path, size=None, alpha=True, smooth=False):
+        """Start loading an image on a worker thread. Returns its Future."""
+        key = asset_key(path, size, alpha, smooth)
+        if key in self.surfaces:
+            return None
+        if key not in self.pending:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(PRELOAD_WORKERS, thread_name_prefix="asset-loader")
+            self.pending[key] = self.executor.submit(self._load, path, size, alpha, smooth)
+        return self.pending[key]
+
+    def _load(self, path, size, alpha, smooth):
+        """
+        Decode, convert and scale one image: (image, seconds, whether it came
+        from the disk cache). Runs on the main or a worker thread, so it only
+        touches the disk and the image, never the manager's counters.
+        """
+        start = time.perf_counter()
+        if not os.path.exists(path):
+            return None, 0, False
+
+        image = self._load_baked(path, size, alpha, smooth)
+        baked = image is not None
+        if image is None:
+            image = pygame.image.load(path)
+            image = image.convert_alpha() if alpha else image.convert()
+            if size:
+                scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+                image = scale(image, size)
+            if alpha and is_opaque(image):
+                image = image.convert()  # blits skip blending; the bake skips the alpha channel
+            self._bake(image, path, size, alpha, smooth)
+        return image, time.perf_counter() - start, baked
+
+    # ---------------- DISK CACHE ----------------
+    def _baked_path(self, path, size, alpha, smooth):
+        # Keyed on the source's mtime and size so an edited PNG is re-baked
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{size}|{alpha}|{smooth}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".raw")
+
+    def _load_baked(self, path, size, alpha, smooth):
+        if not self.cache_dir:
+            return None
+        baked_path = self._baked_path(path, size, alpha, smooth)
+        try:
+            with open(baked_path, "rb") as f:
+                magic, version, width, height = HEADER.unpack(f.read(HEADER.size))
+                pixels = f.read()
+        except (OSError, struct.error):
+            return None
+
+        if magic != b"SLWK" or version != CACHE_VERSION:
+            return None
+        # Opaque images were baked without alpha, whatever was asked for
+        if alpha and len(pixels) == width * height * 4:
+            has_alpha = True
+        elif len(pixels) == width * height * 3:
+            has_alpha = False
+        else:
+            return None
+
+        # Raw pixels are already at the target size, so only a format convert remains
+        image = pygame.image.frombuffer(pixels, (width, height), "RGBA" if has_alpha else "RGB")
+        return image.convert_alpha() if has_alpha else image.convert()
+
+    def _bake(self, image, path, size, alpha, smooth):
+        if not self.cache_dir:
+            return
+        baked_path = self._baked_path(path, size, alpha, smooth)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file first so a crash never leaves half a surface behind
+            tmp_path = baked_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(b"SLWK", CACHE_VERSION, *image.get_size()))
+                f.write(pygame.image.tobytes(image, "RGBA" if image.get_flags() & pygame.SRCALPHA else "RGB"))
+            os.replace(tmp_path, baked_path)
+        except OSError as e:
+            print(f"Could not cache {path}: {e}")
+
+    # ---------------- COLLISION MASKS ----------------
+    def mask(self, surface, radius=0):
+        """
+        Mask of surface's solid pixels, built the first time it's asked for.
+        radius > 0 grows it by that many pixels all round, for testing against
+        thick lines; its top-left then sits radius pixels up and left of the
+        surface's.
+        """
+        masks = self.masks.get(surface)
+        if masks is None:
+            masks = self.masks[surface] = {}
+        mask = masks.get(radius)
+        if mask is None:
+            if radius:
+                mask = self.mask(surface).convolve(disk_mask(radius))
+            else:
+                mask = pygame.mask.from_surface(surface, MASK_THRESHOLD)
+            masks[radius] = mask
+        return mask
+
+    # ---------------- GROUPS ----------------
+    def register(self, name, scene_assets, layers=()):
+        """Name a scene's ASSETS table (see preload_assets()) for report() and unload()."""
+        self.groups[name] = (scene_assets, frozenset(layers))
+
+    def group_keys(self, name):
+        scene_assets, layers = self.groups[name]
+        return {asset_key(path, render_size(size) if entry in layers else size, *rest)
+                for entry, (path, size, *rest) in scene_assets.items()}
+
+    def unload(self, name):
+        """
+        Drop a group's surfaces, and any preloads still running for them, except
+        those another group also lists. Returns the bytes dropped from the cache;
+        they are freed once nothing else holds the surfaces.
+        """
+        shared = set()
+        for other in self.groups:
+            if other != name:
+                shared |= self.group_keys(other)
+        freed = 0
+        for key in self.group_keys(name) - shared:
+            future = self.pending.pop(key, None)
+            if future is not None:
+                future.cancel()
+            image = self.surfaces.pop(key, None)
+            if image is not None:
+                freed += surface_bytes(image)
+        self.used_bytes -= freed
+        return freed
+
+    def preloaded(self):
+        """{key: surface} for preloads that have finished but haven't been asked for yet."""
+        done = {}
+        for key, future in self.pending.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                image = future.result()[0]
+                if image is not None:
+                    done[key] = image
+        return done
+
+    def preloaded_bytes(self):
+        return sum(surface_bytes(image) for image in self.preloaded().values())
+
+    def report(self):
+        """
+        Resident memory: "assets" has one row per cached surface and finished
+        preload ("preloaded" marks the latter), biggest first, with its bytes,
+        pixel format, whether it keeps an alpha channel (only images with
+        transparent pixels do) and the groups listing it; "groups" totals each
+        group's rows; "masks" counts the collision masks. "bytes" covers the
+        preloads too, as they count against the budget.
+        """
+        key_groups = {}
+        for name in self.groups:
+            for key in self.group_keys(name):
+                key_groups.setdefault(key, []).append(name)
+
+        rows = []
+        preloaded = self.preloaded()
+        for key, image in [*self.surfaces.items(), *preloaded.items()]:
+            rows.append({
+                "path": key[0],
+                "size": image.get_size(),
+                "bytes": surface_bytes(image),
+                "format": pixel_format(image),
+                "alpha": bool(image.get_flags() & pygame.SRCALPHA),
+                "groups": key_groups.get(key, []),
+                "preloaded": key in preloaded,
+            })
+        rows.sort(key=lambda row: row["bytes"], reverse=True)
+
+        groups = {name: 0 for name in self.groups}
+        for row in rows:
+            for name in row["groups"]:
+                groups[name] += row["bytes"]
+        masks = sum(mask_bytes(mask) for masks in self.masks.values() for mask in masks.values())
+        preloaded_bytes = sum(surface_bytes(image) for image in preloaded.values())
+        return {"assets": rows, "groups": groups, "masks": masks, "bytes": self.used_bytes + preloaded_bytes,
+                "preloaded": preloaded_bytes}
+
+    def _evict(self):
+        # Finished preloads hold their pixels too, so they count against the budget.
+        # Always keep the newest surface, even if it alone is over budget
+        preloaded = self.preloaded_bytes() if self.pending else 0
+        while self.used_bytes + preloaded > self.budget and len(self.surfaces) > 1:
+            _, image = self.surfaces.popitem(last=False)
+            self.used_bytes -= surface_bytes(image)
+
+    def clear(self):
+        # Finished preloads count against the budget, so they go too
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.surfaces.clear()
+        self.masks.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "prefetch_hits": self.prefetch_hits,
+            "prefetch_waits": self.prefetch_waits,
+            "surfaces": len(self.surfaces),
+            "masks": sum(len(masks) for masks in self.masks.values()),
+            "bytes": self.used_bytes,
+            "preloaded_bytes": self.preloaded_bytes(),
+        }
+
+
+def disk_mask(radius):
+    size = 2 * radius + 1
+    mask = pygame.mask.Mask((size, size))
+    for x in range(size):
+        for y in range(size):
+            if (x - radius) ** 2 + (y - radius) ** 2 <= radius * radius:
+                mask.set_at((x, y))
+    return mask
+
+
+# Shared by every scene so re-entering one never touches the disk again
+assets = AssetManager()
+
+
+def load_image(path, size=None, alpha=True, smooth=False, cache=True):
+    return assets.load_image(path, size, alpha, smooth, cache)
+
+
+def preload(path, size=None, alpha=True, smooth=False):
+    return assets.preload(path, size, alpha, smooth)
+
+
+def load_layer(path, size, alpha=True, cache=True):
+    """
+    A screen- or map-sized image that is only ever drawn, loaded straight at
+    the display's render scale (size is logical). Each render scale gets its
+    own entry in the disk cache, so switching resolution never rescales at run time.
+    """
+    return assets.load_image(path, render_size(size), alpha, cache=cache)
+
+
+def preload_layer(path, size, alpha=True):
+    return assets.preload(path, render_size(size), alpha)
+
+
+def preload_assets(scene_assets, layers=()):
+    """Preload every (path, size[, alpha]) entry of a scene's ASSETS table; the names in layers as layers."""
+    for name, args in scene_assets.items():
+        if name in layers:
+            preload_layer(*args)
+        else:
+            assets.preload(*args)
+
+
+def get_mask(surface, radius=0):
+    return assets.mask(surface, radius)
+
+
+def register_assets(name, scene_assets, layers=()):
+    assets.register(name, scene_assets, layers)
+
+
+def unload_assets(name):
+    return assets.unload(name)
+
+
+def memory_report():
+    return assets.report()
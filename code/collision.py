@@ -0,0 +1,28 @@
+# collision.py
+from functools import lru_cache
+
+import pygame
+from code.asset_manager import get_mask
+
+
+@lru_cache(maxsize=None)
+def rect_mask(size):
+    """A solid mask of size, shared by every rect of that size."""
+    return pygame.mask.Mask(size, fill=True)
+
+
+def sprites_collide(sprite, rect, other, other_rect):
+    """Rect check first, then the two sprites' cached masks pixel by pixel."""
+    if not rect.colliderect(other_rect):
+        return False
+    offset = (other_rect.x - rect.x, other_rect.y - rect.y)
+    return get_mask(sprite).overlap(get_mask(other), offset) is not None
+
+
+def sprite_hits_rect(sprite, rect, area):
+    """True if any solid pixel of sprite, drawn at rect, lies inside area."""
+    overlap = rect.clip(area)
+    if not overlap:
+        return False
+    offset = (overlap.x - rect.x, overlap.y - rect.y)
+    return get_mask(sprite).overlap(rect_mask(overlap.size), offset) is not None
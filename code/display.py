@@ -0,0 +1,199 @@
+# display.py
+import math
+import weakref
+
+import pygame
+
+WIDTH, HEIGHT = 1200, 800  # the logical screen every scene, level and asset table is laid out on
+CAPTION = "Camera with Edges"
+FULLSCREEN_KEY = pygame.K_F11
+
+MOUSE_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+
+class Display:
+    """
+    The window and the resolution frames are actually rendered at.
+    Scenes lay everything out on the logical WIDTH x HEIGHT screen and draw
+    through render_pos(), render_rect() and render_image(); with scale below 1
+    those land on a smaller surface, and big images come from load_layer()
+    already baked at that size, so a frame fills scale ** 2 as many pixels.
+    The finished frame reaches the window one of three ways:
+      plain     scale 1, windowed: the window is the render surface, as before
+      scaled    pygame.SCALED: SDL stretches the render surface to fit the
+                window or the screen, letterboxed
+      upscale   a window_size window; present() scales each finished frame
+                into it, letterboxed
+    Resizing the window or going fullscreen never rescales an asset; at most
+    the finished frame is scaled, once.
+    """
+
+    def __init__(self):
+        self.scale = 1
+        self.size = (WIDTH, HEIGHT)  # render resolution
+        self.window_size = None
+        self.fullscreen = False
+        self.window = None  # the display surface
+        self.surface = None  # what scenes draw on: the window itself unless upscaling
+        self.viewport = pygame.Rect(0, 0, WIDTH, HEIGHT)  # where the frame sits, in mouse coordinates
+        self.images = weakref.WeakKeyDictionary()  # surface -> its copy at render scale
+
+    def configure(self, scale=1, window_size=None, fullscreen=False):
+        """Pick the render scale and window; the next open() sets the mode to match."""
+        self.window = self.surface = None
+        self.scale = scale
+        self.size = (max(1, round(WIDTH * scale)), max(1, round(HEIGHT * scale)))
+        self.window_size = tuple(window_size) if window_size else None
+        self.fullscreen = fullscreen
+        self.images.clear()
+
+    @property
+    def upscale(self):
+        return self.window_size is not None
+
+    def open(self):
+        if self.window is None:
+            pygame.init()
+            self._set_mode()
+            pygame.display.set_caption(CAPTION)
+        return self.surface
+
+    def _set_mode(self):
+        if self.upscale:
+            if self.fullscreen:
+                self.window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+            else:
+                self.window = pygame.display.set_mode(self.window_size, pygame.RESIZABLE)
+            if self.surface is None:
+                self.surface = pygame.Surface(self.size).convert()
+            self._fit()
+            return
+
+        if self.scale == 1 and not self.fullscreen:
+            flags = 0
+        else:
+            flags = pygame.SCALED | (pygame.FULLSCREEN if self.fullscreen else pygame.RESIZABLE)
+        self.window = self.surface = pygame.display.set_mode(self.size, flags)
+        # SDL maps mouse positions back onto the render surface for us
+        self.viewport = pygame.Rect((0, 0), self.size)
+
+    def _fit(self):
+        """Letterbox the frame into the window at the largest size that keeps its shape."""
+        window_width, window_height = self.window.get_size()
+        fit = min(window_width / WIDTH, window_height / HEIGHT)
+        self.viewport = pygame.Rect(0, 0, round(WIDTH * fit), round(HEIGHT * fit))
+        self.viewport.center = (window_width // 2, window_height // 2)
+        self.window.fill((0, 0, 0))
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        if not self.upscale:
+            try:
+                pygame.display.toggle_fullscreen()
+                return
+            except pygame.error:
+                pass  # not every video driver can switch in place
+        self._set_mode()
+
+    def resized(self):
+        """Call after the window changes size."""
+        if self.upscale:
+            self.window = pygame.display.get_surface()
+            self._fit()
+
+    def present(self, rects=None):
+        """Show the finished frame; rects limits it to those parts of the render surface."""
+        if self.window is not None and self.surface is not self.window:
+            pygame.transform.scale(self.surface, self.viewport.size, self.window.subsurface(self.viewport))
+            pygame.display.flip()
+        elif rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+    def image(self, surface):
+        """surface scaled to render scale, built the first time it's drawn."""
+        if self.scale == 1:
+            return surface
+        image = self.images.get(surface)
+        if image is None:
+            size = render_size(surface.get_size())
+            colorkey = surface.get_colorkey()
+            if colorkey is None and surface.get_bitsize() >= 24:
+                image = pygame.transform.smoothscale(surface, size)
+            else:
+                # Blending would smear the colorkey into the edges
+                image = pygame.transform.scale(surface, size)
+                if colorkey is not None:
+                    image.set_colorkey(colorkey, pygame.RLEACCEL)
+            self.images[surface] = image
+        return image
+
+
+# Shared by every scene; main.py configures it from the command line
+display = Display()
+
+
+def render_size(size):
+    scale = display.scale
+    if scale == 1:
+        return tuple(size)
+    return (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+
+
+def render_pos(pos):
+    scale = display.scale
+    if scale == 1:
+        return pos
+    return (round(pos[0] * scale), round(pos[1] * scale))
+
+
+def render_rect(rect, margin=0):
+    """
+    The render-surface rect covering a logical rect. At other scales than 1,
+    margin adds that many pixels all round, for covering an image drawn with
+    render_pos() and render_image(), which each round by up to half a pixel.
+    """
+    scale = display.scale
+    if scale == 1:
+        return rect
+    rect = pygame.Rect(rect)
+    left, top = math.floor(rect.left * scale) - margin, math.floor(rect.top * scale) - margin
+    return pygame.Rect(left, top, math.ceil(rect.right * scale) + margin - left, math.ceil(rect.bottom * scale) + margin - top)
+
+
+def render_width(width):
+    """A line width at render scale, never thinner than a pixel."""
+    return max(1, round(width * display.scale))
+
+
+def render_image(surface):
+    return display.image(surface)
+
+
+def logical_rect(rect):
+    """The logical rect covering a rect of the render surface, e.g. its clip."""
+    scale = display.scale
+    if scale == 1:
+        return rect
+    left, top = math.floor(rect.left / scale), math.floor(rect.top / scale)
+    return pygame.Rect(left, top, math.ceil(rect.right / scale) - left, math.ceil(rect.bottom / scale) - top)
+
+
+def logical_pos(pos):
+    """A mouse position from the window on the logical screen."""
+    viewport = display.viewport
+    if viewport.topleft == (0, 0) and viewport.size == (WIDTH, HEIGHT):
+        return pos
+    return (int((pos[0] - viewport.x) * WIDTH / viewport.width),
+            int((pos[1] - viewport.y) * HEIGHT / viewport.height))
+
+
+def logical_event(event):
+    """event with any mouse position moved onto the logical screen."""
+    if event.type not in MOUSE_EVENTS:
+        return event
+    pos = logical_pos(event.pos)
+    if pos is event.pos:
+        return event
+    return pygame.event.Event(event.type, {**event.dict, "pos": pos})
@@ -0,0 +1,155 @@
+# input_source.py
+import json
+
+import pygame
+from code.display import logical_event, logical_pos
+
+# Keys the scenes poll every frame; only these are recorded
+TRACKED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE)
+
+# Event types worth replaying, and the attributes each one needs
+RECORDED_EVENTS = {
+    pygame.QUIT: (),
+    pygame.KEYDOWN: ("key", "mod", "unicode", "scancode"),
+    pygame.KEYUP: ("key", "mod", "unicode", "scancode"),
+    pygame.MOUSEBUTTONDOWN: ("pos", "button"),
+    pygame.MOUSEBUTTONUP: ("pos", "button"),
+    pygame.MOUSEMOTION: ("pos",),  # idle screens redraw their hover state on these
+}
+
+
+class PressedKeys:
+    """Stands in for pygame.key.get_pressed() during a replay: keys[pygame.K_LEFT] -> bool."""
+
+    def __init__(self, keys=()):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class LiveInput:
+    """
+    Reads the real keyboard and mouse. The SceneManager calls begin_frame(dt)
+    once per frame and steps the scenes with the dt it returns.
+    Mouse positions come out on the logical screen whatever the window size,
+    so recordings replay the same at any resolution.
+    """
+
+    def __init__(self):
+        self.woken = None  # the event that ended the last wait(), handed out first by events()
+
+    def wait(self, timeout):
+        """Sleep until an event arrives or timeout (ms) runs out."""
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.woken = event
+
+    def begin_frame(self, dt):
+        return dt
+
+    def events(self):
+        events = pygame.event.get()
+        if self.woken is not None:
+            events.insert(0, self.woken)
+            self.woken = None
+        return [logical_event(event) for event in events]
+
+    def pressed(self):
+        return pygame.key.get_pressed()
+
+    def mouse_pos(self):
+        return logical_pos(pygame.mouse.get_pos())
+
+    def close(self):
+        pass
+
+
+class RecordingInput(LiveInput):
+    """Plays live and writes every frame's input to path when the game closes."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.frames = []
+
+    def begin_frame(self, dt):
+        self.frames.append({"dt": dt, "events": [], "keys": [], "mouse": [0, 0]})
+        return dt
+
+    def events(self):
+        events = super().events()
+        self.frames[-1]["events"] = [
+            {"type": event.type, **{attr: getattr(event, attr) for attr in RECORDED_EVENTS[event.type]}}
+            for event in events if event.type in RECORDED_EVENTS
+        ]
+        return events
+
+    def pressed(self):
+        keys = pygame.key.get_pressed()
+        self.frames[-1]["keys"] = [key for key in TRACKED_KEYS if keys[key]]
+        return keys
+
+    def mouse_pos(self):
+        pos = super().mouse_pos()
+        self.frames[-1]["mouse"] = list(pos)
+        return pos
+
+    def close(self):
+        with open(self.path, "w") as f:
+            json.dump({"frames": self.frames}, f)
+        print(f"Recorded {len(self.frames)} frames to {self.path}")
+
+
+class ReplayInput:
+    """
+    Feeds back a recording frame by frame, then sends QUIT.
+    Build it from a file with ReplayInput.load(path) or from a list of frames
+    ({"events": [...], "keys": [...], "mouse": [x, y]}) for scripted runs.
+    Recorded frame times are replayed too, so timers fire on the same frame.
+    """
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.index = -1
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f)["frames"])
+
+    def _frame(self):
+        if 0 <= self.index < len(self.frames):
+            return self.frames[self.index]
+        return None
+
+    def begin_frame(self, dt):
+        self.index += 1
+        frame = self._frame()
+        return frame.get("dt", dt) if frame else dt
+
+    def wait(self, timeout):
+        pass  # replays never wait; the recorded dt already covers any idle time
+
+    def events(self):
+        frame = self._frame()
+        if frame is None:
+            return [pygame.event.Event(pygame.QUIT)]
+        events = []
+        for recorded in frame["events"]:
+            attrs = {k: tuple(v) if isinstance(v, list) else v for k, v in recorded.items() if k != "type"}
+            events.append(pygame.event.Event(recorded["type"], attrs))
+        # Drain the real queue so it never fills up or makes the window look hung
+        pygame.event.clear()
+        return events
+
+    def pressed(self):
+        frame = self._frame()
+        return PressedKeys(frame["keys"] if frame else ())
+
+    def mouse_pos(self):
+        frame = self._frame()
+        return tuple(frame["mouse"]) if frame else (0, 0)
+
+    def close(self):
+        pass
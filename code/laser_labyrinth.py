@@ -2,87 +2,66 @@
 
 import pygame
 from code.game_state import player_keys
-import os
-
-WIDTH, HEIGHT = 1200, 800
-FPS = 60
-laser_color = (214, 60, 60)
-
-class Laser:
-    def __init__(self, x, y, w, h, speed, direction='horizontal'):
-        self.rect = pygame.Rect(x, y, w, h)
-        self.speed = speed
-        self.direction = direction  # 'horizontal' or 'vertical'
-
-    def update(self):
-        if self.direction == 'horizontal':
-            self.rect.x += self.speed
-            if self.rect.left < 0 or self.rect.right > WIDTH:
-                self.speed *= -1
-        else:
-            self.rect.y += self.speed
-            if self.rect.top < 0 or self.rect.bottom > HEIGHT:
-                self.speed *= -1
-
-def load_image(path, size=None):
-    if os.path.exists(path):
-        img = pygame.image.load(path).convert_alpha()
-        if size:
-            img = pygame.transform.scale(img, size)
-        return img
-    else:
-        print(f"File not found: {path}")
-        return None
-
-def fade_out(screen, duration=0.5):
-    """Fade out effect."""
-    clock = pygame.time.Clock()
-    overlay = pygame.Surface((WIDTH, HEIGHT))
-    overlay.fill((0, 0, 0))
-    steps = int(duration * FPS)
-    for i in range(steps):
-        alpha = int((i / steps) * 255)
-        overlay.set_alpha(alpha)
-        screen.blit(overlay, (0, 0))
-        pygame.display.flip()
-        clock.tick(FPS)
-
-def run_laser_labyrinth(screen, player_sprite):
-    global player_keys
-    clock = pygame.time.Clock()
-    running = True
-
-    # Load background
-    background = load_image("assets/laser_labyrinth/laser_map.png", (WIDTH, HEIGHT))
-    hardcore_heart = load_image("assets/main/hardcore_heart.png", (50,50))
-
-    # Player start position
-    sprite_width = player_sprite.get_width()
-    sprite_height = player_sprite.get_height()
-    start_pos = (100, HEIGHT - 150)
-    player_rect = pygame.Rect(*start_pos, sprite_width, sprite_height)
-
-    # Hitbox smaller than sprite for accurate collision
-    HITBOX_PADDING_X = 10
-    HITBOX_PADDING_Y = 10
-
-    # Player speed
-    speed = 5
-
-    # Lasers
-    lasers = [
-        Laser(100, 50, 200, 20, 3, 'horizontal'),
-        Laser(400, 150, 20, 200, 2, 'vertical'),
-        Laser(200, 400, 300, 20, 4, 'horizontal'),
-        Laser(600, 100, 20, 300, 3, 'vertical')
-    ]
-
-    # Exit
-    exit_rect = pygame.Rect(WIDTH - 100, 50, 50, 50)
-
-    while running:
-        clock.tick(FPS)
-        keys = pygame.key.get_pressed()
+from code.asset_manager import load_image, load_layer
+from code.collision import sprite_hits_rect
+from code.display import HEIGHT, WIDTH, render_image, render_pos, render_rect
+from code.lasers import LaserField
+from code.levels import load_level
+from code.scene import Scene, lerp
+from code.transitions import FadeOut
+
+DIRTY_RECT_LIMIT = 64  # past this many lasers a full redraw is cheaper than tracking each one
+
+# Everything the scene loads, so the overworld can preload it on approach
+ASSETS = {
+    "background": ("assets/laser_labyrinth/laser_map.png", (WIDTH, HEIGHT)),
+    "hardcore_heart": ("assets/main/hardcore_heart.png", (50, 50)),
+}
+LAYERS = {"background"}  # loaded at the display's render scale, see load_layer()
+
+class LaserLabyrinthScene(Scene):
+    """
+    Dodge the moving lasers and reach the exit to earn the lab key.
+    Finishes with "main" (made it out), "restart_adventure" (hit a laser) or "quit".
+    level is a code.levels.Level, by default assets/levels/laser_labyrinth.json,
+    with the lasers and an "exit" zone.
+    """
+
+    name = "laser_labyrinth"
+
+    # Player speed, pixels per second
+    speed = 300
+
+    def __init__(self, player_sprite, level=None):
+        super().__init__()
+        self.player_sprite = player_sprite
+
+        # Load background
+        self.background = load_layer(*ASSETS["background"])
+        self.hardcore_heart = load_image(*ASSETS["hardcore_heart"])
+
+        level = level or load_level("laser_labyrinth")
+
+        # Player start position
+        sprite_width = player_sprite.get_width()
+        sprite_height = player_sprite.get_height()
+        start_pos = level.start
+        self.player_rect = pygame.Rect(*start_pos, sprite_width, sprite_height)
+        self.pos = pygame.Vector2(start_pos)
+        self.prev_pos = pygame.Vector2(start_pos)
+
+        # Lasers
+        self.lasers = LaserField(level.lasers, (WIDTH, HEIGHT))
+
+        # Exit
+        self.exit_rect = level.zone("exit")
+
+    def update(self, dt):
+        player_rect = self.player_rect
+        prev_rect = player_rect.copy()
+        pos = self.pos
+        speed = self.speed * dt
+        keys = self.manager.input.pressed()
         dx, dy = 0, 0
         if keys[pygame.K_LEFT]: dx = -speed
         if keys[pygame.K_RIGHT]: dx = speed
@@ -90,51 +69,51 @@ def run_laser_labyrinth(screen, player_sprite):
         if keys[pygame.K_DOWN]: dy = speed
 
         # Move player
-        player_rect.x += dx
-        player_rect.y += dy
+        self.prev_pos.update(pos)
+        pos.x += dx
+        pos.y += dy
 
         # Keep player in screen bounds
-        player_rect.x = max(0, min(player_rect.x, WIDTH - player_rect.width))
-        player_rect.y = max(0, min(player_rect.y, HEIGHT - player_rect.height))
-
-        # Hitbox for collisions
-        hitbox = pygame.Rect(
-            player_rect.x + HITBOX_PADDING_X,
-            player_rect.y + HITBOX_PADDING_Y,
-            player_rect.width - 2 * HITBOX_PADDING_X,
-            player_rect.height - 2 * HITBOX_PADDING_Y
-        )
+        pos.x = max(0, min(pos.x, WIDTH - player_rect.width))
+        pos.y = max(0, min(pos.y, HEIGHT - player_rect.height))
+        player_rect.topleft = (round(pos.x), round(pos.y))
 
         # Update lasers
-        for laser in lasers:
-            laser.update()
+        self.lasers.update(dt)
+
+        # Check collisions with lasers and the exit. Swept over the whole tick,
+        # so a fast laser (or a long tick) can't skip over the player, and
+        # pixel-perfect against the sprite's mask
+        with self.manager.profiler.phase("collision"):
+            hit = self.lasers.hits(player_rect, prev_rect, self.player_sprite)
+            reached_exit = sprite_hits_rect(self.player_sprite, player_rect, self.exit_rect)
 
-        # Check collisions with lasers
-        if any(hitbox.colliderect(laser.rect) for laser in lasers):
-            player_keys = {k: False for k in player_keys}
-            fade_out(screen, duration=0.5)
-            return "restart_adventure"    
+        if hit:
+            for key in player_keys:
+                player_keys[key] = False
+            self.manager.push(FadeOut(duration=0.5), lambda _: self.finish("restart_adventure"))
 
-        # Check if reached exit
-        if hitbox.colliderect(exit_rect):
+        elif reached_exit:
             player_keys["lab_key"] = True  # Give the lab key
-            fade_out(screen, duration=0.5)  # Fade (LOW TAPER FADEEEEEEE)
-            return "main"
+            self.manager.push(FadeOut(duration=0.5), lambda _: self.finish("main"))  # Fade (LOW TAPER FADEEEEEEE)
 
+    def draw(self, surface):
         # Draw stuff
-        if background:
-            screen.blit(background, (0, 0))
+        if self.background:
+            surface.blit(self.background, (0, 0))
         else:
-            screen.fill((0, 0, 0))  # Fallback background
-
-        for laser in lasers:
-            pygame.draw.rect(screen, laser_color, laser.rect, border_radius= 15)  # Red lasers
-        pygame.draw.rect(screen, (0, 255, 0), exit_rect)  # Green exit
-        screen.blit(player_sprite, (player_rect.x, player_rect.y))
-
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return "quit"
-
-        pygame.display.flip()
\ No newline at end of file
+            surface.fill((0, 0, 0))  # Fallback background
+
+        alpha = self.manager.alpha
+        self.lasers.draw(surface, alpha)  # Red lasers
+        pygame.draw.rect(surface, (0, 255, 0), render_rect(self.exit_rect))  # Green exit
+        surface.blit(render_image(self.player_sprite), render_pos(lerp(self.prev_pos, self.pos, alpha)))
+
+    def moving_rects(self):
+        if self.lasers.count > DIRTY_RECT_LIMIT:
+            return None
+        alpha = self.manager.alpha
+        rects = self.lasers.screen_rects(alpha)
+        rects["player"] = self.player_rect.copy()
+        rects["player"].topleft = lerp(self.prev_pos, self.pos, alpha)
+        return rects
@@ -0,0 +1,283 @@
+# lasers.py
+import math
+
+import numpy as np
+import pygame
+from code.asset_manager import get_mask
+from code.display import render_image, render_pos, render_width
+
+LASER_COLOR = (214, 60, 60)
+BORDER_RADIUS = 15
+COLORKEY = (0, 0, 0)
+MAX_BEAM_SAMPLES = 16  # beam angles tested per tick when sweeping, at most
+MAX_MASK_SAMPLES = 32  # positions a candidate laser is mask-tested at per tick, at most
+
+
+class LaserField:
+    """
+    Every laser in a level as NumPy arrays, moved and hit-tested in one
+    vectorized step instead of one object at a time.
+    Built from a list of laser dicts, one per laser:
+      {"pattern": "bounce", "rect": (x, y, w, h), "velocity": (vx, vy)}
+          straight line at px/s, reversing at the edges of bounds
+      {"pattern": "sine", "rect": (x, y, w, h), "amplitude": (ax, ay), "period": s, "phase": 0-1}
+          swings back and forth around rect's position
+      {"pattern": "patrol", "rect": (x, y, w, h), "path": [(x, y), ...], "speed": px/s}
+          follows path from rect's position and loops back to the start
+      {"pattern": "beam", "pivot": (x, y), "length": px, "width": px, "angle": deg, "turn_speed": deg/s}
+          a line rotating around pivot
+    Rect lasers keep pos/prev_pos/size rows so scenes can draw them interpolated.
+    """
+
+    def __init__(self, lasers, bounds):
+        self.bounds = np.array(bounds, dtype=float)
+        self.time = 0.0
+        boxes = [laser for laser in lasers if laser["pattern"] != "beam"]
+        beams = [laser for laser in lasers if laser["pattern"] == "beam"]
+        self.count = len(lasers)
+
+        # ---------------- RECT LASERS ----------------
+        rects = np.array([laser["rect"] for laser in boxes], dtype=float).reshape(-1, 4)
+        self.pos = rects[:, :2].copy()
+        self.prev_pos = self.pos.copy()
+        self.size = rects[:, 2:].copy()
+        self.start = self.pos.copy()
+
+        def indices(pattern):
+            return np.array([i for i, laser in enumerate(boxes) if laser["pattern"] == pattern], dtype=int)
+
+        self.bounce = indices("bounce")
+        self.velocity = np.array([boxes[i]["velocity"] for i in self.bounce], dtype=float).reshape(-1, 2)
+
+        self.sine = indices("sine")
+        self.amplitude = np.array([boxes[i]["amplitude"] for i in self.sine], dtype=float).reshape(-1, 2)
+        self.omega = np.array([2 * math.pi / boxes[i]["period"] for i in self.sine], dtype=float)
+        self.phase = np.array([2 * math.pi * boxes[i].get("phase", 0) for i in self.sine], dtype=float)
+
+        self.patrol = indices("patrol")
+        self._build_paths([boxes[i] for i in self.patrol], self.start[self.patrol])
+
+        # ---------------- BEAMS ----------------
+        self.pivot = np.array([beam["pivot"] for beam in beams], dtype=float).reshape(-1, 2)
+        self.length = np.array([beam["length"] for beam in beams], dtype=float)
+        self.width = np.array([beam["width"] for beam in beams], dtype=float)
+        self.start_angle = np.radians([beam.get("angle", 0) for beam in beams])
+        self.turn_speed = np.radians([beam["turn_speed"] for beam in beams])
+        self.angle = self.start_angle.copy()
+        self.prev_angle = self.angle.copy()
+
+        self._sprites = {}  # (w, h) -> pre-drawn rounded laser
+
+    def _build_paths(self, patrols, starts):
+        """Pad every patrol loop to the same number of points so they move as one array."""
+        loops = [[tuple(start)] + [tuple(point) for point in laser["path"]] + [tuple(start)]
+                 for laser, start in zip(patrols, starts)]
+        points = max((len(loop) for loop in loops), default=2)
+        self.path = np.array([loop + loop[-1:] * (points - len(loop)) for loop in loops], dtype=float).reshape(-1, points, 2)
+        segments = np.linalg.norm(np.diff(self.path, axis=1), axis=2)
+        self.path_distance = np.concatenate([np.zeros((len(loops), 1)), np.cumsum(segments, axis=1)], axis=1)
+        self.path_segment = segments
+        self.patrol_speed = np.array([laser["speed"] for laser in patrols], dtype=float)
+
+    # ---------------- MOVEMENT ----------------
+    def update(self, dt):
+        self.time += dt
+        t = self.time
+        self.prev_pos[:] = self.pos
+        self.prev_angle[:] = self.angle
+
+        if self.bounce.size:
+            i = self.bounce
+            pos = self.pos[i] + self.velocity * dt
+            # Reverse on the tick a laser crosses an edge, like the original Laser.update
+            out = (pos < 0) | (pos + self.size[i] > self.bounds)
+            self.velocity[out] *= -1
+            self.pos[i] = pos
+
+        if self.sine.size:
+            wave = np.sin(self.omega * t + self.phase)
+            self.pos[self.sine] = self.start[self.sine] + self.amplitude * wave[:, None]
+
+        if self.patrol.size:
+            total = self.path_distance[:, -1]
+            travelled = np.mod(self.patrol_speed * t, np.where(total > 0, total, 1))
+            rows = np.arange(len(total))
+            segment = np.minimum((self.path_distance[:, 1:] <= travelled[:, None]).sum(axis=1), self.path_segment.shape[1] - 1)
+            along = (travelled - self.path_distance[rows, segment]) / np.maximum(self.path_segment[rows, segment], 1e-9)
+            start = self.path[rows, segment]
+            self.pos[self.patrol] = start + (self.path[rows, segment + 1] - start) * np.minimum(along, 1)[:, None]
+
+        if self.angle.size:
+            self.angle[:] = self.start_angle + self.turn_speed * t
+
+    # ---------------- COLLISION ----------------
+    def box_rects(self, pos=None):
+        """(N, 4) int x, y, w, h of the rect lasers, rounded like pygame.Rect positions."""
+        pos = self.pos if pos is None else pos
+        return np.concatenate([np.rint(pos), self.size], axis=1).astype(int)
+
+    def beam_ends(self, angle=None):
+        angle = self.angle if angle is None else angle
+        return self.pivot + self.length[:, None] * np.stack([np.cos(angle), np.sin(angle)], axis=1)
+
+    def hits(self, rect, prev_rect=None, sprite=None):
+        """
+        True if rect overlaps any laser. With prev_rect (where rect was last
+        tick) the whole tick is checked: both the player and every laser are
+        swept along their motion, so nothing passes through between ticks
+        however fast it moves.
+        With sprite (the image drawn at rect) only its solid pixels count: the
+        rect tests above pick out the lasers that might touch it, and only those
+        are checked against its cached collision mask.
+        """
+        if prev_rect is None:
+            return (self._boxes_hit(rect, rect, self._boxes_touching(rect), sprite) or
+                    self._beams_hit(rect, self.angle, sprite))
+        return (self._boxes_hit(prev_rect, rect, self._boxes_swept(prev_rect, rect), sprite) or
+                self._beams_swept(prev_rect, rect, sprite))
+
+    def _boxes_touching(self, rect):
+        x, y, w, h = rect
+        boxes = self.box_rects()
+        touching = ((boxes[:, 0] < x + w) & (boxes[:, 0] + boxes[:, 2] > x) &
+                    (boxes[:, 1] < y + h) & (boxes[:, 1] + boxes[:, 3] > y))
+        # Only the end of the tick counts, so contact starts and ends there
+        return np.flatnonzero(touching), np.ones(len(boxes)), np.ones(len(boxes))
+
+    def _boxes_swept(self, prev_rect, rect):
+        # Move the player relative to each laser, which then holds still at its
+        # previous spot, and find when the two overlap on both axes (slab test)
+        start = self.box_rects(self.prev_pos)
+        laser_motion = np.rint(self.pos) - start[:, :2]
+        player_start = np.array(prev_rect[:2], dtype=float)
+        player_size = np.array(prev_rect[2:], dtype=float)
+        motion = (np.array(rect[:2], dtype=float) - player_start) - laser_motion
+
+        enter = np.zeros(len(start))
+        leave = np.ones(len(start))
+        for axis in (0, 1):
+            near = start[:, axis] - (player_start[axis] + player_size[axis])  # gap to close before touching
+            far = start[:, axis] + start[:, axis + 2] - player_start[axis]  # distance until fully past
+            d = motion[:, axis]
+            still = d == 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t_near, t_far = near / d, far / d
+            overlapping = (near < 0) & (far > 0)
+            enter = np.maximum(enter, np.where(still, np.where(overlapping, -np.inf, np.inf), np.minimum(t_near, t_far)))
+            leave = np.minimum(leave, np.where(still, np.where(overlapping, np.inf, -np.inf), np.maximum(t_near, t_far)))
+        return np.flatnonzero(enter < leave), enter, leave
+
+    def _boxes_hit(self, prev_rect, rect, contacts, sprite):
+        candidates, enter, leave = contacts
+        if sprite is None or not candidates.size:
+            return bool(candidates.size)
+
+        # Replay each candidate's contact window in steps of about a pixel of
+        # relative motion and test the player's mask against the laser's
+        mask = get_mask(sprite)
+        start = np.rint(self.prev_pos)
+        motion = np.rint(self.pos) - start
+        player_motion = (rect[0] - prev_rect[0], rect[1] - prev_rect[1])
+        for i in candidates.tolist():
+            laser_mask = get_mask(self._sprite(tuple(self.size[i].astype(int).tolist())))
+            t0, t1 = enter[i], leave[i]
+            travel = max(abs(player_motion[0] - motion[i, 0]), abs(player_motion[1] - motion[i, 1])) * (t1 - t0)
+            samples = int(min(MAX_MASK_SAMPLES, math.ceil(travel)))
+            for k in range(samples + 1):
+                t = t1 if not samples else t0 + (t1 - t0) * k / samples
+                offset = (round(start[i, 0] + motion[i, 0] * t - (prev_rect[0] + player_motion[0] * t)),
+                          round(start[i, 1] + motion[i, 1] * t - (prev_rect[1] + player_motion[1] * t)))
+                if mask.overlap(laser_mask, offset):
+                    return True
+        return False
+
+    def _beams_swept(self, prev_rect, rect, sprite):
+        if not self.angle.size:
+            return False
+        # Enough samples that neither a beam's tip nor the player skips more than a beam width
+        tip_travel = np.max(np.abs(self.angle - self.prev_angle) * self.length / np.maximum(self.width, 1))
+        player_travel = max(abs(rect[0] - prev_rect[0]), abs(rect[1] - prev_rect[1])) / max(1, min(rect[2], rect[3]))
+        samples = int(min(MAX_BEAM_SAMPLES, max(1, math.ceil(max(tip_travel, player_travel)))))
+        for i in range(1, samples + 1):
+            t = i / samples
+            sample = [round(prev + (now - prev) * t) for prev, now in zip(prev_rect, rect)]
+            if self._beams_hit(sample, self.prev_angle + (self.angle - self.prev_angle) * t, sprite):
+                return True
+        return False
+
+    def _beams_hit(self, rect, angle, sprite):
+        if not self.angle.size:
+            return False
+        x, y, w, h = rect
+
+        # Clip each beam's segment against rect grown by half its width (Liang-Barsky)
+        half = self.width / 2
+        start = self.pivot
+        delta = self.beam_ends(angle) - start
+        low = np.zeros(len(half))
+        high = np.ones(len(half))
+        inside = np.ones(len(half), dtype=bool)
+        for axis, near, far in ((0, x, x + w), (1, y, y + h)):
+            d = delta[:, axis]
+            to_near = start[:, axis] - (near - half)
+            to_far = (far + half) - start[:, axis]
+            parallel = d == 0
+            inside &= ~parallel | ((to_near >= 0) & (to_far >= 0))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t_near = np.where(parallel, -np.inf, -to_near / d)
+                t_far = np.where(parallel, np.inf, to_far / d)
+            enter = np.where(d > 0, t_near, t_far)
+            leave = np.where(d > 0, t_far, t_near)
+            low = np.maximum(low, np.where(parallel, 0, enter))
+            high = np.minimum(high, np.where(parallel, 1, leave))
+        candidates = np.flatnonzero(inside & (low <= high))
+        if sprite is None or not candidates.size:
+            return bool(candidates.size)
+
+        # Walk the clipped part of each candidate's centre line a pixel at a time
+        # over the player's mask grown by half the beam's width
+        for j in candidates.tolist():
+            radius = math.ceil(half[j])
+            grown = get_mask(sprite, radius)
+            width, height = grown.get_size()
+            steps = max(1, math.ceil(math.hypot(*delta[j]) * (high[j] - low[j])))
+            along = np.linspace(low[j], high[j], steps + 1)[:, None]
+            points = np.rint(start[j] + delta[j] * along - (x - radius, y - radius)).astype(int)
+            in_bounds = (points[:, 0] >= 0) & (points[:, 0] < width) & (points[:, 1] >= 0) & (points[:, 1] < height)
+            if any(grown.get_at(point) for point in points[in_bounds].tolist()):
+                return True
+        return False
+
+    # ---------------- DRAWING ----------------
+    def _sprite(self, size):
+        sprite = self._sprites.get(size)
+        if sprite is None:
+            sprite = pygame.Surface(size)
+            sprite.fill(COLORKEY)
+            pygame.draw.rect(sprite, LASER_COLOR, sprite.get_rect(), border_radius=BORDER_RADIUS)
+            sprite.set_colorkey(COLORKEY, pygame.RLEACCEL)
+            self._sprites[size] = sprite
+        return sprite
+
+    def interpolated(self, alpha):
+        """Rect laser top-lefts and beam ends between the last two ticks."""
+        pos = self.prev_pos + (self.pos - self.prev_pos) * alpha
+        angle = self.prev_angle + (self.angle - self.prev_angle) * alpha
+        return pos, self.beam_ends(angle)
+
+    def draw(self, surface, alpha):
+        pos, ends = self.interpolated(alpha)
+        sizes = [tuple(size) for size in self.size.astype(int).tolist()]
+        surface.blits([(render_image(self._sprite(size)), render_pos(topleft))
+                       for size, topleft in zip(sizes, pos.tolist())], doreturn=False)
+        for start, end, width in zip(self.pivot.tolist(), ends.tolist(), self.width.tolist()):
+            pygame.draw.line(surface, LASER_COLOR, render_pos(start), render_pos(end), render_width(width))
+
+    def screen_rects(self, alpha):
+        """{index: rect} covering every laser as drawn this frame."""
+        pos, ends = self.interpolated(alpha)
+        rects = {i: pygame.Rect(topleft, size) for i, (topleft, size) in enumerate(zip(pos.tolist(), self.size.tolist()))}
+        for j, (start, end, width) in enumerate(zip(self.pivot.tolist(), ends.tolist(), self.width.tolist())):
+            rect = pygame.Rect(min(start[0], end[0]), min(start[1], end[1]), abs(end[0] - start[0]), abs(end[1] - start[1]))
+            rects["beam", j] = rect.inflate(width + 2, width + 2)
+        return rects
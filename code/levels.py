@@ -0,0 +1,140 @@
+# levels.py
+import json
+import os
+import time
+import tracemalloc
+
+import pygame
+from code.spatial import SpatialGrid
+
+LEVEL_DIR = os.path.join("assets", "levels")
+
+
+class Solid:
+    """A piece of static level geometry; SpatialGrid only needs its rect."""
+
+    __slots__ = ("rect",)
+
+    def __init__(self, rect):
+        self.rect = rect
+
+
+class Zone:
+    """
+    A named trigger area. scene is what it leads to, requires the player_keys
+    entry it needs to be open, and message what to show while it's locked.
+    """
+
+    __slots__ = ("name", "rect", "scene", "requires", "message")
+
+    def __init__(self, name, rect, scene=None, requires=None, message=None):
+        self.name = name
+        self.rect = pygame.Rect(rect)
+        self.scene = scene
+        self.requires = requires
+        self.message = message
+
+    def is_open(self, keys):
+        return self.requires is None or keys.get(self.requires, False)
+
+
+class Level:
+    """
+    A level file parsed into what the scenes use, built once per load:
+      start          the player's top-left
+      solids         a SpatialGrid of the platforms (platform_size each)
+      zones          {name: Zone}, also indexed by position in triggers
+      lasers         LaserField dicts, see code.lasers
+      points, text   named positions and strings, e.g. the room's riddle
+      bounds         the union of the level's size and everything in it
+    Every field in the file is optional. Levels are shared through the loader,
+    so treat them as read-only.
+    """
+
+    def __init__(self, name, data):
+        self.name = name
+        self.start = tuple(data.get("start", (0, 0)))
+        self.points = {key: tuple(point) for key, point in data.get("points", {}).items()}
+        self.text = dict(data.get("text", {}))
+        self.lasers = list(data.get("lasers", []))
+
+        width, height = data.get("platform_size", (0, 0))
+        solids = [Solid(pygame.Rect(x, y, width, height)) for x, y in data.get("platforms", [])]
+        self.solids = SpatialGrid(solids)
+
+        self.zones = {key: Zone(key, **zone) for key, zone in data.get("zones", {}).items()}
+        self.triggers = SpatialGrid(self.zones.values())
+
+        self.bounds = pygame.Rect((0, 0), data.get("size", (0, 0))).unionall(
+            [solid.rect for solid in solids] + [zone.rect for zone in self.zones.values()])
+
+    def zone(self, name):
+        return self.zones[name].rect
+
+    def zones_at(self, rect):
+        """Every zone overlapping rect."""
+        return self.triggers.query(rect)
+
+
+class LevelLoader:
+    """
+    Reads level files from LEVEL_DIR and keeps each parsed Level until its file
+    changes on disk, so re-entering a scene costs a stat() and editing a level
+    swaps it in without a restart.
+    load_log keeps each level's load time and, with measure_memory (which slows
+    loading several times over while it traces), the memory the built level holds.
+    """
+
+    def __init__(self, level_dir=LEVEL_DIR, measure_memory=False):
+        self.level_dir = level_dir
+        self.measure_memory = measure_memory
+        self.levels = {}  # name -> (mtime, Level)
+        self.load_log = {}  # name -> (seconds, bytes or None)
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, name):
+        return os.path.join(self.level_dir, name + ".json")
+
+    def load(self, name):
+        path = self.path(name)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.levels.get(name)
+        if cached is not None and cached[0] == mtime:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        tracing = self.measure_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        with open(path) as f:
+            level = Level(name, json.load(f))
+        seconds = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0] - before if self.measure_memory else None
+        if tracing:
+            tracemalloc.stop()
+
+        self.levels[name] = (mtime, level)
+        self.load_log[name] = (seconds, size)
+        return level
+
+    def clear(self):
+        self.levels.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "levels": len(self.levels),
+        }
+
+
+# Shared by every scene so re-entering one never parses its level again
+levels = LevelLoader()
+
+
+def load_level(name):
+    return levels.load(name)
@@ -0,0 +1,325 @@
+# navigation.py
+import hashlib
+import heapq
+import math
+import os
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+NAV_CELL = 20  # pixels between grid points; a fraction of the sprite so narrow paths survive
+SNAP_RADIUS = 4  # cells searched around a click for somewhere the sprite fits
+ROUTE_CACHE_SIZE = 256  # smoothed routes kept before the least recently used is dropped
+
+# Grids are kept here between launches; delete the folder to rebuild them
+CACHE_DIR = os.path.join(os.environ.get("SLEEPWALKERS_CACHE_DIR", ".cache"), "nav")
+
+DIAGONAL = math.sqrt(2)
+
+
+class NavGrid:
+    """
+    Where the player sprite can stand on a map, sampled every cell pixels, for
+    click-to-move. Grid point (column, row) is open when a footprint-sized rect
+    with its top-left at (column * cell, row * cell) is fully walkable. A cell
+    is smaller than the footprint, so every position between open grid points
+    is covered by their footprints and walking straight between them is safe.
+
+    The open points are linked 8-way, never cutting a corner, and one Dijkstra
+    pass per point gives a table of the next step from anywhere towards it.
+    That costs a second or so per grid, so the table is cached on disk with it.
+    route() then only follows the table and drops every point it can see past,
+    whatever the distance. Routes are kept per start and goal point, and routes
+    to an area like a door come from one Dijkstra pass per area, so repeating a
+    trip costs a dictionary lookup.
+    """
+
+    def __init__(self, open_points, cell=NAV_CELL, footprint=(0, 0), next_steps=None):
+        self.cell = cell
+        self.footprint = tuple(footprint)
+        self.rows, self.columns = open_points.shape
+        self.open = open_points.ravel().tolist()  # index row * columns + column -> bool
+
+        # A square between four grid points can be crossed in any direction when all four are open
+        corners = open_points[:-1, :-1] & open_points[1:, :-1] & open_points[:-1, 1:] & open_points[1:, 1:]
+        self.clear = corners.ravel().tolist()
+
+        # Searches run over node numbers, the open points only, so per-node data fits in lists
+        self.nodes = np.flatnonzero(open_points).tolist()  # node -> index
+        self.node_at = {index: node for node, index in enumerate(self.nodes)}
+        self.neighbors = self._link()
+        self.regions = self._label()
+        # [goal, node] -> the next node from node towards goal, -1 at the goal or where it can't be reached
+        self.next_steps = self._plan() if next_steps is None else next_steps
+        self.routes = OrderedDict()  # (start, goal) -> smoothed route
+        self.flows = {}  # area -> {node: next node towards it}
+
+    # ---------------- BUILDING ----------------
+    @classmethod
+    def build(cls, map_size, footprint, is_walkable, cell=NAV_CELL):
+        """Test the footprint at every grid point with is_walkable(rect)."""
+        columns, rows = map_size[0] // cell + 1, map_size[1] // cell + 1
+        open_points = np.zeros((rows, columns), dtype=bool)
+        rect = pygame.Rect((0, 0), footprint)
+        for row in range(rows):
+            for column in range(columns):
+                rect.topleft = (column * cell, row * cell)
+                open_points[row, column] = is_walkable(rect)
+        return cls(open_points, cell, footprint)
+
+    @classmethod
+    def load(cls, source, map_size, footprint, is_walkable, cell=NAV_CELL, cache_dir=CACHE_DIR):
+        """
+        The grid for the walkable layer at path source, from the disk cache if
+        it was built for the same file, map size, footprint and cell before.
+        """
+        stat = os.stat(source)
+        key = f"{os.path.abspath(source)}|{stat.st_mtime_ns}|{stat.st_size}|{tuple(map_size)}|{tuple(footprint)}|{cell}"
+        cache_path = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npz") if cache_dir else None
+        if cache_path:
+            try:
+                with np.load(cache_path) as cached:
+                    open_points, next_steps = cached["open"], cached["next_steps"]
+                count = int(open_points.sum())
+                if next_steps.shape == (count, count):
+                    return cls(open_points, cell, footprint, next_steps)
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                pass
+
+        grid = cls.build(map_size, footprint, is_walkable, cell)
+        if cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Write to a temp file first so a crash never leaves half a grid behind
+                tmp_path = cache_path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    np.savez(f, open=np.array(grid.open, dtype=bool).reshape(grid.rows, grid.columns),
+                             next_steps=grid.next_steps)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f"Could not cache the navigation grid: {e}")
+        return grid
+
+    def _link(self):
+        """node -> [(neighbouring node, cost)]."""
+        columns, rows, is_open, node_at = self.columns, self.rows, self.open, self.node_at
+        neighbors = []
+        for i in self.nodes:
+            row, column = divmod(i, columns)
+            links = []
+            for dc, dr in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)):
+                c, r = column + dc, row + dr
+                if not (0 <= c < columns and 0 <= r < rows and is_open[r * columns + c]):
+                    continue
+                if dc and dr:
+                    # Diagonals only where both sides are open, so the sprite never clips a corner
+                    if not (is_open[row * columns + c] and is_open[r * columns + column]):
+                        continue
+                    links.append((node_at[r * columns + c], DIAGONAL))
+                else:
+                    links.append((node_at[r * columns + c], 1))
+            neighbors.append(links)
+        return neighbors
+
+    def _label(self):
+        """node -> connected region number, so unreachable goals fail at once."""
+        regions = [0] * len(self.nodes)
+        label = 0
+        for first in range(len(self.nodes)):
+            if regions[first]:
+                continue
+            label += 1
+            regions[first] = label
+            stack = [first]
+            while stack:
+                for j, _ in self.neighbors[stack.pop()]:
+                    if not regions[j]:
+                        regions[j] = label
+                        stack.append(j)
+        return regions
+
+    def _distances(self, sources):
+        """Dijkstra outwards from every source node at once: (node -> cost, node -> next node back towards a source)."""
+        neighbors = self.neighbors
+        cost = [math.inf] * len(self.nodes)
+        toward = [None] * len(self.nodes)
+        for i in sources:
+            cost[i] = 0
+        frontier = [(0, i) for i in sources]
+        while frontier:
+            base, i = heapq.heappop(frontier)
+            if base > cost[i]:
+                continue
+            # Moves cost the same both ways, so this also measures the way back
+            for j, step in neighbors[i]:
+                new_cost = base + step
+                if new_cost < cost[j]:
+                    cost[j] = new_cost
+                    toward[j] = i
+                    heapq.heappush(frontier, (new_cost, j))
+        return cost, toward
+
+    def _plan(self):
+        """The next_steps table: a Dijkstra pass outwards from every node in turn."""
+        count = len(self.nodes)
+        next_steps = np.full((count, count), -1, dtype=np.int16 if count < 2 ** 15 else np.int32)
+        for goal in range(count):
+            # Moves cost the same both ways, so the way back to goal is the way out reversed
+            toward = self._distances([goal])[1]
+            next_steps[goal] = [-1 if node is None else node for node in toward]
+        return next_steps
+
+    # ---------------- QUERIES ----------------
+    def point(self, node):
+        row, column = divmod(self.nodes[node], self.columns)
+        return (column * self.cell, row * self.cell)
+
+    def nearest(self, pos, radius=SNAP_RADIUS):
+        """The node closest to a sprite top-left, or None within radius cells."""
+        cell = self.cell
+        column, row = round(pos[0] / cell), round(pos[1] / cell)
+        best, best_distance = None, None
+        for r in range(max(0, row - radius), min(self.rows, row + radius + 1)):
+            for c in range(max(0, column - radius), min(self.columns, column + radius + 1)):
+                i = r * self.columns + c
+                if self.open[i]:
+                    distance = (c * cell - pos[0]) ** 2 + (r * cell - pos[1]) ** 2
+                    if best is None or distance < best_distance:
+                        best, best_distance = i, distance
+        return None if best is None else self.node_at[best]
+
+    def find_path(self, start, goal):
+        """The shortest path from node start to goal, both included, or None."""
+        if self.regions[start] != self.regions[goal]:
+            return None
+        next_steps = self.next_steps[goal].tolist()
+        path = [start]
+        while path[-1] != goal:
+            path.append(next_steps[path[-1]])
+        return path
+
+    def can_walk(self, a, b):
+        """True if the sprite can walk straight from grid index a to b."""
+        columns = self.columns
+        r0, c0 = divmod(a, columns)
+        r1, c1 = divmod(b, columns)
+        dc, dr = c1 - c0, r1 - r0
+        if not dc or not dr:
+            # Along a grid line the points' own footprints cover the way
+            is_open = self.open
+            step = (1 if dc > 0 else -1) if dc else (columns if dr > 0 else -columns)
+            return all(is_open[i] for i in range(a, b + step, step))
+
+        # Walk the squares the segment crosses (Amanatides-Woo, in exact integers)
+        step_c, step_r = (1 if dc > 0 else -1), (1 if dr > 0 else -1)
+        c, r = (c0 if dc > 0 else c0 - 1), (r0 if dr > 0 else r0 - 1)
+        end_c, end_r = (c1 - 1 if dc > 0 else c1), (r1 - 1 if dr > 0 else r1)
+        dc, dr = abs(dc), abs(dr)
+        crossed_c = crossed_r = 1  # next vertical and horizontal grid line, as multiples of 1/dc and 1/dr
+        clear, square_columns = self.clear, columns - 1
+        while True:
+            if not clear[r * square_columns + c]:
+                return False
+            if c == end_c and r == end_r:
+                return True
+            # Compare crossed_c / dc with crossed_r / dr; a tie passes exactly through a grid point
+            t_c, t_r = crossed_c * dr, crossed_r * dc
+            if t_c <= t_r:
+                c += step_c
+                crossed_c += 1
+            if t_r <= t_c:
+                r += step_r
+                crossed_r += 1
+
+    def smooth(self, path):
+        """Keep only the points of a path (grid indices) where the route has to turn."""
+        if len(path) < 3:
+            return path
+        # Points in a straight run can never be needed, so only test the turns
+        turns = [path[0]]
+        for before, here, after in zip(path, path[1:], path[2:]):
+            if here - before != after - here:
+                turns.append(here)
+        turns.append(path[-1])
+
+        smoothed = [turns[0]]
+        for k in range(1, len(turns) - 1):
+            if not self.can_walk(smoothed[-1], turns[k + 1]):
+                smoothed.append(turns[k])
+        smoothed.append(turns[-1])
+        return smoothed
+
+    def _remember(self, key, route):
+        self.routes[key] = route
+        if len(self.routes) > ROUTE_CACHE_SIZE:
+            self.routes.popitem(last=False)
+        return route
+
+    def route(self, start_pos, goal_pos):
+        """
+        Sprite top-lefts to walk through, in order, from start_pos to the open
+        point nearest goal_pos; None if there is no way there.
+        """
+        start, goal = self.nearest(start_pos), self.nearest(goal_pos)
+        if start is None or goal is None:
+            return None
+        key = (start, goal)
+        route = self.routes.get(key)
+        if route is None:
+            path = self.find_path(start, goal)
+            if path is None:
+                return None
+            route = self._remember(key, self._points(path))
+        else:
+            self.routes.move_to_end(key)
+        return list(route)
+
+    def _points(self, path):
+        """A path of nodes as the smoothed sprite top-lefts to walk through."""
+        cell, columns = self.cell, self.columns
+        route = []
+        for i in self.smooth([self.nodes[node] for node in path]):
+            row, column = divmod(i, columns)
+            route.append((column * cell, row * cell))
+        return route
+
+    def _flow(self, area):
+        """node -> next node, leading every reachable node to the nearest one whose footprint touches area."""
+        flow = self.flows.get(area)
+        if flow is not None:
+            return flow
+        footprint = pygame.Rect((0, 0), self.footprint)
+        targets = []
+        for node in range(len(self.nodes)):
+            footprint.topleft = self.point(node)
+            if footprint.colliderect(area):
+                targets.append(node)
+        cost, toward = self._distances(targets)
+        flow = self.flows[area] = {node: toward[node] for node, c in enumerate(cost) if c < math.inf}
+        return flow
+
+    def prepare_area(self, area):
+        """Build the routes into area (a door's rect) now, so the first route_to() there is a lookup."""
+        self._flow(tuple(area))
+
+    def route_to(self, start_pos, area):
+        """Like route(), but to the nearest place the sprite overlaps area (a door's rect)."""
+        area = tuple(area)
+        start = self.nearest(start_pos)
+        if start is None:
+            return None
+        key = (start, area)
+        route = self.routes.get(key)
+        if route is None:
+            flow = self._flow(area)
+            if start not in flow:
+                return None
+            path = [start]
+            while flow[path[-1]] is not None:
+                path.append(flow[path[-1]])
+            route = self._remember(key, self._points(path))
+        else:
+            self.routes.move_to_end(key)
+        return list(route)
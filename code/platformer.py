@@ -1,175 +1,208 @@
 # platformer.py
+import math
+
 import pygame
-import sys
-import os
 import code.game_state
-
-WIDTH, HEIGHT = 1200, 800
-FPS = 60
-GRAVITY = 0.8
-PLAYER_SPEED = 5
-JUMP_STRENGTH = 15
+from code.asset_manager import load_image, load_layer
+from code.display import HEIGHT, WIDTH, logical_rect, render_image, render_pos, render_size
+from code.levels import load_level
+from code.scene import Scene, lerp
+from code.transitions import FadeOut
+
+# Per second, so the physics don't depend on the tick rate
+GRAVITY = 2880
+PLAYER_SPEED = 300
+JUMP_STRENGTH = 900
+MAX_FALL_SPEED = 1500  # terminal velocity
+MAX_SUBSTEP = 16  # pixels an axis may move before the sweep is split into smaller steps
 WHITE = (255, 255, 255)
 
-def fade_out(screen, duration=0.5):
-    """Fade out effect."""
-    clock = pygame.time.Clock()
-    overlay = pygame.Surface((WIDTH, HEIGHT))
-    overlay.fill((0, 0, 0))
-    steps = int(duration * FPS)
-    for i in range(steps):
-        alpha = int((i / steps) * 255)
-        overlay.set_alpha(alpha)
-        screen.blit(overlay, (0, 0))
-        pygame.display.flip()
-        clock.tick(FPS)
-# ---------------- RUN FUNCTION ----------------
-def run_platformer(screen, player_sprite=None):
-    clock = pygame.time.Clock()
-
-    # Load background
-    bg_path = "assets/platformer/platform_map.png"
-    if os.path.exists(bg_path):
-        background = pygame.image.load(bg_path).convert_alpha()
-        background = pygame.transform.scale(background, (WIDTH, HEIGHT))
-    else:
-        print(f"Background image not found: {bg_path}")
-        background = pygame.Surface((WIDTH, HEIGHT))
-        background.fill(WHITE)
-    
-    hardcore_heart_path = "assets/main/hardcore_heart.png"
-    if os.path.exists(hardcore_heart_path):
-        hardcore_heart = pygame.image.load(hardcore_heart_path).convert_alpha()
-        hardcore_heart = pygame.transform.scale(hardcore_heart, (50, 50))
-    else:
-        hardcore_heart = None
-
-    # Load platform image
-    platform_img_path = "assets/platformer/platform_brown.png"
-    if os.path.exists(platform_img_path):
-        platform_img = pygame.image.load(platform_img_path).convert_alpha()
-        platform_img = pygame.transform.scale(platform_img, (150, 50))
-    else:
-        print(f"Platform image not found: {platform_img_path}")
-        platform_img = pygame.Surface((150, 50))
-        platform_img.fill((100,50,0))
-
-    # Load door image for goal
-    door_img_path = "assets/platformer/door.png"
-    if os.path.exists(door_img_path):
-        door_img = pygame.image.load(door_img_path).convert_alpha()
-        door_img = pygame.transform.scale(door_img, (100, 100))
-    else:
-        print(f"Door image not found: {door_img_path}")
-        door_img = pygame.Surface((100, 100))
-        door_img.fill((255, 223, 0))
-
-    # ---------------- CLASSES ----------------
-    class Player(pygame.sprite.Sprite):
-        def __init__(self, x, y):
-            super().__init__()
-            if player_sprite:
-                self.image = player_sprite
-            else:
-                self.image = pygame.Surface((50, 50))
-                self.image.fill((50,150,255))
-            self.rect = self.image.get_rect(topleft=(x, y))
-            self.vel_y = 0
-            self.on_ground = False
-
-        def update(self, platforms):
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT]:
-                self.rect.x -= PLAYER_SPEED
-            if keys[pygame.K_RIGHT]:
-                self.rect.x += PLAYER_SPEED
-
-            self.vel_y += GRAVITY
-            self.rect.y += self.vel_y
-
-            self.on_ground = False
-            for platform in platforms:
-                if self.rect.colliderect(platform.rect):
-                    if self.vel_y > 0:  # Falling
-                        self.rect.bottom = platform.rect.top
-                        self.vel_y = 0
-                        self.on_ground = True
-                    elif self.vel_y < 0:  # Jumping
-                        self.rect.top = platform.rect.bottom
-                        self.vel_y = 0
-
-        def jump(self):
-            if self.on_ground:
-                self.vel_y = -JUMP_STRENGTH
-
-    class Platform(pygame.sprite.Sprite):
-        def __init__(self, x, y):
-            super().__init__()
-            self.image = platform_img
-            self.rect = self.image.get_rect(topleft=(x, y))
-
-    class Goal(pygame.sprite.Sprite):
-        def __init__(self, x, y):
-            super().__init__()
-            self.image = door_img
-            self.rect = self.image.get_rect(midbottom=(x + 75, y))  # Adjust to center on platform
-
-    # ---------------- SPRITE GROUPS ----------------
-    player = Player(100, 500)
-    platforms = pygame.sprite.Group()
-    all_sprites = pygame.sprite.Group()
-    all_sprites.add(player)
-
-    # ---------------- PLATFORM POSITIONS ----------------
-    platform_positions = [
-        (0, 550),
-        (180, 500),
-        (350, 450),
-        (500, 500),
-        (650, 400),
-        (400, 300),
-        (150, 250),
-        (300, 200),
-        (550, 150),
-    ]
-
-    for x, y in platform_positions:
-        plat = Platform(x, y)
-        platforms.add(plat)
-        all_sprites.add(plat)
-
-    last_platform = platform_positions[-1]
-    goal = Goal(last_platform[0], last_platform[1])
-    all_sprites.add(goal)
-
-    # ---------------- GAME LOOP ----------------
-    running = True
-    while running:
-        clock.tick(FPS)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return "quit"
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    player.jump()
-                if event.key == pygame.K_ESCAPE:
-                    return "quit"
-
-        player.update(platforms)
-        
-        if player.rect.top > HEIGHT:  
-            code.game_state.player_keys = {k: False for k in code.game_state.player_keys}
-            fade_out(screen, duration=0.5)
-            return "restart_adventure"  
-
-        if player.rect.colliderect(goal.rect):
+# Everything the scene loads, so the overworld can preload it on approach
+ASSETS = {
+    "background": ("assets/platformer/platform_map.png", (WIDTH, HEIGHT), False),
+    "hardcore_heart": ("assets/main/hardcore_heart.png", (50, 50)),
+    "platform": ("assets/platformer/platform_brown.png", (150, 50)),
+    "door": ("assets/platformer/door.png", (100, 100)),
+}
+LAYERS = {"background"}  # loaded at the display's render scale, see load_layer()
+
+# ---------------- CLASSES ----------------
+class Player(pygame.sprite.Sprite):
+    def __init__(self, x, y, player_sprite=None):
+        super().__init__()
+        if player_sprite:
+            self.image = player_sprite
+        else:
+            self.image = pygame.Surface((50, 50))
+            self.image.fill((50,150,255))
+        self.rect = self.image.get_rect(topleft=(x, y))
+        # Float position; rect is its rounded copy for collisions
+        self.pos = pygame.Vector2(x, y)
+        self.prev_pos = pygame.Vector2(x, y)
+        self.vel_y = 0
+        self.on_ground = False
+
+    def update(self, platforms, keys, dt):
+        """
+        Move one tick and resolve collisions against platforms, anything with
+        query(rect) -> platforms overlapping rect (a SpatialGrid).
+        Each axis is swept separately, horizontal first, and long moves are split
+        into MAX_SUBSTEP pieces, so no speed can carry the player through a platform.
+        """
+        self.prev_pos.update(self.pos)
+        dx = 0
+        if keys[pygame.K_LEFT]:
+            dx -= PLAYER_SPEED * dt
+        if keys[pygame.K_RIGHT]:
+            dx += PLAYER_SPEED * dt
+        self.vel_y = min(self.vel_y + GRAVITY * dt, MAX_FALL_SPEED)
+
+        self.on_ground = False
+        steps = max(1, math.ceil(max(abs(dx), abs(self.vel_y * dt)) / MAX_SUBSTEP))
+        for _ in range(steps):
+            self.sweep_x(platforms, dx / steps)
+            # Re-read vel_y every step: landing or bumping a ceiling zeroes it
+            self.sweep_y(platforms, self.vel_y * dt / steps)
+
+        # One pixel lower, so standing still on a platform still counts as grounded
+        if not self.on_ground and self.vel_y >= 0:
+            self.on_ground = bool(platforms.query(self.rect.move(0, 1)))
+
+    def sweep_x(self, platforms, dx):
+        if not dx:
+            return
+        self.pos.x += dx
+        old = self.rect
+        new = old.copy()
+        new.x = round(self.pos.x)
+        for platform in platforms.query(old.union(new)):
+            wall = platform.rect
+            if dx > 0 and wall.left >= old.right and new.right > wall.left:
+                new.right = wall.left
+            elif dx < 0 and wall.right <= old.left and new.left < wall.right:
+                new.left = wall.right
+        if new.x != round(self.pos.x):
+            self.pos.x = new.x
+        self.rect = new
+
+    def sweep_y(self, platforms, dy):
+        if not dy:
+            return
+        self.pos.y += dy
+        old = self.rect
+        new = old.copy()
+        new.y = round(self.pos.y)
+        for platform in platforms.query(old.union(new)):
+            wall = platform.rect
+            # Landing only needs the player's top above the platform's, so starting
+            # a little inside a platform still lands on it
+            if dy > 0 and old.top < wall.top < new.bottom:  # Falling
+                new.bottom = wall.top
+                self.vel_y = 0
+                self.on_ground = True
+            elif dy < 0 and wall.bottom <= old.top and new.top < wall.bottom:  # Jumping
+                new.top = wall.bottom
+                self.vel_y = 0
+        if new.y != round(self.pos.y):
+            self.pos.y = new.y
+        self.rect = new
+
+    def jump(self):
+        if self.on_ground:
+            self.vel_y = -JUMP_STRENGTH
+
+# ---------------- SCENE ----------------
+class PlatformerScene(Scene):
+    """
+    Jump across the platforms to the door to earn the platform key.
+    Finishes with "win", "restart_adventure" (fell off) or "quit".
+    level is a code.levels.Level, by default assets/levels/platformer.json; the
+    door stands in its "goal" zone. Levels larger than the screen scroll to
+    follow the player; platforms sit in the level's SpatialGrid so collisions
+    and drawing only look at the ones nearby.
+    """
+
+    name = "platformer"
+
+    def __init__(self, player_sprite=None, level=None):
+        super().__init__()
+
+        # Load background
+        self.background = load_layer(*ASSETS["background"])
+        if self.background is None:
+            self.background = pygame.Surface(render_size((WIDTH, HEIGHT)))
+            self.background.fill(WHITE)
+
+        self.hardcore_heart = load_image(*ASSETS["hardcore_heart"])
+
+        # Load platform image
+        self.platform_img = load_image(*ASSETS["platform"])
+        if self.platform_img is None:
+            self.platform_img = pygame.Surface((150, 50))
+            self.platform_img.fill((100,50,0))
+
+        # Load door image for goal
+        self.door_img = load_image(*ASSETS["door"])
+        if self.door_img is None:
+            self.door_img = pygame.Surface((100, 100))
+            self.door_img.fill((255, 223, 0))
+
+        # ---------------- LEVEL ----------------
+        # Geometry and its spatial index come prebuilt with the level
+        level = level or load_level("platformer")
+        self.player = Player(*level.start, player_sprite)
+        self.platforms = level.solids
+        self.goal_rect = level.zone("goal")
+        self.level_rect = level.bounds.union((0, 0, WIDTH, HEIGHT))
+        self.drawn_camera = None
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                self.player.jump()
+            if event.key == pygame.K_ESCAPE:
+                self.finish("quit")
+
+    def update(self, dt):
+        player = self.player
+        with self.manager.profiler.phase("collision"):
+            player.update(self.platforms, self.manager.input.pressed(), dt)
+
+        if player.rect.top > self.level_rect.bottom:
+            for key in code.game_state.player_keys:
+                code.game_state.player_keys[key] = False
+            self.manager.push(FadeOut(duration=0.5), lambda _: self.finish("restart_adventure"))
+
+        elif player.rect.colliderect(self.goal_rect):
             code.game_state.player_keys["platform_key"] = True
-            fade_out(screen, duration=0.5)
-            return "win"
-
-        # ---------------- DRAW ----------------
-        screen.blit(background, (0, 0))  # Draw background first
-        all_sprites.draw(screen)         # Draw platforms, goal, player
-        if hardcore_heart:
-            screen.blit(hardcore_heart, (10, 10))  # Draw hardcore heart icon
-        pygame.display.flip()
\ No newline at end of file
+            self.manager.push(FadeOut(duration=0.5), lambda _: self.finish("win"))
+
+    def camera(self, player_pos):
+        """Top-left of the view, centred on the player and kept inside the level."""
+        level = self.level_rect
+        return (round(max(level.left, min(player_pos.x - WIDTH // 2, level.right - WIDTH))),
+                round(max(level.top, min(player_pos.y - HEIGHT // 2, level.bottom - HEIGHT))))
+
+    def draw(self, surface):
+        player = self.player
+        pos = lerp(player.prev_pos, player.pos, self.manager.alpha)
+        camera_x, camera_y = self.drawn_camera = self.camera(pos)
+        view = logical_rect(surface.get_clip()).move(camera_x, camera_y)
+
+        surface.blit(self.background, (0, 0))  # Draw background first; it stays put as the level scrolls
+        platform_img = render_image(self.platform_img)
+        surface.blits([(platform_img, render_pos((platform.rect.x - camera_x, platform.rect.y - camera_y)))
+                       for platform in self.platforms.query(view)], doreturn=False)
+        if self.goal_rect.colliderect(view):
+            surface.blit(render_image(self.door_img), render_pos((self.goal_rect.x - camera_x, self.goal_rect.y - camera_y)))
+        surface.blit(render_image(player.image), render_pos((pos.x - camera_x, pos.y - camera_y)))
+        if self.hardcore_heart:
+            surface.blit(render_image(self.hardcore_heart), render_pos((10, 10)))  # Draw hardcore heart icon
+
+    def moving_rects(self):
+        player = self.player
+        pos = lerp(player.prev_pos, player.pos, self.manager.alpha)
+        camera_x, camera_y = camera = self.camera(pos)
+        if camera != self.drawn_camera:
+            self.dirty = True  # the level scrolled
+        return {"player": player.image.get_rect(topleft=(pos.x - camera_x, pos.y - camera_y))}
@@ -0,0 +1,113 @@
+# profiler.py
+import csv
+import json
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import pygame
+
+WINDOW = 600  # frames per scene kept for the rolling percentiles
+HUD_KEY = pygame.K_F3
+HUD_REFRESH = 30  # frames between HUD text updates
+PHASES = ("frame", "idle", "input", "update", "collision", "draw", "flip")
+
+# Set SLEEPWALKERS_PROFILE=trace.json (Chrome trace) or profile.csv to write every
+# phase of every frame to that file when the game closes
+PROFILE_PATH = os.environ.get("SLEEPWALKERS_PROFILE")
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))]
+
+
+class Profiler:
+    """
+    Times each phase of each frame, grouped by the scene that was on top.
+    "frame" is the full frame time reported by Clock.tick, sleep included;
+    "idle" is the time an idle screen spent waiting for input.
+    Wrap code in `with profiler.phase("collision"):` to time it.
+    """
+
+    def __init__(self, trace_path=PROFILE_PATH, window=WINDOW):
+        self.samples = defaultdict(lambda: defaultdict(lambda: deque(maxlen=window)))  # scene -> phase -> ms
+        self.trace_path = trace_path
+        self.events = []  # (frame, scene, phase, start, duration), only kept when tracing
+        self.scene = None
+        self.frame = 0
+        self.origin = time.perf_counter()
+
+        self.hud_visible = False
+        self.hud_font = None
+        self.hud_lines = []
+
+    def begin_frame(self, scene, frame_ms):
+        self.scene = scene
+        self.frame += 1
+        self.samples[scene]["frame"].append(frame_ms)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.samples[self.scene][name].append((end - start) * 1000)
+            if self.trace_path:
+                self.events.append((self.frame, self.scene, name, start - self.origin, end - start))
+
+    def summary(self, scene):
+        """{phase: (p50, p95, p99)} in milliseconds for one scene."""
+        phases = self.samples.get(scene, {})
+        return {
+            name: tuple(percentile(phases[name], p) for p in (50, 95, 99))
+            for name in PHASES if name in phases
+        }
+
+    # ---------------- HUD ----------------
+    def toggle_hud(self):
+        self.hud_visible = not self.hud_visible
+        self.hud_lines = []
+
+    def draw_hud(self, surface):
+        if not self.hud_visible:
+            return
+        if self.hud_font is None:
+            self.hud_font = pygame.font.Font(None, 22)
+
+        # Sorting for percentiles every frame would show up in the numbers themselves
+        if not self.hud_lines or self.frame % HUD_REFRESH == 0:
+            text = [f"{self.scene}   p50 / p95 / p99 ms"]
+            for name, (p50, p95, p99) in self.summary(self.scene).items():
+                text.append(f"{name:<10}{p50:6.2f}{p95:7.2f}{p99:7.2f}")
+            self.hud_lines = [self.hud_font.render(line, True, (255, 255, 0), (0, 0, 0)) for line in text]
+
+        y = surface.get_height() - 10 - len(self.hud_lines) * 18
+        for line in self.hud_lines:
+            surface.blit(line, (surface.get_width() - 260, y))
+            y += 18
+
+    # ---------------- EXPORT ----------------
+    def export(self, path=None):
+        path = path or self.trace_path
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "scene", "phase", "start_ms", "duration_ms"])
+                for frame, scene, name, start, duration in self.events:
+                    writer.writerow([frame, scene, name, f"{start * 1000:.3f}", f"{duration * 1000:.3f}"])
+        else:
+            # Chrome trace-event format; open in chrome://tracing or ui.perfetto.dev
+            trace = [
+                {"name": name, "cat": scene, "ph": "X", "pid": 0, "tid": 0,
+                 "ts": start * 1e6, "dur": duration * 1e6, "args": {"frame": frame}}
+                for frame, scene, name, start, duration in self.events
+            ]
+            with open(path, "w") as f:
+                json.dump({"traceEvents": trace}, f)
+        print(f"Wrote {len(self.events)} profile events to {path}")
@@ -1,155 +1,134 @@
 import pygame
 import code.game_state
-import os
-import sys
-
-FPS = 60
+from code.asset_manager import load_image, load_layer
+from code.collision import sprite_hits_rect, sprites_collide
+from code.display import HEIGHT, WIDTH, render_image, render_pos, render_rect, render_width
+from code.levels import load_level
+from code.scene import Scene, lerp
+from code.text import TextInput, draw_text, get_font, wrap_text
+from code.transitions import FadeOut
 
 ROOM_PATH = "assets/room/room.jpg"
 PRINCESS_PATH = "assets/room/princess.png"
+FOLLOW_RATE = 0.3  # fraction of the gap the princess closes every 1/60 s
+
+# Everything the scene loads at the default window size, so the overworld can preload it on approach
+ASSETS = {
+    "background": (ROOM_PATH, (WIDTH, HEIGHT), False),
+    "princess": (PRINCESS_PATH, (300, 300)),
+    "fairy": ("assets/room/fairy.png", (150, 150)),
+}
+LAYERS = {"background"}  # loaded at the display's render scale, see load_layer()
 
-def load_image(path, size=None):
-    if os.path.exists(path):
-        img = pygame.image.load(path).convert_alpha()
-        if size:
-            img = pygame.transform.scale(img, size)
-        return img
-    else:
-        print(f"File not found: {path}")
-        return None
-
-def ask_riddle(screen, riddle_text, correct_answer, font_size=28):
+class RiddleScene(Scene):
     """
-    Display a riddle and get player's text input. Returns True if correct.
+    Display a riddle and get player's text input. Finishes with True once answered correctly.
     """
-    clock = pygame.time.Clock()
-    input_text = ""
-    font = pygame.font.Font(
-        "assets/main/PixemonTrialRegular-p7nLK.ttf",
-        font_size
-    )
-    running = True
-    result = False
-
-    while running:
-        clock.tick(FPS)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    if input_text.strip().lower() == correct_answer.lower():
-                        result = True
-                        running = False
-                    else:
-                        input_text = ""  # reset for retry
-                elif event.key == pygame.K_BACKSPACE:
-                    input_text = input_text[:-1]
+
+    name = "riddle"
+    idle = True
+
+    def __init__(self, riddle_text, correct_answer, font_size=28):
+        super().__init__()
+        self.riddle_text = riddle_text
+        self.correct_answer = correct_answer
+        self.font_size = font_size
+        self.font = get_font(font_size)
+        self.input = TextInput(self.font, (255, 255, 255))
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.dirty = True
+            if self.input.handle_event(event):
+                if self.input.text.strip().lower() == self.correct_answer.lower():
+                    self.finish(True)
                 else:
-                    input_text += event.unicode
+                    self.input.clear()  # reset for retry
+
+    def draw(self, surface):
+        font_size = self.font_size
 
         # Draw riddle screen
-        screen.fill((50, 50, 150))
+        surface.fill((50, 50, 150))
         # Wrap riddle text if too long
-        def wrap_text(text, font, max_width):
-            words = text.split(' ')
-            lines = []
-            current_line = ""
-            for word in words:
-                test_line = current_line + " " + word if current_line else word
-                if font.size(test_line)[0] <= max_width:
-                    current_line = test_line
-                else:
-                    lines.append(current_line)
-                    current_line = word
-            if current_line:
-                lines.append(current_line)
-            return lines
-
-        lines = wrap_text(riddle_text, font, screen.get_width() - 100)
-        for i, line in enumerate(lines):
-            text_surf = font.render(line, True, (255, 255, 255))
-            screen.blit(text_surf, (50, 50 + i * (font_size + 5)))
+        lines = wrap_text(self.riddle_text, self.font, WIDTH - 100)
+        draw_text(surface, lines, self.font, (255, 255, 255), (50, 50), font_size + 5)
 
         # Draw input box
-        input_box = pygame.Rect(50, 150 + len(lines)*(font_size+5), screen.get_width() - 100, 40)
-        pygame.draw.rect(screen, (255,255,255), input_box, 2)
-        input_surf = font.render(input_text, True, (255,255,255))
-        screen.blit(input_surf, (input_box.x + 5, input_box.y + 5))
-
-        pygame.display.flip()
-    
-    return result
-
-def fade_out(screen, duration=0.5):
-    """Fade the screen to black."""
-    clock = pygame.time.Clock()
-    fade_surface = pygame.Surface(screen.get_size())
-    fade_surface.fill((0, 0, 0))
-    steps = int(duration * FPS)
-    for i in range(steps):
-        alpha = int((i / steps) * 255)
-        fade_surface.set_alpha(alpha)
-        screen.blit(fade_surface, (0, 0))
-        pygame.display.flip()
-        clock.tick(FPS)
-
-def run_room(screen, player_sprite):
-    if not code.game_state.player_keys.get("lab_key", False):
-        return "main"
-
-    clock = pygame.time.Clock()
-    running = True
-    screen_width, screen_height = screen.get_size()
-
-    # Load and scale room background to fill the screen
-    background = pygame.image.load(ROOM_PATH).convert()
-    background = pygame.transform.scale(background, (screen_width, screen_height))
-
-    # Load princess sprite
-    princess_sprite = load_image(PRINCESS_PATH, (300, 300)).convert_alpha()
-    princess_rect = princess_sprite.get_rect(center=(screen_width // 2 + 200, screen_height // 2))
-
-    # Load fairy sprite
-    fairy_sprite = load_image("assets/room/fairy.png", (150, 150))
-    fairy_rect = fairy_sprite.get_rect(topleft=(50, 50))
-
-    # Player start position
-    sprite_width = player_sprite.get_width()
-    sprite_height = player_sprite.get_height()
-    player_rect = pygame.Rect(100, screen_height - 150, sprite_width, sprite_height)
-
-    HITBOX_PADDING_X, HITBOX_PADDING_Y = 10, 10
-    speed = 5
-
-    # Room exit (bottom center)
-    exit_radius = 55
-    exit_rect = pygame.Rect(screen_width // 2 - 140, screen_height - 50 - exit_radius, exit_radius * 2, exit_radius * 2)
-
-    # Initialize princess trail
-    if code.game_state.pink_pos == [0, 0]:
-        code.game_state.pink_pos[0] = player_rect.x - 10
-        code.game_state.pink_pos[1] = player_rect.y - 10
-
-    # Riddle state
-    riddle_given = False
-    riddle_solved = False
-    riddle_text = "I speak without a mouth and hear without ears. I have nobody, but I come alive with wind. What am I?"
-    correct_answer = "echo"
-
-    # Font for riddle/dialogue
-    font = pygame.font.Font(
-        "assets/main/PixemonTrialRegular-p7nLK.ttf", 
-        28
-    )
-
-    input_text = ""
-    input_active = False
-
-    while running:
-        clock.tick(FPS)
-        keys = pygame.key.get_pressed()
+        input_box = pygame.Rect(50, 150 + len(lines)*(font_size+5), WIDTH - 100, 40)
+        pygame.draw.rect(surface, (255,255,255), render_rect(input_box), render_width(2))
+        surface.blit(render_image(self.input.surface), render_pos((input_box.x + 5, input_box.y + 5)))
+
+class RoomScene(Scene):
+    """
+    Answer the fairy's riddle, then walk the princess out of the room.
+    Finishes with "main" when the player leaves through the exit.
+    level is a code.levels.Level, by default assets/levels/room.json, with the
+    fairy and princess points, an "exit" zone and the riddle text and answer.
+    """
+
+    name = "room"
+
+    speed = 300  # pixels per second
+
+    def __init__(self, player_sprite, screen_size, level=None):
+        super().__init__()
+        level = level or load_level("room")
+        self.player_sprite = player_sprite
+        self.screen_width, self.screen_height = screen_width, screen_height = screen_size
+
+        # Load and scale room background to fill the screen
+        self.background = load_layer(ROOM_PATH, (screen_width, screen_height), alpha=False)
+
+        # Load princess sprite
+        self.princess_sprite = load_image(*ASSETS["princess"])
+        self.princess_rect = self.princess_sprite.get_rect(center=level.points["princess"])
+
+        # Load fairy sprite
+        self.fairy_sprite = load_image(*ASSETS["fairy"])
+        self.fairy_rect = self.fairy_sprite.get_rect(topleft=level.points["fairy"])
+
+        # Player start position
+        sprite_width = player_sprite.get_width()
+        sprite_height = player_sprite.get_height()
+        self.player_rect = pygame.Rect(*level.start, sprite_width, sprite_height)
+        self.pos = pygame.Vector2(self.player_rect.topleft)
+        self.prev_pos = pygame.Vector2(self.pos)
+
+        # Room exit (bottom center)
+        self.exit_rect = level.zone("exit")
+
+        # Initialize princess trail
+        if code.game_state.pink_pos == [0, 0]:
+            code.game_state.pink_pos[0] = self.player_rect.x - 10
+            code.game_state.pink_pos[1] = self.player_rect.y - 10
+        self.prev_pink_pos = list(code.game_state.pink_pos)
+
+        # Riddle state
+        self.riddle_given = False
+        self.riddle_solved = False
+        self.riddle_text = level.text["riddle"]
+        self.correct_answer = level.text["answer"]
+
+        # Font for riddle/dialogue
+        self.font = get_font(28)
+
+        self.input = TextInput(self.font, (255, 255, 0))
+        self.input_active = False
+
+    def handle_event(self, event):
+        # Handle text input for riddle
+        if self.input_active and self.input.handle_event(event):
+            if self.input.text.strip().lower() == self.correct_answer.lower():
+                self.riddle_solved = True
+                self.input_active = False
+            self.input.clear()
+
+    def update(self, dt):
+        player_rect = self.player_rect
+        pos = self.pos
+        speed = self.speed * dt
+        keys = self.manager.input.pressed()
         dx = dy = 0
         if keys[pygame.K_LEFT]: dx = -speed
         if keys[pygame.K_RIGHT]: dx = speed
@@ -157,103 +136,74 @@ def run_room(screen, player_sprite):
         if keys[pygame.K_DOWN]: dy = speed
 
         # Move player
-        player_rect.x += dx
-        player_rect.y += dy
+        self.prev_pos.update(pos)
+        pos.x += dx
+        pos.y += dy
 
         # Keep player in bounds
-        player_rect.x = max(0, min(player_rect.x, screen_width - player_rect.width))
-        player_rect.y = max(0, min(player_rect.y, screen_height - player_rect.height))
+        pos.x = max(0, min(pos.x, self.screen_width - player_rect.width))
+        pos.y = max(0, min(pos.y, self.screen_height - player_rect.height))
+        player_rect.topleft = (round(pos.x), round(pos.y))
 
-        # Player hitbox
-        hitbox = pygame.Rect(
-            player_rect.x + HITBOX_PADDING_X,
-            player_rect.y + HITBOX_PADDING_Y,
-            player_rect.width - 2*HITBOX_PADDING_X,
-            player_rect.height - 2*HITBOX_PADDING_Y
-        )
+        # Pixel-perfect against the sprites' masks, after a rect check
+        sprite = self.player_sprite
+        with self.manager.profiler.phase("collision"):
+            at_fairy = sprites_collide(sprite, player_rect, self.fairy_sprite, self.fairy_rect)
+            at_princess = sprites_collide(sprite, player_rect, self.princess_sprite, self.princess_rect)
+            at_exit = sprite_hits_rect(sprite, player_rect, self.exit_rect)
 
         # Check interaction with fairy
-        if hitbox.colliderect(fairy_rect) and not riddle_given:
-            input_active = True
-            riddle_given = True
-
-        # Handle text input for riddle
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return "quit"
-            if input_active and event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    if input_text.strip().lower() == correct_answer.lower():
-                        riddle_solved = True
-                        input_active = False
-                    input_text = ""
-                elif event.key == pygame.K_BACKSPACE:
-                    input_text = input_text[:-1]
-                else:
-                    input_text += event.unicode
+        if at_fairy and not self.riddle_given:
+            self.input_active = True
+            self.riddle_given = True
 
         # Pick up princess only if riddle solved
-        if hitbox.colliderect(princess_rect) and not code.game_state.player_has_pink and riddle_solved:
+        if at_princess and not code.game_state.player_has_pink and self.riddle_solved:
             code.game_state.player_has_pink = True
 
         # Move princess if picked up
+        self.prev_pink_pos[:] = code.game_state.pink_pos
         if code.game_state.player_has_pink:
-            target_x = player_rect.x - 10
-            target_y = player_rect.y - 10
-            code.game_state.pink_pos[0] += (target_x - code.game_state.pink_pos[0]) * 0.3
-            code.game_state.pink_pos[1] += (target_y - code.game_state.pink_pos[1]) * 0.3
+            target_x = pos.x - 10
+            target_y = pos.y - 10
+            follow = 1 - (1 - FOLLOW_RATE) ** (dt * 60)
+            code.game_state.pink_pos[0] += (target_x - code.game_state.pink_pos[0]) * follow
+            code.game_state.pink_pos[1] += (target_y - code.game_state.pink_pos[1]) * follow
 
         # Check exit
-        if hitbox.colliderect(exit_rect):
-            fade_out(screen, duration=0.5)
-            return "main"
+        if at_exit:
+            self.manager.push(FadeOut(duration=0.5), lambda _: self.finish("main"))
 
+    def draw(self, surface):
         # Draw everything
-        screen.blit(background, (0, 0))
-        screen.blit(player_sprite, (player_rect.x, player_rect.y))
+        alpha = self.manager.alpha
+        surface.blit(self.background, (0, 0))
+        surface.blit(render_image(self.player_sprite), render_pos(lerp(self.prev_pos, self.pos, alpha)))
 
         # Draw fairy
-        screen.blit(fairy_sprite, fairy_rect.topleft)
+        surface.blit(render_image(self.fairy_sprite), render_pos(self.fairy_rect.topleft))
 
         # Draw princess
         if code.game_state.player_has_pink:
-            screen.blit(princess_sprite, (int(code.game_state.pink_pos[0]), int(code.game_state.pink_pos[1])))
+            pink_x = lerp(self.prev_pink_pos[0], code.game_state.pink_pos[0], alpha)
+            pink_y = lerp(self.prev_pink_pos[1], code.game_state.pink_pos[1], alpha)
+            surface.blit(render_image(self.princess_sprite), render_pos((int(pink_x), int(pink_y))))
         else:
-            screen.blit(princess_sprite, princess_rect)
+            surface.blit(render_image(self.princess_sprite), render_pos(self.princess_rect.topleft))
 
         # Draw exit
-        # pygame.draw.circle(screen, (0, 255, 0), exit_rect.center, exit_radius)
+        # pygame.draw.circle(surface, (0, 255, 0), self.exit_rect.center, self.exit_rect.width // 2)
 
         # Draw riddle input box if active
-        if input_active:
+        if self.input_active:
             # Dialogue box
-            box_rect = pygame.Rect(50, 220, screen_width - 100, 150)
-            pygame.draw.rect(screen, (0, 0, 0), box_rect)
-            pygame.draw.rect(screen, (255, 255, 255), box_rect, 3)
+            box_rect = pygame.Rect(50, 220, self.screen_width - 100, 150)
+            pygame.draw.rect(surface, (0, 0, 0), render_rect(box_rect))
+            pygame.draw.rect(surface, (255, 255, 255), render_rect(box_rect), render_width(3))
 
             # Riddle text (wrap if too long)
-            def wrap_text(text, font, max_width):
-                words = text.split(" ")
-                lines = []
-                current_line = ""
-                for word in words:
-                    test_line = current_line + " " + word if current_line else word
-                    if font.size(test_line)[0] <= max_width:
-                        current_line = test_line
-                    else:
-                        lines.append(current_line)
-                        current_line = word
-                if current_line:
-                    lines.append(current_line)
-                return lines
-
-            lines = wrap_text(riddle_text, font, box_rect.width - 20)
-            for i, line in enumerate(lines):
-                line_surf = font.render(line, True, (255, 255, 255))
-                screen.blit(line_surf, (box_rect.x + 10, box_rect.y + 10 + i*(font.get_height()+2)))
+            lines = wrap_text(self.riddle_text, self.font, box_rect.width - 20)
+            draw_text(surface, lines, self.font, (255, 255, 255), (box_rect.x + 10, box_rect.y + 10), self.font.get_height() + 2)
 
             # Input text
-            input_surf = font.render(input_text, True, (255, 255, 0))
-            screen.blit(input_surf, (box_rect.x + 10, box_rect.y + box_rect.height - 40))
-
-        pygame.display.flip()
\ No newline at end of file
+            surface.blit(render_image(self.input.surface), render_pos((box_rect.x + 10, box_rect.y + box_rect.height - 40)))
@@ -0,0 +1,221 @@
+# scene.py
+import pygame
+from code.display import FULLSCREEN_KEY, display, render_rect
+from code.input_source import LiveInput
+from code.profiler import HUD_KEY, Profiler
+
+FPS = 60  # render rate cap; the simulation always runs at TICK_RATE
+TICK_RATE = 120
+STEP = 1 / TICK_RATE
+MAX_STEPS = 12  # per rendered frame; past this the game slows down instead of spiralling
+IDLE_TIMEOUT = 500  # ms an idle scene sleeps waiting for input before checking in anyway
+RENDER_MARGIN = 2  # render pixels added around dirty rects below scale 1, for rounding
+
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+
+class Scene:
+    """
+    One screen of the game. Every frame the SceneManager passes events to
+    handle_event, calls update(STEP) on the top scene as many times as the
+    elapsed time needs, then draw(surface) once. Anything that moves should
+    keep its previous position and draw at lerp(previous, current,
+    self.manager.alpha) so motion stays smooth at any render rate.
+    A scene ends itself with finish(result), which hands result back to
+    whoever pushed it.
+
+    Screens that only change on input set idle = True. The manager then sleeps
+    until an event arrives instead of ticking at full rate, and only redraws
+    after the scene sets self.dirty = True (everything changed) or
+    self.changed = True (only what moving_rects() covers changed).
+
+    Scenes where a few things move over a still backdrop can return their
+    screen rects from moving_rects(). With dirty-rect drawing on, the manager
+    then repaints only where those things were and are, and pushes just those
+    rects to the display.
+
+    Everything here is on the logical screen (code.display.WIDTH x HEIGHT);
+    draw() gets the render surface, so scenes draw through code.display's
+    render_* helpers.
+    """
+
+    # Overlays (fades, dialogue boxes...) are drawn on top of the scene below them
+    overlay = False
+
+    # Groups this scene's frames in the profiler; defaults to the class name
+    name = None
+
+    idle = False
+
+    def __init__(self):
+        self.manager = None
+        self.dirty = True
+        self.changed = False
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def draw(self, surface):
+        pass
+
+    def moving_rects(self):
+        """
+        {key: screen rect} of everything drawn at a new spot this frame, or None
+        to always redraw the whole screen. Set self.dirty here if the backdrop
+        itself moved.
+        """
+        return None
+
+    def finish(self, result=None):
+        self.manager.pop(self, result)
+
+
+class SceneManager:
+    """
+    Runs the only game loop and keeps the stack of active scenes.
+    Scenes read the keyboard and mouse through self.manager.input so a recorded
+    session can be replayed. With fixed_dt set the loop never sleeps and every
+    frame advances by exactly that much (or by the replayed frame's own dt).
+    With dirty_rects set, scenes that support it only redraw what moved.
+    """
+
+    def __init__(self, screen, fps=FPS, input_source=None, fixed_dt=None, dirty_rects=False):
+        self.screen = screen
+        self.fps = fps
+        self.input = input_source or LiveInput()
+        self.fixed_dt = fixed_dt
+        self.dirty_rects = dirty_rects
+        self.drawn_rects = {}  # the top scene's moving rects as of the last frame drawn
+        self.clock = pygame.time.Clock()
+        self.stack = []  # (scene, on_done) pairs, top of the stack last
+        self.running = False
+        self.accumulator = 0
+        self.alpha = 0  # how far the next rendered frame is between the last two steps
+        self.profiler = Profiler()
+
+    @property
+    def top(self):
+        return self.stack[-1][0] if self.stack else None
+
+    def push(self, scene, on_done=None):
+        """Put scene on top; on_done(result) is called when it finishes."""
+        scene.manager = self
+        scene.dirty = True
+        self.stack.append((scene, on_done))
+
+    def pop(self, scene, result=None):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] is scene:
+                _, on_done = self.stack.pop(i)
+                if self.stack:
+                    self.top.dirty = True
+                if on_done:
+                    on_done(result)
+                return
+
+    def quit(self):
+        self.running = False
+
+    def run(self, scene):
+        self.push(scene)
+        self.running = True
+        while self.running and self.stack:
+            if self.fixed_dt:
+                self.step(self.fixed_dt, self.clock.tick())
+            elif self.top.idle:
+                # No frame cap needed: step() sleeps in input.wait() instead
+                self.step(self.clock.tick() / 1000, wait=IDLE_TIMEOUT)
+            else:
+                dt = self.clock.tick(self.fps) / 1000
+                self.step(dt)
+        self.input.close()
+        if self.profiler.trace_path:
+            self.profiler.export()
+
+    def step(self, dt, frame_ms=None, wait=0):
+        profiler = self.profiler
+        top = self.top
+        profiler.begin_frame(top.name or type(top).__name__, dt * 1000 if frame_ms is None else frame_ms)
+
+        if wait:
+            # Kept out of "input" so that phase only ever shows the real work
+            with profiler.phase("idle"):
+                self.input.wait(wait)
+        with profiler.phase("input"):
+            dt = self.input.begin_frame(dt)
+            for event in self.input.events():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                    return
+                if event.type == pygame.KEYDOWN and event.key == HUD_KEY:
+                    profiler.toggle_hud()
+                    self.top.dirty = True
+                elif event.type == pygame.KEYDOWN and event.key == FULLSCREEN_KEY:
+                    display.toggle_fullscreen()
+                    self.top.dirty = True
+                elif event.type == pygame.VIDEORESIZE:
+                    display.resized()
+                    self.top.dirty = True
+                elif self.top:
+                    self.top.handle_event(event)
+        if not self.running:
+            return
+
+        with profiler.phase("update"):
+            self.accumulator = min(self.accumulator + dt, MAX_STEPS * STEP)
+            # The epsilon keeps float error from turning a 60 FPS frame into 1 step, then 3
+            while self.accumulator >= STEP - 1e-9 and self.top and self.running:
+                self.top.update(STEP)
+                self.accumulator -= STEP
+            self.alpha = max(0, self.accumulator / STEP)
+
+        # Idle screens that haven't changed keep what is already on the display
+        top = self.top
+        if top and top.idle and not (top.dirty or top.changed):
+            return
+        if self.stack:
+            with profiler.phase("draw"):
+                moving = top.moving_rects() if self.dirty_rects else None
+                if moving is None or top.dirty or profiler.hud_visible:
+                    rects = None
+                    self.draw(self.screen)
+                    profiler.draw_hud(self.screen)
+                else:
+                    rects = self.repaint(top, [render_rect(rect, RENDER_MARGIN) for rect in self.changed_rects(moving)])
+                self.drawn_rects = moving or {}
+                top.dirty = top.changed = False
+            with profiler.phase("flip"):
+                display.present(rects)
+
+    def changed_rects(self, moving):
+        """Where each moving thing was last frame and is now, merged per thing."""
+        rects = []
+        for key, rect in moving.items():
+            old = self.drawn_rects.get(key)
+            if old != rect:
+                rects.append(rect.union(old) if old else rect)
+        # Things that disappeared since the last frame leave their old spot behind
+        rects.extend(rect for key, rect in self.drawn_rects.items() if key not in moving)
+        return rects
+
+    def repaint(self, scene, rects):
+        # A full draw clipped to each rect; SDL skips everything outside the clip
+        surface = self.screen
+        for rect in rects:
+            surface.set_clip(rect)
+            scene.draw(surface)
+        surface.set_clip(None)
+        return rects
+
+    def draw(self, surface):
+        # Start from the topmost full-screen scene so overlays land on what's below
+        first = len(self.stack) - 1
+        while first > 0 and self.stack[first][0].overlay:
+            first -= 1
+        for scene, _ in self.stack[first:]:
+            scene.draw(surface)
@@ -0,0 +1,47 @@
+# spatial.py
+from collections import defaultdict
+
+CELL_SIZE = 256  # a couple of platforms wide, so most queries touch one to four cells
+
+
+class SpatialGrid:
+    """
+    Buckets static things with a .rect into CELL_SIZE squares, so finding what
+    overlaps a rect only looks at the cells under it instead of at everything.
+    Build it once; moving an item means removing and re-inserting it.
+    """
+
+    def __init__(self, items=(), cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.count = 0
+        for item in items:
+            self.insert(item)
+
+    def _cells(self, rect):
+        size = self.cell_size
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield column, row
+
+    def insert(self, item):
+        for cell in self._cells(item.rect):
+            self.cells[cell].append(item)
+        self.count += 1
+
+    def remove(self, item):
+        for cell in self._cells(item.rect):
+            self.cells[cell].remove(item)
+        self.count -= 1
+
+    def query(self, rect):
+        """Every item whose rect overlaps rect, each once, in insertion order per cell."""
+        found = []
+        seen = set()
+        cells = self.cells
+        for cell in self._cells(rect):
+            for item in cells.get(cell, ()):
+                if item not in seen and item.rect.colliderect(rect):
+                    seen.add(item)
+                    found.append(item)
+        return found
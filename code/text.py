@@ -0,0 +1,138 @@
+# text.py
+from collections import OrderedDict
+
+import pygame
+from code.display import render_image, render_pos
+
+FONT_PATH = "assets/main/PixemonTrialRegular-p7nLK.ttf"
+LINE_CACHE_SIZE = 256  # rendered lines kept before the least recently used is dropped
+
+
+class TextCache:
+    """
+    Shared fonts, wrapped layouts and rendered lines, so text on screen costs a
+    blit per line instead of a render per line per frame.
+    Fonts are keyed on (path, size), layouts on (text, max_width, font) and
+    rendered lines on (text, font, color, background). Layouts are small and
+    kept for good; rendered lines are evicted least recently used first.
+    Returned surfaces are shared, so never draw onto them.
+    """
+
+    def __init__(self, max_lines=LINE_CACHE_SIZE):
+        self.max_lines = max_lines
+        self.fonts = {}
+        self.layouts = {}
+        self.lines = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size, path=FONT_PATH):
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[key] = pygame.font.Font(path, size)
+        return font
+
+    def wrap(self, text, font, max_width):
+        """Split text into lines no wider than max_width, breaking between words."""
+        key = (text, max_width, font)
+        lines = self.layouts.get(key)
+        if lines is None:
+            lines = []
+            current_line = ""
+            for word in text.split(" "):
+                test_line = current_line + " " + word if current_line else word
+                if font.size(test_line)[0] <= max_width:
+                    current_line = test_line
+                else:
+                    lines.append(current_line)
+                    current_line = word
+            if current_line:
+                lines.append(current_line)
+            lines = self.layouts[key] = tuple(lines)
+        return lines
+
+    def render(self, text, font, color, background=None):
+        key = (text, font, color, background)
+        surface = self.lines.get(key)
+        if surface is not None:
+            self.lines.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.lines[key] = font.render(text, True, color, background)
+        if len(self.lines) > self.max_lines:
+            self.lines.popitem(last=False)
+        return surface
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "fonts": len(self.fonts),
+            "layouts": len(self.layouts),
+            "lines": len(self.lines),
+        }
+
+
+# Shared by every scene so re-entering one never re-renders its text
+text_cache = TextCache()
+
+
+def get_font(size, path=FONT_PATH):
+    return text_cache.font(size, path)
+
+
+def wrap_text(text, font, max_width):
+    return text_cache.wrap(text, font, max_width)
+
+
+def render_text(text, font, color, background=None):
+    return text_cache.render(text, font, color, background)
+
+
+def draw_text(surface, lines, font, color, pos, spacing):
+    """Blit already wrapped lines top to bottom, spacing pixels apart, at logical pos."""
+    x, y = pos
+    for i, line in enumerate(lines):
+        surface.blit(render_image(render_text(line, font, color)), render_pos((x, y + i * spacing)))
+
+
+class TextInput:
+    """
+    A one-line text field fed with KEYDOWN events. Its surface is rendered
+    straight from the font, outside the line cache, and only when the text
+    has changed since the last draw.
+    """
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.text = ""
+        self._surface = None
+
+    def handle_event(self, event):
+        """Apply one KEYDOWN. Returns True when Enter is pressed."""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_RETURN:
+            return True
+        if event.key == pygame.K_BACKSPACE:
+            self.text = self.text[:-1]
+        else:
+            self.text += event.unicode
+        self._surface = None
+        return False
+
+    def clear(self):
+        self.text = ""
+        self._surface = None
+
+    @property
+    def surface(self):
+        if self._surface is None:
+            self._surface = self.font.render(self.text, True, self.color)
+        return self._surface
@@ -0,0 +1,182 @@
+# transitions.py
+import math
+import weakref
+
+import pygame
+from code.display import render_pos
+from code.scene import Scene
+
+MAX_ZOOM = 2  # ZoomTransition goes between 1x and this
+MIP_STEPS = 2  # zoom levels pre-scaled per doubling; each frame then scales down by at most 2 ** (1 / MIP_STEPS)
+IRIS_KEY = (255, 0, 255)  # colour punched out of the iris overlay
+
+_overlays = {}  # (size, kind) -> the one surface every transition of that kind draws with
+_mips = weakref.WeakKeyDictionary()  # source surface -> {screen size: mip chain}
+
+
+def overlay(size, kind="fade"):
+    """
+    A screen-sized surface shared by every transition of a kind, so running one
+    never allocates. Only one transition draws at a time, so sharing is safe as
+    long as each sets whatever alpha or colorkey it needs on every draw.
+    """
+    surface = _overlays.get((size, kind))
+    if surface is None:
+        surface = _overlays[size, kind] = pygame.Surface(size)
+    return surface
+
+
+def blit_faded(surface, image, alpha):
+    """Blit image over the whole of surface at alpha 0-255."""
+    if alpha <= 0:
+        return
+    # SDL blends a surface alpha of exactly 255 down a path ~15x slower than a plain copy
+    image.set_alpha(None if alpha >= 255 else alpha)
+    surface.blit(image, (0, 0))
+
+
+class Transition(Scene):
+    """
+    A timed effect that runs inside the main loop like any other scene and
+    finishes once duration seconds have passed. Any key or mouse click skips
+    to the end unless interruptible is False. progress goes from 0 to 1.
+    """
+
+    interruptible = True
+
+    def __init__(self, duration=0.5):
+        super().__init__()
+        self.duration = duration
+        self.elapsed = 0
+
+    @property
+    def progress(self):
+        return min(self.elapsed / self.duration, 1) if self.duration > 0 else 1
+
+    def handle_event(self, event):
+        if self.interruptible and event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+            self.finish()
+
+    def update(self, dt):
+        self.elapsed += dt
+        if self.elapsed >= self.duration:
+            self.finish()
+
+
+class FadeOut(Transition):
+    """Fades whatever is underneath to black, then finishes."""
+
+    name = "fade"
+    overlay = True
+
+    def draw(self, surface):
+        # New surfaces start out black
+        blit_faded(surface, overlay(surface.get_size()), int(self.progress * 255))
+
+
+class CrossFade(Transition):
+    """
+    Fades from_surface (a snapshot of the screen before the switch, e.g.
+    manager.screen.copy()) out over whatever is underneath, then finishes.
+    """
+
+    name = "crossfade"
+    overlay = True
+
+    def __init__(self, from_surface, duration=0.5):
+        super().__init__(duration)
+        # Opaque, so the per-surface alpha below is the only blending per pixel
+        self.from_surface = from_surface.convert()
+
+    def draw(self, surface):
+        blit_faded(surface, self.from_surface, int((1 - self.progress) * 255))
+
+
+class IrisOut(Transition):
+    """
+    Closes a circle around center (a logical position, the middle of the
+    screen by default) until only black is left over whatever is underneath,
+    then finishes. With closing=False it opens from black instead.
+    """
+
+    name = "iris"
+    overlay = True
+
+    def __init__(self, duration=0.5, center=None, closing=True):
+        super().__init__(duration)
+        self.center = center
+        self.closing = closing
+
+    def draw(self, surface):
+        size = surface.get_size()
+        center = render_pos(self.center) if self.center else (size[0] // 2, size[1] // 2)
+        # Far enough to uncover every corner of the screen
+        full = max(math.hypot(x - center[0], y - center[1]) for x in (0, size[0]) for y in (0, size[1]))
+        t = self.progress if self.closing else 1 - self.progress
+        radius = round(full * (1 - t))
+
+        iris = overlay(size, "iris")
+        iris.fill((0, 0, 0))
+        if radius:
+            pygame.draw.circle(iris, IRIS_KEY, center, radius)
+        iris.set_colorkey(IRIS_KEY)
+        surface.blit(iris, (0, 0))
+
+
+def zoom_mips(source, size):
+    """
+    [(zoom, surface)], largest first: source itself, then copies scaled down a
+    step at a time to screen size. Levels past the source's own resolution would
+    add no detail, so a screen-sized source needs none. Built once per source
+    and screen size; call ahead of time to keep the work out of the transition.
+    """
+    chains = _mips.get(source)
+    if chains is None:
+        chains = _mips[source] = {}
+    mips = chains.get(size)
+    if mips is not None:
+        return mips
+
+    level = source
+    if level.get_flags() & pygame.SRCALPHA:
+        level = level.convert()  # a zoom always covers the whole screen, so alpha is never needed
+    zoom = level.get_width() / size[0]
+    mips = chains[size] = [(zoom, level)]
+    for i in range(1, MIP_STEPS * int(math.log2(MAX_ZOOM)) + 1):
+        step_zoom = MAX_ZOOM * 2 ** (-i / MIP_STEPS)
+        if step_zoom < zoom - 1e-9:
+            # Each level from the one above, so no single scale spans more than a step
+            level = pygame.transform.smoothscale(level, (round(size[0] * step_zoom), round(size[1] * step_zoom)))
+            zoom = step_zoom
+            mips.append((zoom, level))
+    return mips
+
+
+class ZoomTransition(Transition):
+    """
+    Zooms start_surface in (or out) around the centre between 1x and MAX_ZOOM
+    times the screen, then finishes.
+    Every frame only smooth-scales the visible crop of the nearest zoom_mips()
+    level, straight onto the screen, so a frame costs about one screen of
+    scaling no matter how big start_surface is.
+    """
+
+    name = "zoom"
+
+    def __init__(self, start_surface, duration=0.5, zoom_in=True):
+        super().__init__(duration)
+        self.start_surface = start_surface
+        self.zoom_in = zoom_in
+
+    def draw(self, surface):
+        size = surface.get_size()
+        mips = zoom_mips(self.start_surface, size)
+        t = self.progress
+        scale = 1 + (MAX_ZOOM - 1) * t if self.zoom_in else MAX_ZOOM - (MAX_ZOOM - 1) * t
+
+        # The smallest level that still has at least a pixel per screen pixel, else the biggest there is
+        level = next((level for zoom, level in reversed(mips) if zoom >= scale - 1e-9), mips[0][1])
+        bounds = level.get_rect()
+        crop = pygame.Rect(0, 0, round(bounds.width / scale), round(bounds.height / scale))
+        crop.center = bounds.center
+        pygame.transform.smoothscale(level.subsurface(crop.clip(bounds)), size, surface)
@@ -0,0 +1,96 @@
+# widgets.py
+import pygame
+from code.display import render_image, render_pos
+from code.text import render_text
+
+FILL = (200, 200, 200, 180)
+HOVER_FILL = (220, 220, 220, 220)
+BORDER = (255, 255, 255)
+BORDER_WIDTH = 3
+BORDER_RADIUS = 15
+HOVER_SCALE = 1.1  # the hover look grows by this much around the same centre
+
+
+def panel(size, fill=FILL):
+    """The rounded, white-bordered box every menu widget is drawn on."""
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.rect(surface, fill, surface.get_rect(), border_radius=BORDER_RADIUS)
+    pygame.draw.rect(surface, BORDER, surface.get_rect(), width=BORDER_WIDTH, border_radius=BORDER_RADIUS)
+    return surface
+
+
+class Widget:
+    """
+    A box on a menu screen with its normal and hover looks rendered once, up
+    front, so drawing it is two blits: the box, then its content centred on it.
+    rect is where it's clicked; screen_rect is where its current look is drawn.
+    Both are logical; at other render scales the looks are scaled once, on first draw.
+    """
+
+    def __init__(self, rect, content):
+        self.rect = pygame.Rect(rect)
+        self.content = content
+        self.content_pos = content.get_rect(center=self.rect.center)
+        self.hovered = False
+
+        hover_size = (int(self.rect.width * HOVER_SCALE), int(self.rect.height * HOVER_SCALE))
+        self.looks = []  # (image, screen rect), normal then hover
+        for size, fill in ((self.rect.size, FILL), (hover_size, HOVER_FILL)):
+            image = panel(size, fill)
+            self.looks.append((image, image.get_rect(center=self.rect.center)))
+
+    @property
+    def screen_rect(self):
+        return self.looks[self.hovered][1]
+
+    def set_hovered(self, hovered):
+        """Returns True if that changed the widget's look."""
+        changed = hovered != self.hovered
+        self.hovered = hovered
+        return changed
+
+    def draw(self, surface):
+        image, rect = self.looks[self.hovered]
+        surface.blit(render_image(image), render_pos(rect.topleft))
+        surface.blit(render_image(self.content), render_pos(self.content_pos.topleft))
+
+
+class Button(Widget):
+    """A widget labelled with a line of text."""
+
+    def __init__(self, rect, text, font, color=(0, 0, 0)):
+        self.text = text
+        super().__init__(rect, render_text(text, font, color))
+
+
+class Card(Widget):
+    """A widget showing an image, like a character to pick."""
+
+
+class WidgetGroup:
+    """
+    The widgets on one screen. hover() follows the pointer and reports whether
+    any look changed, so idle screens know when to redraw; rects() gives the
+    scene's moving_rects(), which only differ from the last frame's for the
+    widgets whose look changed.
+    """
+
+    def __init__(self, widgets):
+        self.widgets = list(widgets)
+
+    def at(self, pos):
+        """Index of the widget under pos, or None."""
+        return next((i for i, widget in enumerate(self.widgets) if widget.rect.collidepoint(pos)), None)
+
+    def hover(self, pos):
+        changed = False
+        for widget in self.widgets:
+            changed |= widget.set_hovered(widget.rect.collidepoint(pos))
+        return changed
+
+    def rects(self):
+        return {("widget", i): widget.screen_rect for i, widget in enumerate(self.widgets)}
+
+    def draw(self, surface):
+        for widget in self.widgets:
+            widget.draw(surface)
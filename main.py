@@ -1,515 +1,649 @@
-import pygame
+import argparse
+import math
 import os
-import sys
+import pygame
 import code.platformer
 import code.laser_labyrinth
 import code.room
-from code.room import run_room
-from code.game_state import player_keys, player_has_pink, pink_pos
+from code.game_state import player_keys
 import code.game_state
+from code.asset_manager import (load_image, load_layer, preload, preload_assets, preload_layer,
+                                register_assets, unload_assets)
+from code.display import HEIGHT, WIDTH, display, render_image, render_pos
+from code.input_source import RecordingInput, ReplayInput
+from code.levels import load_level
+from code.navigation import NavGrid
+from code.scene import Scene, SceneManager, lerp
+from code.text import FONT_PATH, get_font, render_text, wrap_text
+from code.tilemap import TileLayer
+from code.transitions import ZoomTransition, zoom_mips
+from code.widgets import Button, Card, WidgetGroup
 
 # ------------------- VARIABLES ------------------
 WHITE = (255,255,255)
 BLACK = (0,0,0)
 
 # -------------------- SETTINGS --------------------
-WIDTH, HEIGHT = 1200, 800
-FPS = 60
+# WIDTH, HEIGHT (the logical screen) come from code.display
+MAP_SIZE = (WIDTH * 2, HEIGHT * 2)
+FPS = 60  # render rate; the simulation runs at a fixed code.scene.TICK_RATE
 CENTER = (WIDTH // 2, HEIGHT // 2)
-SPEED = 7
+SPEED = 420  # pixels per second
 
 SPRITE_SELECTION_WIDTH, SPRITE_SELECTION_HEIGHT = 185, 200 
 SPRITE_WIDTH, SPRITE_HEIGHT = 60, 75
 ZOOM_DURATION = 0.5
+PREFETCH_DISTANCE = 250  # start loading a mini-game's assets this close to its door
 
-# -------------------- FUNCTIONS --------------------
-def load_image(path, size=None):
-    if os.path.exists(path):
-        image = pygame.image.load(path).convert_alpha()
-        if size:
-            image = pygame.transform.scale(image, size)
-        return image
-    else:
-        print(f"File not found: {path}")
-        return None
-    
-def is_walkable(bg_surface, sprite_rect):
-    # Check the pixel at the center of the sprite
-    center_x = sprite_rect.centerx
-    center_y = sprite_rect.centery
-
-    # Make sure we don't go out of bounds
-    if center_x < 0 or center_x >= bg_surface.get_width() or center_y < 0 or center_y >= bg_surface.get_height():
-        return False
-
-    pixel_color = bg_surface.get_at((center_x, center_y))  # Returns (R,G,B,A)
-    
-    # Walkable if pixel is white (255,255,255)
-    return pixel_color[:3] == (255, 255, 255)
-
-def zoom_transition(start_surface, end_surface, screen, duration=0.5, zoom_in=True):
-    clock = pygame.time.Clock()
-    frames = int(duration * FPS)
-    
-    for i in range(frames):
-        t = i / frames  
-        scale = 1 + t if zoom_in else 2 - t  
-
-        new_width = int(WIDTH * scale)
-        new_height = int(HEIGHT * scale)
-        scaled_surface = pygame.transform.smoothscale(start_surface, (new_width, new_height))
+# The module behind each overworld door, by its zone's scene name in assets/levels/overworld.json
+MINI_GAMES = {
+    "platformer": code.platformer,
+    "laser_labyrinth": code.laser_labyrinth,
+    "room": code.room,
+}
 
-        offset_x = (WIDTH - new_width) // 2
-        offset_y = (HEIGHT - new_height) // 2
+TYPE_SPEED = 50  # dialogue characters revealed per second
+READ_TIME = 1500  # milliseconds a fully revealed dialogue stays up, at least
+DIALOGUE_ITEM_SIZE = (100, 100)
+PLAY_INTRO = False  # play the zooms and intro dialogues after picking a character
 
-        screen.fill((0,0,0))
-        screen.blit(scaled_surface, (offset_x, offset_y))
-        pygame.display.flip()
-        clock.tick(FPS)
+# -------------------- FUNCTIONS --------------------
+def build_walk_mask(path_surface):
+    """Bit-packed mask of the blocked (non-white) pixels of the path layer."""
+    # Alpha is ignored: |a - 128| < 129 holds for every alpha value
+    blocked_mask = pygame.mask.from_threshold(path_surface, (255, 255, 255, 128), (1, 1, 1, 129))
+    blocked_mask.invert()
+    return blocked_mask
+
+_rect_masks = {}
+
+def is_walkable(blocked_mask, sprite_rect):
+    # Off the map is never walkable
+    map_width, map_height = blocked_mask.get_size()
+    if sprite_rect.left < 0 or sprite_rect.top < 0 or sprite_rect.right > map_width or sprite_rect.bottom > map_height:
+        return False
 
-    screen.blit(end_surface, (0,0))
-    pygame.display.flip()
+    # One overlap call tests every pixel under the rect, not just the corners
+    rect_mask = _rect_masks.get(sprite_rect.size)
+    if rect_mask is None:
+        rect_mask = _rect_masks[sprite_rect.size] = pygame.mask.Mask(sprite_rect.size, fill=True)
+    return blocked_mask.overlap(rect_mask, sprite_rect.topleft) is None
 
-def show_dialogue(screen, background_img, text, char_img=None, item_img=None, walk=False, sprite_pos=None, font_size=28, duration=7000, walk_duration=3000, y_offset=None):
+class DialogueScene(Scene):
     """
     Shows a dialogue with optional character walking and/or item image.
+    The text types itself out at TYPE_SPEED characters per second; any key or
+    click shows the rest at once.
     - font_size: smaller for longer text
     - duration: milliseconds for static dialogues
     - walk_duration: milliseconds for character walking
     - y_offset: vertical start position for text
     """
-    clock = pygame.time.Clock()
-    dialogue_font = pygame.font.Font(
-        '/Users/albertlungu/Documents/GitHub/The-Sleepwalkers/assets/main/PixemonTrialRegular-p7nLK.ttf',
-        font_size
-    )
-
-    # Word-wrap function
-    def wrap_text(text, font, max_width):
-        words = text.split(' ')
-        lines = []
-        current_line = ''
-        for word in words:
-            test_line = current_line + ' ' + word if current_line else word
-            if font.size(test_line)[0] <= max_width:
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word
-        if current_line:
-            lines.append(current_line)
-        return lines
-
-    lines = wrap_text(text, dialogue_font, WIDTH - 100)
-
-    # Default y_offset if not provided
-    if y_offset is None:
-        y_offset = HEIGHT - 200
-
-    # Walk animation setup
-    if char_img and walk and sprite_pos:
-        char_x, char_y = sprite_pos
-        target_x = char_x + 300  # distance to move
-        total_frames = walk_duration / (1000 / FPS)  # total frames based on duration and FPS
-        step = (target_x - char_x) / total_frames  # pixels per frame
 
-    running = True
-    start_time = pygame.time.get_ticks()
-
-    while running:
-        clock.tick(FPS)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-
-        screen.blit(background_img, (0, 0))
-
-        # Draw character walking
-        if char_img and walk and sprite_pos:
-            scaled_char = pygame.transform.smoothscale(char_img, (SPRITE_WIDTH, SPRITE_HEIGHT))
-            screen.blit(scaled_char, (char_x, char_y))
-            char_x += step
-            if char_x >= target_x:
-                char_x = target_x
-                running = False
-
-        # Draw item image (scaled nicely)
-        if item_img:
-            item_scaled = pygame.transform.smoothscale(item_img, (100, 100))
-            screen.blit(item_scaled, (WIDTH - item_scaled.get_width() - 50, HEIGHT - item_scaled.get_height() - 50))
-
-        # Draw dialogue text
-        for i, line in enumerate(lines):
-            text_surf = dialogue_font.render(line, True, (255, 255, 255))
-            screen.blit(text_surf, (50, y_offset + i * (font_size + 5)))
-
-        pygame.display.flip()
+    name = "dialogue"
+
+    def __init__(self, background_img, text, char_img=None, item_img=None, walk=False, sprite_pos=None, font_size=28, duration=7000, walk_duration=3000, y_offset=None):
+        super().__init__()
+        self.background_img = background_img
+        self.walk = bool(char_img and walk and sprite_pos)
+        self.font_size = font_size
+        self.duration = duration
+        self.dialogue_font = get_font(font_size)
+        self.lines = wrap_text(text, self.dialogue_font, WIDTH - 100)
+
+        # Scaled once here rather than every frame
+        self.char_img = pygame.transform.smoothscale(char_img, (SPRITE_WIDTH, SPRITE_HEIGHT)) if self.walk else None
+        self.item_img = pygame.transform.smoothscale(item_img, DIALOGUE_ITEM_SIZE) if item_img else None
+
+        # Default y_offset if not provided
+        self.y_offset = HEIGHT - 200 if y_offset is None else y_offset
+
+        # Walk animation setup
+        if self.walk:
+            self.char_x, self.char_y = sprite_pos
+            self.target_x = self.char_x + 300  # distance to move
+            self.walk_speed = (self.target_x - self.char_x) / (walk_duration / 1000)  # pixels per second
+            self.prev_char_x = self.char_x
+
+        # Text reveal; each line break counts as the space it replaced
+        self.text_length = sum(len(line) for line in self.lines) + len(self.lines) - 1
+        self.reveal_time = self.text_length / TYPE_SPEED * 1000
+        self.partial_line = None  # (text, surface) of the line being typed
+
+        self.elapsed = 0
+
+    @classmethod
+    def from_data(cls, entry, char_img=None):
+        """Build a dialogue from one INTRO_DIALOGUES-style entry."""
+        return cls(load_layer(entry["background"], (WIDTH, HEIGHT), False), entry["text"],
+                   char_img=char_img,
+                   item_img=load_image(entry["item"], DIALOGUE_ITEM_SIZE) if "item" in entry else None,
+                   walk=entry.get("walk", False),
+                   sprite_pos=list(entry["sprite_pos"]) if "sprite_pos" in entry else None,
+                   y_offset=entry.get("y_offset"))
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
+            self.elapsed = max(self.elapsed, self.reveal_time)
+
+    def update(self, dt):
+        self.elapsed += dt * 1000
+        # Whatever happens, leave the whole text up for a moment before moving on
+        read = self.elapsed >= self.reveal_time + READ_TIME
+
+        # Character walking
+        if self.walk:
+            self.prev_char_x = self.char_x
+            self.char_x = min(self.char_x + self.walk_speed * dt, self.target_x)
+            if self.char_x >= self.target_x and read:
+                self.finish()
 
         # Static dialogues last longer
-        if not walk and pygame.time.get_ticks() - start_time >= duration:
-            running = False
-        clock.tick(FPS)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+        elif self.elapsed >= self.duration and read:
+            self.finish()
 
-        screen.blit(background_img, (0, 0))
+    def draw(self, surface):
+        surface.blit(self.background_img, (0, 0))
 
         # Draw character walking
-        if char_img and walk and sprite_pos:
-            scaled_char = pygame.transform.smoothscale(char_img, (SPRITE_WIDTH, SPRITE_HEIGHT))
-            screen.blit(scaled_char, (char_x, char_y))
-            char_x += step
-            if char_x >= target_x:
-                char_x = target_x
-                running = False
-
-        # Draw item image (scaled nicely)
-        if item_img:
-            item_scaled = pygame.transform.smoothscale(item_img, (100, 100))
-            screen.blit(item_scaled, (WIDTH - item_scaled.get_width() - 50, HEIGHT - item_scaled.get_height() - 50))
-
-        # Draw dialogue text
-        for i, line in enumerate(lines):
-            text_surf = dialogue_font.render(line, True, (255, 255, 255))
-            screen.blit(text_surf, (50, HEIGHT - 200 + i * (font_size + 5)))
-
-        pygame.display.flip()
+        if self.walk:
+            surface.blit(render_image(self.char_img), render_pos((lerp(self.prev_char_x, self.char_x, self.manager.alpha), self.char_y)))
+
+        # Draw item image
+        if self.item_img:
+            item_pos = (WIDTH - self.item_img.get_width() - 50, HEIGHT - self.item_img.get_height() - 50)
+            surface.blit(render_image(self.item_img), render_pos(item_pos))
+
+        # Draw dialogue text, up to the last character revealed so far
+        font = self.dialogue_font
+        spacing = self.font_size + 5
+        remaining = int(self.elapsed / 1000 * TYPE_SPEED)
+        for i, line in enumerate(self.lines):
+            if remaining <= 0:
+                break
+            if remaining < len(line):
+                # Only the line being typed is rendered, and only when it grows
+                shown = line[:remaining]
+                if self.partial_line is None or self.partial_line[0] != shown:
+                    self.partial_line = (shown, font.render(shown, True, WHITE))
+                line_surf = self.partial_line[1]
+            else:
+                line_surf = render_text(line, font, WHITE)
+            surface.blit(render_image(line_surf), render_pos((50, self.y_offset + i * spacing)))
+            remaining -= len(line) + 1
+
+def preload_dialogues(entries):
+    """Start loading every image a list of dialogue entries needs."""
+    for entry in entries:
+        preload_layer(entry["background"], (WIDTH, HEIGHT), False)
+        if "item" in entry:
+            preload(entry["item"], DIALOGUE_ITEM_SIZE)
+
+
+# -------------------- ASSETS --------------------
+# name: (path, size[, alpha]). Nothing is loaded until a screen first asks for it.
+# Sizes are logical; LAYERS are only ever drawn, so they load at the render scale.
+IMAGES = {
+    "title": ("assets/main/title_page.png", (WIDTH, HEIGHT)),
+    "title_poster": ("assets/main/title_page_poster.png", (800, 530)),
+    "hardcore_heart": ("assets/main/hardcore_heart.png", (50, 50)),
+    "foreground": ("assets/main/map_foreground.png", MAP_SIZE),
+    # Opaque: a plain copy is much cheaper to blit than per-pixel alpha, and SDL
+    # already clips it to the screen, so it is drawn in one piece
+    "background": ("assets/main/map_background.png", MAP_SIZE, False),
+    "princess_follower": ("assets/room/princess.png", (200, 200)),
+    "win": ("assets/main/win.png", (WIDTH, HEIGHT)),
+}
+LAYERS = {"title", "title_poster", "foreground", "background", "win"}
+PATH_IMAGE = ("assets/main/path_background.png", MAP_SIZE)  # collisions, so always logical
+
+# Named groups of IMAGES for the asset memory report; "title" is unloaded once
+# the menus are left, and each mini-game's ASSETS when its scene exits
+ASSET_GROUPS = {
+    "title": ("title", "title_poster"),
+    "overworld": ("background", "foreground", "princess_follower", "hardcore_heart"),
+    "win": ("win",),
+}
+for group, names in ASSET_GROUPS.items():
+    register_assets(group, {name: IMAGES[name] for name in names}, LAYERS)
+for group, mini_game in MINI_GAMES.items():
+    register_assets(group, mini_game.ASSETS, mini_game.LAYERS)
+
+# (path, in-game size, selection screen size) for each playable character
+SPRITES = [
+    ("assets/main/sprite_1.png", (SPRITE_WIDTH - 10, SPRITE_HEIGHT), (SPRITE_SELECTION_WIDTH, SPRITE_SELECTION_HEIGHT)),
+    ("assets/main/sprite_2.png", (SPRITE_WIDTH - 10, SPRITE_HEIGHT), (SPRITE_SELECTION_WIDTH, SPRITE_SELECTION_HEIGHT)),
+    ("assets/main/sprite_3.png", (SPRITE_WIDTH - 10, SPRITE_HEIGHT), (SPRITE_SELECTION_WIDTH, SPRITE_SELECTION_HEIGHT)),
+    ("assets/main/sprite_4.png", (SPRITE_WIDTH, SPRITE_HEIGHT), (SPRITE_SELECTION_WIDTH - 65, SPRITE_SELECTION_HEIGHT - 65)),
+]
+
+# Played in order after a character is picked, when PLAY_INTRO is set
+INTRO_DIALOGUES = [
+    {"background": "assets/dialogue/dialogue_1.png",
+     "text": "Once upon a time, there was a warrior named Kashyap who was an avid explorer in his region!",
+     "walk": True, "sprite_pos": (100, HEIGHT - 400)},
+    {"background": "assets/dialogue/dialogue_2.png",
+     "text": 'During his adventure of the "Dream of Days", Kashyap was notified of a princess trapped in the deep dark dungeons! The only way to rescue her is to collect the hidden keys of reality, stored in unknown locations across the map!',
+     "item": "assets/main/key.png", "walk": True, "sprite_pos": (100, HEIGHT - 400)},
+    {"background": "assets/dialogue/dialogue_3.png",
+     "text": "YOU (being Kashyap) is incredibly up for the task, and decide to rise up to the challenge, and save the princess from the forbidden dark! However, you MUST BE CAREFUL as any deaths will forever kill you in this fantasy world, with no mercy for respawns!"},
+    {"background": "assets/dialogue/dialogue_4.png",
+     "text": "Good luck brave warrior! I wish you all the best in your adventure!",
+     "item": "assets/room/fairy.png", "y_offset": HEIGHT - 120},
+]
+
+# -------------------- GAME --------------------
+class Game:
+    """
+    Owns the window, fonts and assets. Everything is created the first time it
+    is needed, so importing this module never opens a window or touches the disk.
+    """
+
+    def __init__(self):
+        self._screen = None
+        self._layers = {}
+        self._path_mask = None
+        self._nav = None
+
+        # Sprite/world
+        self.sprite_pos = [100, 100]
+        self.selected_sprite = None
+        self.bg_offset = [0, 0]
+
+    @property
+    def screen(self):
+        """The render surface; see code.display for its size and the window."""
+        if self._screen is None:
+            self._screen = display.open()
+        return self._screen
+
+    def font(self, size, path=FONT_PATH):
+        self.screen  # fonts need pygame.init()
+        return get_font(size, path)
+
+    def image(self, name):
+        self.screen  # convert_alpha() needs a display mode
+        if name in LAYERS:
+            return load_layer(*IMAGES[name])
+        return load_image(*IMAGES[name])
+
+    def layer(self, name):
+        """The named map image cut into tiles, so only the visible part is drawn."""
+        if name not in self._layers:
+            self.screen
+            # The tiles are copies, so the whole image isn't kept around as well
+            self._layers[name] = TileLayer(load_layer(*IMAGES[name], cache=False))
+        return self._layers[name]
+
+    def sprite(self, index, selection=False):
+        self.screen
+        path, size, selection_size = SPRITES[index]
+        return load_image(path, selection_size if selection else size)
+
+    def preload_overworld(self):
+        """Start loading the map layers in the background while the menus are up."""
+        self.screen
+        for name in ("background", "foreground", "princess_follower", "hardcore_heart"):
+            (preload_layer if name in LAYERS else preload)(*IMAGES[name])
+        preload(*PATH_IMAGE)
+        if PLAY_INTRO:
+            preload_dialogues(INTRO_DIALOGUES)
+
+    @property
+    def path_mask(self):
+        if self._path_mask is None:
+            self.screen
+            path, size = PATH_IMAGE
+            self._path_mask = build_walk_mask(load_image(path, size, cache=False))
+        return self._path_mask
+
+    @property
+    def nav(self):
+        """Where the largest sprite fits on the map, for click-to-move; cached on disk between launches."""
+        if self._nav is None:
+            self._nav = NavGrid.load(PATH_IMAGE[0], MAP_SIZE, (SPRITE_WIDTH, SPRITE_HEIGHT),
+                                     lambda rect: is_walkable(self.path_mask, rect))
+            # Routes to the doors come from one pass per door, so do them now rather than on the first click
+            for zone in load_level("overworld").zones.values():
+                self._nav.prepare_area(zone.rect)
+        return self._nav
+
+    def run(self, input_source=None, fixed_dt=None, fps=FPS, dirty_rects=False):
+        SceneManager(self.screen, fps, input_source, fixed_dt, dirty_rects).run(TitleScene(self))
+        pygame.quit()
+
+# -------------------- SCENES --------------------
+class TitleScene(Scene):
+    name = "title"
+    idle = True
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+        self.widgets = WidgetGroup([Button((WIDTH//2 - 70, HEIGHT//2 + 150, 140, 50), "Play", game.font(38), BLACK)])
+        game.preload_overworld()
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            self.changed |= self.widgets.hover(event.pos)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.widgets.at(event.pos) is not None:
+            self.manager.pop(self)
+            unload_assets("title")
+            self.manager.push(SelectionScene(self.game))
+
+    def moving_rects(self):
+        return self.widgets.rects()
+
+    def draw(self, surface):
+        surface.blit(self.game.image("title"), (0,0))
+        surface.blit(self.game.image("title_poster"), render_pos((WIDTH//2 - 370, HEIGHT//2 - 200)))
+        self.widgets.draw(surface)
+
+class SelectionScene(Scene):
+    name = "selection"
+    idle = True
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+
+        box_width, box_height = 200, 300
+        padding = 50
+        start_x = (WIDTH - (2 * box_width + padding)) // 2
+        start_y = (HEIGHT - (2 * box_height + padding)) // 2
+
+        boxes = [
+            (start_x, start_y),
+            (start_x + box_width + padding, start_y),
+            (start_x, start_y + box_height + padding),
+            (start_x + box_width + padding, start_y + box_height + padding),
+        ]
+        self.widgets = WidgetGroup([Card((x, y, box_width, box_height), game.sprite(i, selection=True))
+                                    for i, (x, y) in enumerate(boxes)])
+        if PLAY_INTRO:
+            # Scale the map for the zoom out now, while nothing is animating
+            zoom_mips(game.image("background"), display.size)
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            # Only redraw when the pointer moves onto or off a card
+            self.changed |= self.widgets.hover(event.pos)
+            return
+        if event.type != pygame.MOUSEBUTTONDOWN or event.button != 1:
+            return
+        idx = self.widgets.at(event.pos)
+        if idx is None:
+            return
+        game = self.game
+        game.selected_sprite = game.sprite(idx)
+        game.sprite_pos = list(load_level("overworld").start)
+
+        # Switch to the game screen; scenes pushed after it play first
+        self.manager.pop(self)
+        self.manager.push(OverworldScene(game))
+
+        if PLAY_INTRO:
+            # Pushed in reverse: zoom in on the selection, zoom out of the map, then each dialogue
+            selection = pygame.Surface(display.size)
+            self.draw(selection)
+            for entry in reversed(INTRO_DIALOGUES):
+                self.manager.push(DialogueScene.from_data(entry, game.selected_sprite))
+            self.manager.push(ZoomTransition(game.image("background"), duration=ZOOM_DURATION, zoom_in=False))
+            self.manager.push(ZoomTransition(selection, duration=ZOOM_DURATION, zoom_in=True))
+
+    def moving_rects(self):
+        return self.widgets.rects()
+
+    def draw(self, surface):
+        surface.fill((50, 50, 150))
+        self.widgets.draw(surface)
+
+class OverworldScene(Scene):
+    name = "game"
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+        self.level = load_level("overworld")  # doors and respawn point
+        self.background = game.image("background")
+        self.foreground = game.layer("foreground")
+        self.message = None
+        self.prev_pos = list(game.sprite_pos)
+        self.route = None  # map positions left to walk through after a click
+        self.just_left = set()  # mini-games unloaded on the way out, not prefetched until the player moves away
+        game.nav  # load the navigation grid now, not on the first click
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            # Walk to the clicked spot, or into the door that was clicked
+            game = self.game
+            world = (event.pos[0] - game.bg_offset[0], event.pos[1] - game.bg_offset[1])
+            door = next(iter(self.level.zones_at(pygame.Rect(world, (1, 1)))), None)
+            if door is not None:
+                self.route = game.nav.route_to(game.sprite_pos, door.rect)
+            else:
+                self.route = game.nav.route(game.sprite_pos, (world[0] - SPRITE_WIDTH // 2, world[1] - SPRITE_HEIGHT // 2))
+
+    def update(self, dt):
+        game = self.game
+        selected_sprite = game.selected_sprite
+        sprite_pos = game.sprite_pos
+        self.message = None
+        self.prev_pos[:] = sprite_pos
+
+        # ---------------- Movement ----------------
+        keys = self.manager.input.pressed()
+        dx, dy = 0, 0
+        if keys[pygame.K_LEFT]: dx = -SPEED * dt
+        if keys[pygame.K_RIGHT]: dx = SPEED * dt
+        if keys[pygame.K_UP]: dy = -SPEED * dt
+        if keys[pygame.K_DOWN]: dy = SPEED * dt
+
+        if dx or dy:
+            self.route = None  # the arrow keys take over from a click
+        elif self.route:
+            # Head for the next point of the clicked route, moving on once it's reached
+            target_x, target_y = self.route[0]
+            to_x, to_y = target_x - sprite_pos[0], target_y - sprite_pos[1]
+            distance = math.hypot(to_x, to_y)
+            step = SPEED * dt
+            if distance <= step:
+                dx, dy = to_x, to_y
+                self.route.pop(0)
+            else:
+                dx, dy = to_x * step / distance, to_y * step / distance
+
+        # Tentative new position
+        new_x = sprite_pos[0] + dx
+        new_y = sprite_pos[1] + dy
+
+        # Player rectangle at new position
+        new_rect = pygame.Rect(round(new_x), round(new_y), selected_sprite.get_width(), selected_sprite.get_height())
+
+        # Check the whole rect against the path mask (white = walkable)
+        with self.manager.profiler.phase("collision"):
+            walkable = is_walkable(game.path_mask, new_rect)
+
+        # Only move if walkable
+        if walkable:
+            sprite_pos[0] = new_x
+            sprite_pos[1] = new_y
+        else:
+            self.route = None
+
+        player_rect = pygame.Rect(round(sprite_pos[0]), round(sprite_pos[1]),
+                                selected_sprite.get_width(), selected_sprite.get_height())
+
+        # ---------------- Entrances ----------------
+        # Door zones come prebuilt in the level's spatial index
+        level = self.level
+
+        # Get the next scene's assets loading before the player reaches its door
+        nearby = player_rect.inflate(PREFETCH_DISTANCE * 2, PREFETCH_DISTANCE * 2)
+        nearby_zones = level.zones_at(nearby)
+        for zone in nearby_zones:
+            if zone.is_open(player_keys) and zone.scene not in self.just_left:
+                mini_game = MINI_GAMES[zone.scene]
+                preload_assets(mini_game.ASSETS, mini_game.LAYERS)
+        # A door the player came back out of prefetches again once they've walked away from it
+        self.just_left &= {zone.scene for zone in nearby_zones}
+
+        for zone in level.zones_at(player_rect):
+            if zone.is_open(player_keys):
+                self.enter(zone.scene)
+            else:
+                self.message = zone.message
+            break
+
+        # ---------------- Pink Trail ----------------
+        if code.game_state.player_has_pink:
+            code.game_state.pink_pos[0] = player_rect.x + 10
+            code.game_state.pink_pos[1] = player_rect.y + 10
+
+    def enter(self, scene):
+        selected_sprite = self.game.selected_sprite
+        if scene == "room":
+            mini_game, on_done = code.room.RoomScene(selected_sprite, (WIDTH, HEIGHT)), self.on_room_done
+        elif scene == "laser_labyrinth":
+            mini_game, on_done = code.laser_labyrinth.LaserLabyrinthScene(selected_sprite), self.on_mini_game_done
+        else:
+            mini_game, on_done = code.platformer.PlatformerScene(selected_sprite), self.on_mini_game_done
+        self.manager.push(mini_game, lambda result: self.left(scene, on_done, result))
+
+    def left(self, scene, on_done, result):
+        # Only the mini-game used its backgrounds; shared images stay loaded.
+        # The respawn point is near the doors, so keep the next update from loading them straight back
+        unload_assets(scene)
+        self.just_left.add(scene)
+        on_done(result)
+
+    def on_mini_game_done(self, result):
+        if result == "quit":
+            self.manager.quit()
+        elif result == "restart_adventure":
+            for key in player_keys:
+                player_keys[key] = False
+        self.game.sprite_pos[:] = self.level.points["respawn"]
+        self.prev_pos[:] = self.game.sprite_pos
+        self.route = None
+
+    def on_room_done(self, result):
+        if result == "quit":
+            self.manager.quit()
+        else:
+            # Player successfully rescued the princess; exit game after the win screen
+            self.manager.push(WinScene(self.game), lambda _: self.manager.quit())
+
+    def interpolated_pos(self):
+        alpha = self.manager.alpha
+        sprite_pos = self.game.sprite_pos
+        return (round(lerp(self.prev_pos[0], sprite_pos[0], alpha)),
+                round(lerp(self.prev_pos[1], sprite_pos[1], alpha)))
+
+    def camera(self, sprite_pos):
+        """Map offset that centres sprite_pos, clamped to the map edges."""
+        return [min(0, max(-(sprite_pos[0] - WIDTH//2), WIDTH - MAP_SIZE[0])),
+                min(0, max(-(sprite_pos[1] - HEIGHT//2), HEIGHT - MAP_SIZE[1]))]
+
+    def moving_rects(self):
+        game = self.game
+        sprite_pos = self.interpolated_pos()
+        bg_offset = self.camera(sprite_pos)
+        if bg_offset != game.bg_offset:
+            self.dirty = True  # the whole map scrolled
+
+        screen_pos = (sprite_pos[0] + bg_offset[0], sprite_pos[1] + bg_offset[1])
+        rects = {"player": game.selected_sprite.get_rect(topleft=screen_pos)}
+        if code.game_state.player_has_pink:
+            rects["princess"] = game.image("princess_follower").get_rect(topleft=(screen_pos[0] + 10, screen_pos[1] + 10))
+        if self.message:
+            rects["message", self.message] = pygame.Rect(0, HEIGHT//2 - 50, WIDTH, 40)
+        return rects
+
+    def draw(self, surface):
+        game = self.game
+        sprite_pos = self.interpolated_pos()
+
+        # ---------------- Camera ----------------
+        bg_offset = game.bg_offset
+        bg_offset[:] = self.camera(sprite_pos)
+
+        # ---------------- Drawing ----------------
+        # The layers are at render scale, so only their offset needs scaling
+        map_offset = render_pos(bg_offset)
+        surface.blit(self.background, map_offset)
+        surface.blit(render_image(game.selected_sprite), render_pos((sprite_pos[0] + bg_offset[0], sprite_pos[1] + bg_offset[1])))
+        self.foreground.draw(surface, map_offset)
+
+        hardcore_heart = game.image("hardcore_heart")
+        if hardcore_heart:
+            surface.blit(render_image(hardcore_heart), render_pos((10, 10)))
+
+        # for zone in self.level.zones.values():
+        #     pygame.draw.rect(surface, (255, 0, 0), zone.rect.move(bg_offset), 2)
+
+        if self.message:
+            msg = render_text(self.message, game.font(36, None), (255,0,0))
+            surface.blit(render_image(msg), render_pos((WIDTH//2 - msg.get_width()//2, HEIGHT//2 - 50)))
+
+        # ---------------- Pink Trail ----------------
+        if code.game_state.player_has_pink:
+            surface.blit(render_image(game.image("princess_follower")), render_pos((sprite_pos[0] + 10 + bg_offset[0], sprite_pos[1] + 10 + bg_offset[1])))
+
+class WinScene(Scene):
+    """Shows the win screen until any key or mouse button is pressed."""
+
+    name = "win"
+    idle = True
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
+            self.finish()
+
+    def draw(self, surface):
+        surface.blit(self.game.image("win"), (0, 0))
+
+
+def window_size(text):
+    """argparse type for WxH, e.g. 1920x1080."""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WxH, got {text!r}")
+    return width, height
 
-        # Static dialogues last longer
-        if not walk and pygame.time.get_ticks() - start_time >= duration:
-            running = False
-    
-def draw_title_rect(x, y, l, w, font, mouse_pos):
-    rect = pygame.Rect(x, y, l, w)
-    hover_scale = 1.1 if rect.collidepoint(mouse_pos) else 1.0
-    scaled_width = int(l * hover_scale)
-    scaled_height = int(w * hover_scale)
-
-    offset_x = rect.centerx - scaled_width // 2
-    offset_y = rect.centery - scaled_height // 2
-
-    button_surface = pygame.Surface((scaled_width, scaled_height), pygame.SRCALPHA)
-    fill_color = (220, 220, 220, 220) if rect.collidepoint(mouse_pos) else (200, 200, 200, 180)
-    border_color = WHITE
-
-    pygame.draw.rect(button_surface, fill_color, button_surface.get_rect(), border_radius=15)
-    pygame.draw.rect(button_surface, border_color, button_surface.get_rect(), width=3, border_radius=15)
-
-    text_surface = font.render("Play", True, BLACK)
-    text_rect = text_surface.get_rect(center=button_surface.get_rect().center)
-    button_surface.blit(text_surface, text_rect)
-
-    screen.blit(button_surface, (offset_x, offset_y))
-
-    return pygame.Rect(offset_x, offset_y, scaled_width, scaled_height)
-
-def draw_selection_screen(boxes, mouse_pos):
-    screen.fill((50, 50, 150))  
-    for i, rect in enumerate(boxes):
-        hover_scale = 1.1 if rect.collidepoint(mouse_pos) else 1.0
-        scaled_width = int(rect.width * hover_scale)
-        scaled_height = int(rect.height * hover_scale)
-
-        offset_x = rect.centerx - scaled_width // 2
-        offset_y = rect.centery - scaled_height // 2
-
-        box_surface = pygame.Surface((scaled_width, scaled_height), pygame.SRCALPHA)
-        fill_color = (220, 220, 220, 220) if rect.collidepoint(mouse_pos) else (200, 200, 200, 180)
-        border_color = WHITE
-
-        pygame.draw.rect(box_surface, fill_color, box_surface.get_rect(), border_radius=15)
-        pygame.draw.rect(box_surface, border_color, box_surface.get_rect(), width=3, border_radius=15)
-        screen.blit(box_surface, (offset_x, offset_y))
-
-        if i == 0:
-            sprite_rect = sprite_1_selection.get_rect(center=(rect.centerx, rect.centery))
-            sprite_rect.topleft = (sprite_rect.x, sprite_rect.y)
-            screen.blit(sprite_1_selection, sprite_rect.topleft)
-        elif i == 1:
-            sprite_rect = sprite_2_selection.get_rect(center=(rect.centerx, rect.centery))
-            sprite_rect.topleft = (sprite_rect.x, sprite_rect.y)
-            screen.blit(sprite_2_selection, sprite_rect.topleft)
-        elif i == 2:
-            sprite_rect = sprite_3_selection.get_rect(center=(rect.centerx, rect.centery))
-            sprite_rect.topleft = (sprite_rect.x, sprite_rect.y)
-            screen.blit(sprite_3_selection, sprite_rect.topleft)
-        elif i == 3:
-            sprite_rect = sprite_4_selection.get_rect(center=(rect.centerx, rect.centery))
-            sprite_rect.topleft = (sprite_rect.x, sprite_rect.y)
-            screen.blit(sprite_4_selection, sprite_rect.topleft)
-
-def get_selection_surface(boxes):
-    temp_surface = pygame.Surface((WIDTH, HEIGHT))
-    temp_surface.fill((50,50,150))  
-    for rect in boxes:
-        box_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(box_surface, (200,200,200,180), box_surface.get_rect(), border_radius=15)
-        pygame.draw.rect(box_surface, WHITE, box_surface.get_rect(), width=3, border_radius=15)
-        temp_surface.blit(box_surface, rect.topleft)
-    return temp_surface
-
-# -------------------- INITIALIZATION --------------------
-pygame.init()
-font = pygame.font.Font(
-    'assets/main/PixemonTrialRegular-p7nLK.ttf', 
-    38
-)
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Camera with Edges")
-clock = pygame.time.Clock()
-
-# Load images
-titleScreen = load_image("assets/main/title_page.png", (WIDTH, HEIGHT))
-titleScreenPoster = load_image("assets/main/title_page_poster.png" , (800, 530))
-
-hardcore_heart = load_image("assets/main/hardcore_heart.png", (50, 50))
-
-foreground = load_image("assets/main/map_foreground.png", (WIDTH*2, HEIGHT*2))
-background = load_image("assets/main/map_background.png", (WIDTH*2, HEIGHT*2))
-path_image = load_image("assets/main/path_background.png", (WIDTH*2, HEIGHT*2))
-
-sprite_1 = load_image("assets/main/sprite_1.png", (SPRITE_WIDTH - 10, SPRITE_HEIGHT))
-sprite_1_selection = load_image("assets/main/sprite_1.png", (SPRITE_SELECTION_WIDTH, SPRITE_SELECTION_HEIGHT))
-
-sprite_2 = load_image("assets/main/sprite_2.png", (SPRITE_WIDTH - 10, SPRITE_HEIGHT))
-sprite_2_selection = load_image("assets/main/sprite_2.png", (SPRITE_SELECTION_WIDTH, SPRITE_SELECTION_HEIGHT))
-
-sprite_3 = load_image("assets/main/sprite_3.png", (SPRITE_WIDTH - 10, SPRITE_HEIGHT))
-sprite_3_selection = load_image("assets/main/sprite_3.png", (SPRITE_SELECTION_WIDTH, SPRITE_SELECTION_HEIGHT))
-
-sprite_4 = load_image("assets/main/sprite_4.png", (SPRITE_WIDTH, SPRITE_HEIGHT))
-sprite_4_selection = load_image("assets/main/sprite_4.png", (SPRITE_SELECTION_WIDTH - 65, SPRITE_SELECTION_HEIGHT - 65))
-
-
-# Sprite/world
-sprite_pos = [100, 100]
-selected_sprite = None 
-bg_offset = [0, 0]
-
-# -------------------- MAIN LOOP --------------------
 def main():
-    running = True
-    global selected_sprite, sprite_pos, player_has_pink, pink_pos
-
-    current_screen = 'title'
-
-    box_width, box_height = 200, 300
-    padding = 50
-    start_x = (WIDTH - (2 * box_width + padding)) // 2
-    start_y = (HEIGHT - (2 * box_height + padding)) // 2
-
-    boxes = [
-        pygame.Rect(start_x, start_y, box_width, box_height),
-        pygame.Rect(start_x + box_width + padding, start_y, box_width, box_height),
-        pygame.Rect(start_x, start_y + box_height + padding, box_width, box_height),
-        pygame.Rect(start_x + box_width + padding, start_y + box_height + padding, box_width, box_height)
-    ]
-
-    while running:
-
-        clock.tick(FPS)
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pressed = pygame.mouse.get_pressed()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-        
-        if current_screen == "title":
-            screen.blit(titleScreen, (0,0))
-            screen.blit(titleScreenPoster, (WIDTH//2 - 370, HEIGHT//2 - 200))
-
-            button_rect = pygame.Rect(WIDTH//2 - 70, HEIGHT//2 + 150, 140, 50)
-            pygame.draw.rect(screen, (200,200,200), button_rect)
-            text_surf = font.render("Play", True, BLACK)
-            screen.blit(text_surf, text_surf.get_rect(center=button_rect.center))
-
-        if mouse_pressed[0] and button_rect.collidepoint(mouse_pos):
-            current_screen = "selection"
-        
-        elif current_screen == "selection":
-            draw_selection_screen(boxes, mouse_pos)
-            if mouse_pressed[0]:
-                for idx, rect in enumerate(boxes):
-                    if rect.collidepoint(mouse_pos):
-                        if idx == 0: selected_sprite = sprite_1
-                        elif idx == 1: selected_sprite = sprite_2
-                        elif idx == 2: selected_sprite = sprite_3
-                        elif idx == 3: selected_sprite = sprite_4
-                        if selected_sprite:
-                            if selected_sprite:
-                                sprite_pos = [background.get_width()//2 - 100, background.get_height()//2 + 220]
-
-                                # # Zoom out from selection
-                                # selection_surface = get_selection_surface(boxes)
-                                # zoom_transition(selection_surface, selection_surface, screen, duration=ZOOM_DURATION, zoom_in=True)
-                                # zoom_transition(background, background, screen, duration=ZOOM_DURATION, zoom_in=False)
-
-                                # dialogue_1_img = load_image("assets/dialogue/dialogue_1.png", (WIDTH, HEIGHT))
-                                # show_dialogue(screen, dialogue_1_img,
-                                #             "Once upon a time, there was a warrior named Kashyap who was an avid explorer in his region!",
-                                #             char_img=selected_sprite, walk=True, sprite_pos=[100, HEIGHT - 400])
-
-                                # dialogue_2_img = load_image("assets/dialogue/dialogue_2.png", (WIDTH, HEIGHT))
-                                # princess_img = load_image("assets/room/princess.png", (200, 200))
-                                # key_img = load_image("assets/main/key.png", (50, 50))
-                                # show_dialogue(screen, dialogue_2_img,
-                                #             'During his adventure of the "Dream of Days", Kashyap was notified of a princess trapped in the deep dark dungeons! The only way to rescue her is to collect the hidden keys of reality, stored in unknown locations across the map!',
-                                #             char_img=selected_sprite, item_img=key_img, walk=True, sprite_pos=[100, HEIGHT - 400])
-                                # screen.blit(princess_img, (WIDTH//2, HEIGHT//2 - 100))
-
-                                # dialogue_3_img = load_image("assets/dialogue/dialogue_3.png", (WIDTH, HEIGHT))
-                                # show_dialogue(screen, dialogue_3_img,
-                                #             "YOU (being Kashyap) is incredibly up for the task, and decide to rise up to the challenge, and save the princess from the forbidden dark! However, you MUST BE CAREFUL as any deaths will forever kill you in this fantasy world, with no mercy for respawns!",
-                                #             char_img=selected_sprite, walk=False)
-
-                                # dialogue_4_img = load_image("assets/dialogue/dialogue_4.png", (WIDTH, HEIGHT))
-                                # fairy_img = load_image("assets/room/fairy.png", (150, 150))
-                                # show_dialogue(screen, dialogue_4_img,
-                                #     "Good luck brave warrior! I wish you all the best in your adventure!",
-                                #     char_img=selected_sprite, item_img=fairy_img, walk=False,
-                                #     y_offset=HEIGHT - 120) 
-
-                                # # Finally, switch to the game screen
-                                current_screen = "game"
-        
-        elif current_screen == "game" and selected_sprite:
-
-            # ---------------- Movement ----------------
-            keys = pygame.key.get_pressed()
-            dx, dy = 0, 0
-            if keys[pygame.K_LEFT]: dx = -SPEED
-            if keys[pygame.K_RIGHT]: dx = SPEED
-            if keys[pygame.K_UP]: dy = -SPEED
-            if keys[pygame.K_DOWN]: dy = SPEED
-
-            # Tentative new position
-            new_x = sprite_pos[0] + dx
-            new_y = sprite_pos[1] + dy
-
-            # Player rectangle at new position
-            new_rect = pygame.Rect(new_x, new_y, selected_sprite.get_width(), selected_sprite.get_height())
-
-            # Check walkable pixels on your path mask (white = walkable)
-            walkable = True
-            for corner in [(new_rect.left, new_rect.top),
-                        (new_rect.right, new_rect.top),
-                        (new_rect.left, new_rect.bottom),
-                        (new_rect.right, new_rect.bottom)]:
-                # Make sure inside image bounds
-                px = max(0, min(corner[0], path_image.get_width() - 1))
-                py = max(0, min(corner[1], path_image.get_height() - 1))
-                if path_image.get_at((px, py))[:3] != (255, 255, 255):  # Not white → blocked
-                    walkable = False
-                    break
-
-            # Only move if walkable
-            if walkable:
-                sprite_pos[0] = new_x
-                sprite_pos[1] = new_y
-
-            player_rect = pygame.Rect(sprite_pos[0], sprite_pos[1],
-                                    selected_sprite.get_width(), selected_sprite.get_height())
-
-            # ---------------- Entrances ----------------
-
-            laser_entrance_rect = pygame.Rect(1250, 480, 130, 120)
-            room_entrance_rect = pygame.Rect(background.get_width()//2 - 175, background.get_height()//2 - 20, 150, 200)
-            entrance_rect = pygame.Rect(1570, 800, 100, 130)  
-
-
-            if player_rect.colliderect(entrance_rect):
-                result = code.platformer.run_platformer(screen, selected_sprite)
-                if result == "quit": 
-                    running = False
-                    sprite_pos = [1570, 700] 
-                elif result == "restart_adventure":
-                    sprite_pos[:] = [background.get_width()//2 - 100, background.get_height()//2 + 220]
-                    for key in player_keys:
-                        player_keys[key] = False
-                sprite_pos = [1570, 700]
-                
-            
-           
-            if player_rect.colliderect(laser_entrance_rect):
-                if player_keys["platform_key"]:
-                    entrance_spawn = [background.get_width()//2, background.get_height()//2]
-                    result = code.laser_labyrinth.run_laser_labyrinth(screen, selected_sprite)
-                    if result == "quit": 
-                        running = False
-                        sprite_pos = entrance_spawn  # return to entrance
-                    elif result == "restart_adventure":
-                        sprite_pos[:] = [background.get_width()//2 - 100, background.get_height()//2 + 220]
-                        for key in player_keys:
-                            player_keys[key] = False
-                    sprite_pos = [1570, 700]
-                    
-                else:
-                    font_small = pygame.font.Font(None, 36)
-                    msg = font_small.render("You need the Platform Key!", True, (255,0,0))
-                    screen.blit(msg, (WIDTH//2 - msg.get_width()//2, HEIGHT//2 - 50))
-            
-            if player_rect.colliderect(room_entrance_rect):
-                if player_keys.get("lab_key", False):
-                    entrance_spawn = [background.get_width()//2 - 200, background.get_height()//2 - 40]
-                    result = code.room.run_room(screen, selected_sprite)
-
-                    if result == "quit": 
-                        running = False
-                        sprite_pos = [1570, 700]
-                    else:
-                        # Player successfully rescued the princess
-                        win_img = load_image("assets/main/win.png", (WIDTH, HEIGHT))
-                        screen.blit(win_img, (0, 0))
-                        pygame.display.flip()
-
-                        # Wait so player can see the win screen
-                        waiting = True
-                        while waiting:
-                            for event in pygame.event.get():
-                                if event.type == pygame.QUIT:
-                                    waiting = False
-                                    running = False
-                                elif event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-                                    waiting = False  # Close win screen when any key or mouse is pressed
-                        # Exit game after win
-                        running = False
-
-                else:
-                    font_small = pygame.font.Font(None, 36)
-                    msg = font_small.render("You need the Lab Key to enter!", True, (255,0,0))
-                    screen.blit(msg, (WIDTH//2 - msg.get_width()//2, HEIGHT//2 - 50))
-
-            # ---------------- Camera ----------------
-            bg_offset[0] = -(sprite_pos[0] - WIDTH//2)
-            bg_offset[1] = -(sprite_pos[1] - HEIGHT//2)
-            bg_offset[0] = min(0, max(bg_offset[0], WIDTH - background.get_width()))
-            bg_offset[1] = min(0, max(bg_offset[1], HEIGHT - background.get_height()))
-
-            # ---------------- Drawing ----------------
-            screen.blit(background, bg_offset)
-            screen.blit(selected_sprite, (sprite_pos[0] + bg_offset[0], sprite_pos[1] + bg_offset[1]))
-            screen.blit(foreground, bg_offset)
-
-            if hardcore_heart:
-                screen.blit(hardcore_heart, (10, 10))
-
-            # pygame.draw.rect(screen, (255, 0, 0), (entrance_rect.x + bg_offset[0], entrance_rect.y + bg_offset[1], entrance_rect.width, entrance_rect.height))
-            # pygame.draw.rect(screen, (0, 0, 255), (laser_entrance_rect.x + bg_offset[0], laser_entrance_rect.y + bg_offset[1], laser_entrance_rect.width, laser_entrance_rect.height))
-            # pygame.draw.rect(screen, (255, 165, 0), (room_entrance_rect.x + bg_offset[0], room_entrance_rect.y + bg_offset[1], room_entrance_rect.width, room_entrance_rect.height))
-
-            # ---------------- Pink Trail ----------------
-            if code.game_state.player_has_pink:
-                code.game_state.pink_pos[0] = player_rect.x + 10
-                code.game_state.pink_pos[1] = player_rect.y + 10
-                screen.blit(load_image("assets/room/princess.png", (200, 200)), (code.game_state.pink_pos[0] + bg_offset[0], code.game_state.pink_pos[1] + bg_offset[1]))
-
-        pygame.display.flip()
-
-    pygame.quit()
+    parser = argparse.ArgumentParser(description="The Sleepwalkers")
+    parser.add_argument("--record", metavar="PATH", help="save this session's input to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="play back input recorded with --record")
+    parser.add_argument("--headless", action="store_true", help="no window; replays run uncapped")
+    parser.add_argument("--fps", type=int, default=FPS, help="render rate cap (the simulation always runs at a fixed rate)")
+    parser.add_argument("--dirty-rects", action="store_true", help="only redraw what moved, where a scene supports it")
+    parser.add_argument("--scale", type=float, default=1, help="render at this fraction of 1200x800, e.g. 0.5 on slow machines")
+    parser.add_argument("--window", type=window_size, metavar="WxH", help="window size; each frame is upscaled to fit")
+    parser.add_argument("--fullscreen", action="store_true", help="start fullscreen (F11 toggles)")
+    args = parser.parse_args()
+    display.configure(args.scale, args.window, args.fullscreen)
+
+    if args.headless:
+        # Must be set before the display is created
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    input_source = None
+    fixed_dt = None
+    if args.replay:
+        input_source = ReplayInput.load(args.replay)
+        # Frame times come from the recording, so there is no need to wait for the clock
+        fixed_dt = 1 / FPS if args.headless else None
+    elif args.record:
+        input_source = RecordingInput(args.record)
+
+    Game().run(input_source, fixed_dt, args.fps, args.dirty_rects)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()